@@ -9,6 +9,7 @@ import os
 from models import db, User, UserRole, Role, ScrapeJob, Subscription, SubscriptionPlan, BlogPost, BlogCategory, BlogTag, ScrapeJobHistory, ApiKey, SiteSetting, Page, Payment
 from auth import admin_required, editor_required
 from utils import unique_slug, save_image, delete_image, generate_api_key, get_setting, format_date
+from response_cache import get_response_cache
 
 # Create blueprint
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -81,6 +82,13 @@ def dashboard():
     # Recent activity
     recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
     
+    # Page cache hit/miss counts, shared by every worker on this machine
+    cache_stats = None
+    try:
+        cache_stats = get_response_cache().stats()
+    except Exception as e:
+        current_app.logger.warning(f"Could not read page cache stats: {str(e)}")
+    
     # Create stats object to match template expectations
     stats = {
         'total_users': total_users,
@@ -99,7 +107,8 @@ def dashboard():
     
     return render_template('admin/dashboard.html',
                            stats=stats,
-                           recent_users=recent_users)
+                           recent_users=recent_users,
+                           cache_stats=cache_stats)
 
 # User Management routes
 @admin_bp.route('/users')
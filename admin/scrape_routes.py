@@ -2,15 +2,18 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request,
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta
 import os
-import pandas as pd
 
 from models import db, ScrapeJobHistory, ApiKey, User, Subscription
 from auth import admin_required, login_required
 from utils import generate_api_key
+from result_writer import iter_results, count_results, export_xlsx, flatten_result, RESULT_COLUMNS, SOCIAL_COLUMNS, EXTRA_FORMATS
 
 # Create blueprint
 scrape_bp = Blueprint('scrape', __name__, url_prefix='/admin/scrape')
 
+# Result rows shown per page on the job details page
+RESULTS_PER_PAGE = 500
+
 @scrape_bp.route('/jobs')
 @login_required
 def jobs():
@@ -35,17 +38,25 @@ def view_job(job_id):
         flash('You do not have permission to view this job.', 'danger')
         return redirect(url_for('scrape.jobs'))
     
-    # Get job results
+    # Get one page of job results; only that range is read from the file
     results = []
+    total_results = 0
+    page = max(request.args.get('page', 1, type=int), 1)
     if job.result_file and os.path.exists(job.result_file):
         try:
-            df = pd.read_excel(job.result_file)
-            # Convert to list of dicts for template
-            results = df.to_dict('records')
+            total_results = count_results(job.result_file)
+            header = RESULT_COLUMNS + SOCIAL_COLUMNS
+            results = [
+                dict(zip(header, flatten_result(result)))
+                for result in iter_results(job.result_file, offset=(page - 1) * RESULTS_PER_PAGE,
+                                           limit=RESULTS_PER_PAGE)
+            ]
         except Exception as e:
             flash(f'Error reading results file: {str(e)}', 'danger')
     
-    return render_template('admin/scrape/job_details.html', job=job, results=results)
+    pages = max((total_results + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE, 1)
+    return render_template('admin/scrape/job_details.html', job=job, results=results,
+                           total_results=total_results, page=page, pages=pages)
 
 @scrape_bp.route('/jobs/delete/<string:job_id>', methods=['POST'])
 @login_required
@@ -59,12 +70,15 @@ def delete_job(job_id):
         flash('You do not have permission to delete this job.', 'danger')
         return redirect(url_for('scrape.jobs'))
     
-    # Delete result file if exists
-    if job.result_file and os.path.exists(job.result_file):
-        try:
-            os.remove(job.result_file)
-        except Exception as e:
-            current_app.logger.error(f'Error deleting result file: {str(e)}')
+    # Delete the result file and the copies written next to it
+    if job.result_file:
+        base_path = os.path.splitext(job.result_file)[0]
+        for path in [job.result_file] + [f'{base_path}.{extension}' for extension in EXTRA_FORMATS]:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except Exception as e:
+                    current_app.logger.error(f'Error deleting result file: {str(e)}')
     
     # Delete job from database
     db.session.delete(job)
@@ -90,8 +104,8 @@ def download_job(job_id):
         flash('Result file not found.', 'danger')
         return redirect(url_for('scrape.view_job', job_id=job_id))
     
-    # Send file for download
-    return send_file(job.result_file, as_attachment=True, download_name=f'scrape_results_{job_id}.xlsx')
+    # Send file for download; Parquet results are converted to Excel on first download
+    return send_file(export_xlsx(job.result_file), as_attachment=True, download_name=f'scrape_results_{job_id}.xlsx')
 
 @scrape_bp.route('/api-keys')
 @login_required
@@ -1,19 +1,37 @@
-from flask import Flask, render_template, request, jsonify, send_file, url_for, redirect, flash, session
+from flask import Flask, render_template, request, jsonify, send_file, url_for, redirect, flash, session, Response
 from flask_login import LoginManager, current_user, login_user, login_required, logout_user
 from flask_migrate import Migrate
 from werkzeug.utils import secure_filename
 from scraper import ContactScraper
+from fetch_engine import AsyncFetchEngine
+from http_pool import configure_pool, get_pool
+from host_scheduler import configure_host_scheduler, get_host_scheduler, polite_slot, read_robots
+from cache_store import configure_cache_store
+from robots_cache import configure_robots_cache, get_robots_cache, RobotsDisallowed
+from response_cache import configure_response_cache, get_response_cache
+from extraction_cache import configure_extraction_cache, get_extraction_cache
+from fetch_strategy import escalate_to_browser, STATIC_TIER
+from page_parser import configure_parser
+from parse_pool import configure_parse_pool, get_parse_pool, parse_homepage, parse_contact_page, merge_contact_page
+from result_writer import StreamingResultWriter, iter_results, count_results, export_xlsx
+from job_events import JobEventStream
+from url_files import read_url_file, preview_url_file
+from url_canon import collapse_urls, fan_out
+from job_registry import configure_job_registry, new_job_id
+from result_pages import (page_results, parse_fields, parse_bool, filter_fields, decode_cursor,
+                          DEFAULT_PAGE_SIZE)
+from job_queue import (enqueue_job, claim_next_job, heartbeat, save_progress, iter_checkpoints, finish_job,
+                       resume_job, is_stale, requeue_stale_jobs, get_queued_job, recent_jobs, job_urls,
+                       contact_rows, upgrade_queue_table, default_worker_id, QUEUED, RUNNING, COMPLETED, ERROR)
+from contact_dedup import ContactDedup
 import os
 import logging
-import pandas as pd
 import threading
 import queue
 import time
 import json
+from collections import deque
 from datetime import datetime, timezone
-import requests
-from bs4 import BeautifulSoup
-import re
 import urllib.parse
 
 # Import models and created modules
@@ -45,6 +63,45 @@ app.config.update(
     UPLOAD_FOLDER='uploads',
     MAX_CONTENT_LENGTH=10 * 1024 * 1024,  # 10MB max upload
     MAX_URLS_PER_BATCH=100,  # Maximum number of URLs to process in one batch
+    SCRAPE_CONCURRENCY=int(os.environ.get('SCRAPE_CONCURRENCY', 20)),  # URLs fetched at once per job
+    SCRAPE_BROWSER_ESCALATION=os.environ.get('SCRAPE_BROWSER_ESCALATION', '1') == '1',  # Re-scrape JS-rendered pages in Chrome
+    SCRAPE_BROWSER_WORKERS=int(os.environ.get('SCRAPE_BROWSER_WORKERS', 3)),  # Chrome instances for escalated pages
+    SCRAPE_BROWSER_ALLOWLIST=[entry.strip() for entry in os.environ.get('SCRAPE_BROWSER_ALLOWLIST', '').split(',') if entry.strip()],  # Never blocked in Chrome
+    HTTP_POOL_MAX_HOSTS=int(os.environ.get('HTTP_POOL_MAX_HOSTS', 100)),  # Hosts kept in the shared HTTP pool
+    HTTP_POOL_MAX_PER_HOST=int(os.environ.get('HTTP_POOL_MAX_PER_HOST', 10)),  # Connections per host
+    SCRAPE_HOST_MAX_CONCURRENCY=int(os.environ.get('SCRAPE_HOST_MAX_CONCURRENCY', 2)),  # URLs of one host scraped at once, across all jobs
+    SCRAPE_HOST_MIN_DELAY=float(os.environ.get('SCRAPE_HOST_MIN_DELAY', 1.0)),  # Minimum seconds between requests to one host
+    SCRAPE_RESPECT_CRAWL_DELAY=os.environ.get('SCRAPE_RESPECT_CRAWL_DELAY', '1') == '1',  # Honor robots.txt Crawl-delay
+    SCRAPE_MAX_CRAWL_DELAY=float(os.environ.get('SCRAPE_MAX_CRAWL_DELAY', 30)),  # Longest Crawl-delay honored, in seconds
+    SCRAPE_RESPECT_ROBOTS=os.environ.get('SCRAPE_RESPECT_ROBOTS', '1') == '1',  # Skip pages robots.txt disallows
+    SCRAPE_ROBOTS_TTL=int(os.environ.get('SCRAPE_ROBOTS_TTL', 86400)),  # Seconds a fetched robots.txt is reused
+    SCRAPE_ROBOTS_NEGATIVE_TTL=int(os.environ.get('SCRAPE_ROBOTS_NEGATIVE_TTL', 3600)),  # Seconds a missing or unreadable robots.txt is reused
+    SCRAPE_CACHE_PATH=os.environ.get('SCRAPE_CACHE_PATH', 'cache/scrape_cache.db'),  # SQLite file shared by the processes on this machine
+    SCRAPE_RESPONSE_CACHE=os.environ.get('SCRAPE_RESPONSE_CACHE', '1') == '1',  # Reuse pages fetched by earlier jobs
+    SCRAPE_RESPONSE_CACHE_TTL=int(os.environ.get('SCRAPE_RESPONSE_CACHE_TTL', 3600)),  # Seconds a cached page is used before it is revalidated
+    SCRAPE_RESPONSE_CACHE_MB=int(os.environ.get('SCRAPE_RESPONSE_CACHE_MB', 512)),  # Disk budget for cached pages
+    SCRAPE_EXTRACTION_CACHE=os.environ.get('SCRAPE_EXTRACTION_CACHE', '1') == '1',  # Reuse extraction results for byte-identical pages
+    SCRAPE_EXTRACTION_CACHE_MB=int(os.environ.get('SCRAPE_EXTRACTION_CACHE_MB', 64)),  # Disk budget for cached extraction results
+    SCRAPE_CONTACT_DEDUP=os.environ.get('SCRAPE_CONTACT_DEDUP', '1') == '1',  # Annotate results with where each contact was first found
+    SCRAPE_DEDUP_FILTER_CAPACITY=int(os.environ.get('SCRAPE_DEDUP_FILTER_CAPACITY', 100000)),  # Contacts a user's Bloom filter is first sized for
+    SCRAPE_DEDUP_FILTER_ERROR_RATE=float(os.environ.get('SCRAPE_DEDUP_FILTER_ERROR_RATE', 0.01)),  # Bloom filter false positive rate
+    SCRAPE_COLLAPSE_URLS=os.environ.get('SCRAPE_COLLAPSE_URLS', '1') == '1',  # Fetch differently spelled copies of a URL once per job
+    HTML_PARSER_BACKEND=os.environ.get('HTML_PARSER_BACKEND', ''),  # selectolax, lxml or html.parser; empty picks the fastest installed
+    SCRAPE_PARSE_WORKERS=int(os.environ.get('SCRAPE_PARSE_WORKERS', os.cpu_count() or 1)),  # Parse processes, 0 parses in threads
+    SCRAPE_PARSE_QUEUE=int(os.environ.get('SCRAPE_PARSE_QUEUE', 0)) or None,  # Pages per job waiting to be parsed
+    SCRAPE_EMBEDDED_WORKERS=int(os.environ.get('SCRAPE_EMBEDDED_WORKERS', 4)),  # Queue worker threads in each web process, 0 leaves jobs to worker.py
+    SCRAPE_WORKER_POLL_INTERVAL=float(os.environ.get('SCRAPE_WORKER_POLL_INTERVAL', 2)),  # Seconds between queue checks when idle
+    SCRAPE_PROGRESS_INTERVAL=float(os.environ.get('SCRAPE_PROGRESS_INTERVAL', 1)),  # Minimum seconds between progress writes
+    SCRAPE_EVENTS_KEEPALIVE=float(os.environ.get('SCRAPE_EVENTS_KEEPALIVE', 15)),  # Seconds between keep-alive comments on idle event streams
+    SCRAPE_EVENTS_MAX_DURATION=float(os.environ.get('SCRAPE_EVENTS_MAX_DURATION', 300)),  # Seconds before an event stream is closed and the browser reconnects
+    SCRAPE_CHECKPOINT_BATCH=int(os.environ.get('SCRAPE_CHECKPOINT_BATCH', 50)),  # Finished URLs that force a checkpoint write
+    SCRAPE_RESULT_EXTRA_FORMATS=[entry.strip() for entry in os.environ.get('SCRAPE_RESULT_EXTRA_FORMATS', 'csv,jsonl').split(',') if entry.strip()],  # Written next to the main result file
+    SCRAPE_JOB_STALE_AFTER=int(os.environ.get('SCRAPE_JOB_STALE_AFTER', 300)),  # Seconds without a heartbeat before a job is requeued
+    SCRAPE_JOB_MAX_ATTEMPTS=int(os.environ.get('SCRAPE_JOB_MAX_ATTEMPTS', 3)),  # Starts allowed per job before it is failed
+    SCRAPE_JOB_CACHE_TTL=int(os.environ.get('SCRAPE_JOB_CACHE_TTL', 600)),  # Seconds finished jobs stay in memory after a read
+    SCRAPE_JOB_CACHE_SIZE=int(os.environ.get('SCRAPE_JOB_CACHE_SIZE', 200)),  # Finished jobs kept in memory
+    SCRAPE_JOB_CACHE_MEMORY_MB=int(os.environ.get('SCRAPE_JOB_CACHE_MEMORY_MB', 64)),  # Memory budget for finished jobs' cached status views
+    SCRAPE_JOBS_PAGE_SIZE=int(os.environ.get('SCRAPE_JOBS_PAGE_SIZE', 20)),  # Jobs per page in /api/jobs
     SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URL', 'sqlite:///contact_harvester.db'),
     SQLALCHEMY_TRACK_MODIFICATIONS=False,
     # Mail configuration - these will be overridden from the database
@@ -60,6 +117,52 @@ app.config.update(
     GOOGLE_CLIENT_SECRET=os.environ.get('GOOGLE_CLIENT_SECRET', '')
 )
 
+# Initialize the shared HTTP connection pool
+configure_pool(
+    max_hosts=app.config['HTTP_POOL_MAX_HOSTS'],
+    max_per_host=app.config['HTTP_POOL_MAX_PER_HOST']
+)
+
+# On-disk caches shared by every job and worker process on this machine
+configure_cache_store(app.config['SCRAPE_CACHE_PATH'])
+configure_robots_cache(
+    enabled=app.config['SCRAPE_RESPECT_ROBOTS'],
+    ttl=app.config['SCRAPE_ROBOTS_TTL'],
+    negative_ttl=app.config['SCRAPE_ROBOTS_NEGATIVE_TTL']
+)
+configure_response_cache(
+    enabled=app.config['SCRAPE_RESPONSE_CACHE'],
+    ttl=app.config['SCRAPE_RESPONSE_CACHE_TTL'],
+    max_bytes=app.config['SCRAPE_RESPONSE_CACHE_MB'] * 1024 * 1024
+)
+configure_extraction_cache(
+    enabled=app.config['SCRAPE_EXTRACTION_CACHE'],
+    max_bytes=app.config['SCRAPE_EXTRACTION_CACHE_MB'] * 1024 * 1024
+)
+
+# Per-host politeness limits, shared by every job in this process
+configure_host_scheduler(
+    max_per_host=app.config['SCRAPE_HOST_MAX_CONCURRENCY'],
+    min_delay=app.config['SCRAPE_HOST_MIN_DELAY'],
+    respect_crawl_delay=app.config['SCRAPE_RESPECT_CRAWL_DELAY'],
+    max_crawl_delay=app.config['SCRAPE_MAX_CRAWL_DELAY']
+)
+
+# Pick the HTML parser backend; the parse pool's worker processes use the same one
+configure_parser(app.config['HTML_PARSER_BACKEND'])
+configure_parse_pool(
+    workers=app.config['SCRAPE_PARSE_WORKERS'],
+    max_pending=app.config['SCRAPE_PARSE_QUEUE'],
+    parser_backend=app.config['HTML_PARSER_BACKEND']
+)
+
+# Running jobs and recently read finished ones; the scrape queue has the rest
+job_registry = configure_job_registry(
+    ttl=app.config['SCRAPE_JOB_CACHE_TTL'],
+    max_finished=app.config['SCRAPE_JOB_CACHE_SIZE'],
+    memory_budget=app.config['SCRAPE_JOB_CACHE_MEMORY_MB'] * 1024 * 1024
+)
+
 # Initialize extensions
 db.init_app(app)
 mail.init_app(app)
@@ -98,9 +201,6 @@ os.makedirs(os.path.join('static', 'uploads', 'blog'), exist_ok=True)
 os.makedirs(os.path.join('static', 'uploads', 'site'), exist_ok=True)
 os.makedirs('backups', exist_ok=True)
 
-# Global variables for tracking progress
-active_jobs = {}
-
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -110,6 +210,7 @@ def load_user(user_id):
 def load_settings():
     # Create all tables
     db.create_all()
+    upgrade_queue_table()
     
     with app.app_context():
         # Create default roles if they don't exist
@@ -290,6 +391,12 @@ def get_setting(key, default=None):
     setting = SiteSetting.query.filter_by(key=key).first()
     return setting.value if setting else default
 
+# Results shown in a job's status
+RESULT_PREVIEW_SIZE = 5
+
+# Latest results a running job keeps for its event streams; older ones are read from its checkpoints
+RECENT_RESULTS_SIZE = 1000
+
 # Insert your existing ScrapeJob class here
 class ScrapeJob:
     """Class to track progress of a scraping job"""
@@ -302,22 +409,50 @@ class ScrapeJob:
         self.end_time = None
         self.result_file = None
         self.error = None
-        self.results = []  # Store raw results for direct access
+        self.results = []  # The first RESULT_PREVIEW_SIZE results; the rest are only in the result file
+        self.result_count = 0
+        self.emails_found = 0
+        self.recent_results = deque(maxlen=RECENT_RESULTS_SIZE)  # Latest results, for event streams
+        self._results_lock = threading.Lock()
+        self._stored_preview = None  # (first results, count) read from the result file
+        self.version = 0  # Bumped on every change, event streams wait on it
+        self._changed = threading.Condition()
+    
+    def notify_change(self):
+        """Wake the event streams following this job"""
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+    
+    def wait_for_change(self, version, timeout):
+        """Wait until the job changes after version, or timeout seconds pass"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.version != version, timeout)
+    
+    def start(self):
+        """Mark job as running"""
+        self.status = "running"
+        self.notify_change()
     
     def update_progress(self, completed, total):
         """Update job progress"""
         self.completed_urls = completed
         self.total_urls = total
+        self.notify_change()
         
-    def add_result(self, result):
-        """Add a result to the job's results list"""
+    def add_result(self, result, index=None):
+        """Count a result and keep it for the preview and event streams; index is the URL's position in the job"""
         if result:
-            self.results.append(result)
-            logger.info(f"Added result to job {self.job_id}, now have {len(self.results)} results")
+            with self._results_lock:
+                self.result_count += 1
+                if len(self.results) < RESULT_PREVIEW_SIZE:
+                    self.results.append(result)
+                self.recent_results.append(result)
+            logger.debug(f"Added result to job {self.job_id}, now have {self.result_count} results")
             
             # DEBUG: Log first result added for single URL jobs
-            if self.total_urls == 1 and len(self.results) == 1:
-                logger.info(f"CRITICAL DEBUG - First result for single URL job: {result}")
+            if self.total_urls == 1 and self.result_count == 1:
+                logger.debug(f"First result for single URL job: {result}")
                 
                 # Special validation for results that will be sent to the frontend
                 if 'emails' in result and not isinstance(result['emails'], list):
@@ -327,46 +462,65 @@ class ScrapeJob:
                 if 'phones' in result and not isinstance(result['phones'], list):
                     logger.warning(f"Converting phones to list for first result: {result['phones']}")
                     result['phones'] = [result['phones']] if result['phones'] else []
+            
+            if isinstance(result.get('emails'), list):
+                self.emails_found += len(result['emails'])
+    
+    def results_since(self, sent):
+        """Return the results after the first sent ones, or None if some of them are no longer in memory"""
+        with self._results_lock:
+            missing = self.result_count - sent
+            if missing <= 0:
+                return []
+            if missing > len(self.recent_results):
+                return None
+            return list(self.recent_results)[-missing:]
         
     def complete(self, result_file):
         """Mark job as completed"""
         self.status = "completed"
         self.end_time = time.time()
         self.result_file = result_file
-        logger.info(f"Job {self.job_id} completed with {len(self.results)} results")
+        logger.info(f"Job {self.job_id} completed with {self.result_count} results")
+        self.notify_change()
         
     def fail(self, error):
         """Mark job as failed"""
         self.status = "error"
         self.end_time = time.time()
         self.error = str(error)
+        self.notify_change()
     
-    def to_dict(self):
-        """Convert to dictionary for JSON response"""
+    def progress_dict(self):
+        """Status and counts only, for progress events"""
         elapsed = self.end_time - self.start_time if self.end_time else time.time() - self.start_time
         progress = (self.completed_urls / self.total_urls) * 100 if self.total_urls > 0 else 0
         
-        result_dict = {
+        return {
             "job_id": self.job_id,
             "status": self.status,
             "total_urls": self.total_urls,
             "completed_urls": self.completed_urls,
             "progress": round(progress, 1),
-            "elapsed_time": round(elapsed, 1),
-            "result_file": self.result_file,
-            "error": self.error
+            "elapsed_time": round(elapsed, 1)
         }
+    
+    def to_dict(self):
+        """Convert to dictionary for JSON response"""
+        result_dict = self.progress_dict()
+        result_dict["result_file"] = self.result_file
+        result_dict["error"] = self.error
         
         # Add preview of results if available
-        if self.results and len(self.results) > 0:
-            # Only return first 5 for preview
-            result_dict["result_preview"] = self.results[:5]
-            result_dict["total_results"] = len(self.results)
+        preview, total_results = self.result_preview()
+        if preview:
+            result_dict["result_preview"] = preview
+            result_dict["total_results"] = total_results
             
             # Critical fix: For single-URL jobs, include ALL results and first result separately
             if self.total_urls == 1:
                 # Make a deep copy for first result to avoid reference issues
-                first_result = dict(self.results[0])
+                first_result = dict(preview[0])
                 
                 # Ensure emails and phones are lists
                 if 'emails' in first_result and not isinstance(first_result['emails'], list):
@@ -375,337 +529,246 @@ class ScrapeJob:
                 if 'phones' in first_result and not isinstance(first_result['phones'], list):
                     first_result['phones'] = [first_result['phones']] if first_result['phones'] else []
                 
-                # Log the structure format
-                logger.info(f"IMPORTANT DEBUG - Single URL first_result format: {first_result}")
-                
                 # Add all fields for redundancy
                 result_dict["single_result"] = first_result
                 result_dict["direct_results"] = [first_result]  # Wrap in list to ensure it's an array
                 result_dict["first_domain_result"] = first_result
-                
-                logger.info(f"Set all single URL result fields for job {self.job_id}")
         
         return result_dict
+    
+    def result_preview(self):
+        """Return the first RESULT_PREVIEW_SIZE results and the result count, from the result file once the job is done"""
+        if self.results:
+            return self.results[:RESULT_PREVIEW_SIZE], self.result_count
+        if self._stored_preview is None and self.status == 'completed' and self.result_file:
+            try:
+                self._stored_preview = (
+                    list(iter_results(self.result_file, limit=RESULT_PREVIEW_SIZE)),
+                    count_results(self.result_file)
+                )
+            except Exception as e:
+                logger.warning(f"Could not read result preview for job {self.job_id}: {str(e)}")
+                self._stored_preview = ([], 0)
+        return self._stored_preview or ([], 0)
+    
+    @classmethod
+    def from_queue_record(cls, record, with_results=True):
+        """Build a read-only view of a job from its scrape queue row; with_results=False defers reading the result preview"""
+        job = cls(record.job_id, record.total_urls)
+        job.completed_urls = record.completed_urls or 0
+        # The frontend knows queued jobs as initializing
+        job.status = 'initializing' if record.status == QUEUED else record.status
+        job.start_time = record.created_at.replace(tzinfo=timezone.utc).timestamp()
+        if record.finished_at:
+            job.end_time = record.finished_at.replace(tzinfo=timezone.utc).timestamp()
+        job.result_file = record.result_file
+        job.error = record.error
+        if with_results:
+            job.result_preview()
+        return job
+
+
+class QueuedScrapeJob(ScrapeJob):
+    """ScrapeJob run by a queue worker; progress, checkpoints and outcome are written to the queue"""
+    def __init__(self, record):
+        super().__init__(record.job_id, record.total_urls)
+        self.record_id = record.id
+        self.user_id = record.user_id
+        self._last_progress_write = 0
+        self._pending_checkpoints = []
+        # Results not checkpointed yet are only in memory, keep at least those for event streams
+        self.recent_results = deque(maxlen=max(RECENT_RESULTS_SIZE, 2 * app.config['SCRAPE_CHECKPOINT_BATCH']))
+    
+    def add_result(self, result, index=None):
+        """Add a result and queue its checkpoint for the next progress write"""
+        super().add_result(result, index)
+        if result and index is not None:
+            self._pending_checkpoints.append((index, result))
+    
+    def update_progress(self, completed, total):
+        """Update job progress, persisting it in batches of SCRAPE_CHECKPOINT_BATCH or every SCRAPE_PROGRESS_INTERVAL"""
+        super().update_progress(completed, total)
+        if (completed < total
+                and len(self._pending_checkpoints) < app.config['SCRAPE_CHECKPOINT_BATCH']
+                and time.time() - self._last_progress_write < app.config['SCRAPE_PROGRESS_INTERVAL']):
+            return
+        self.save_checkpoints()
+    
+    def save_checkpoints(self):
+        """Write progress, the buffered checkpoints and their contacts in one transaction"""
+        checkpoints, self._pending_checkpoints = self._pending_checkpoints, []
+        self._last_progress_write = time.time()
+        now = datetime.utcnow()
+        contacts = [row for _, result in checkpoints for row in contact_rows(self.job_id, self.user_id, result, now)]
+        with app.app_context():
+            save_progress(self.record_id, self.completed_urls, self.total_urls, checkpoints, contacts)
+    
+    def complete(self, result_file):
+        """Mark job as completed and record its result file"""
+        super().complete(result_file)
+        with app.app_context():
+            finish_job(self.record_id, COMPLETED, result_file=result_file)
+    
+    def fail(self, error):
+        """Mark job as failed, keeping its checkpoints so it can be resumed"""
+        super().fail(error)
+        try:
+            self.save_checkpoints()
+        except Exception as e:
+            logger.error(f"Could not save checkpoints for failed job {self.job_id}: {str(e)}")
+        with app.app_context():
+            finish_job(self.record_id, ERROR, error=self.error)
 
 
-def process_url_file(file_path):
-    """Extract URLs from uploaded file"""
+def process_url_file(file_path, limit=None):
+    """Extract URLs from uploaded file, streaming only its first column; limit stops reading early"""
     try:
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-            # Assume the first column contains URLs
-            urls = df.iloc[:, 0].tolist()
-        elif file_path.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path)
-            # Assume the first column contains URLs
-            urls = df.iloc[:, 0].tolist()
-        elif file_path.endswith('.txt'):
-            with open(file_path, 'r') as f:
-                urls = [line.strip() for line in f if line.strip()]
-        else:
-            raise ValueError("Unsupported file format")
-        
-        # Filter out invalid URLs
-        valid_urls = [url for url in urls if isinstance(url, str) and url.strip()]
-        
-        return valid_urls
+        return read_url_file(file_path, limit)
     except Exception as e:
         logger.error(f"Error processing URL file: {str(e)}")
         raise
 
 
-# Simple scraper fallback functions in case Selenium fails
-def simple_extract_emails(text):
-    """Extract emails without using Selenium"""
-    # Standard email pattern
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails = re.findall(email_pattern, text)
-    
-    # Set for faster duplicate checking
-    filtered_emails = set()
-    
-    for email in emails:
-        if not any(invalid in email.lower() for invalid in ['@example.', '@domain.', '@email.']):
-            filtered_emails.add(email.lower())
-    
-    # Additional patterns for protected emails
-    
-    # Pattern for emails with "at" and "dot" text encoding
-    encoded_pattern = r'([a-zA-Z0-9._%+-]+)[\s]*(?:\[at\]|@|[\(\[\{]at[\)\]\}]|&#64;|%40)[\s]*([a-zA-Z0-9.-]+)[\s]*(?:\[dot\]|\.|\(dot\)|\[dot\]|&#46;|%2E)[\s]*([a-zA-Z]{2,})'
-    encoded_matches = re.finditer(encoded_pattern, text, re.IGNORECASE)
-    for match in encoded_matches:
-        if match.group(1) and match.group(2) and match.group(3):
-            email = f"{match.group(1).strip()}@{match.group(2).strip()}.{match.group(3).strip()}"
-            filtered_emails.add(email.lower())
-    
-    # Pattern for JavaScript obfuscated emails
-    js_pattern = r'document\.write\([\'"]([a-zA-Z0-9._%+-]+)[\'"][\s]*\+[\s]*[\'"]@[\'"][\s]*\+[\s]*[\'"]([a-zA-Z0-9.-]+)[\s]*[\'"][\s]*\+[\s]*[\'"]\.[\'"][\s]*\+[\s]*[\'"]([a-zA-Z]{2,})[\'"]'
-    js_matches = re.finditer(js_pattern, text)
-    for match in js_matches:
-        if match.group(1) and match.group(2) and match.group(3):
-            email = f"{match.group(1)}@{match.group(2)}.{match.group(3)}"
-            filtered_emails.add(email.lower())
-    
-    # Pattern for HTML entity encoded emails
-    html_entity_pattern = r'([a-zA-Z0-9._%+-]+)(?:&#64;|&#0*64;|%40)([a-zA-Z0-9.-]+)(?:&#46;|&#0*46;|%2E)([a-zA-Z]{2,})'
-    entity_matches = re.finditer(html_entity_pattern, text)
-    for match in entity_matches:
-        if match.group(1) and match.group(2) and match.group(3):
-            email = f"{match.group(1)}@{match.group(2)}.{match.group(3)}"
-            filtered_emails.add(email.lower())
-    
-    # Pattern for separated email parts with CSS display tricks
-    css_pattern = r'<span[^>]*data-user=["\']([^"\']+)["\'][^>]*>.*?</span>.*?<span[^>]*data-domain=["\']([^"\']+)["\'][^>]*>.*?</span>'
-    css_matches = re.finditer(css_pattern, text)
-    for match in css_matches:
-        if match.group(1) and match.group(2):
-            email = f"{match.group(1)}@{match.group(2)}"
-            filtered_emails.add(email.lower())
-    
-    # Pattern for unicode obfuscation
-    unicode_pattern = r'([a-zA-Z0-9._%+-]+)(?:\\u0*40|\\x40)([a-zA-Z0-9.-]+)(?:\\u0*2e|\\x2e)([a-zA-Z]{2,})'
-    unicode_matches = re.finditer(unicode_pattern, text)
-    for match in unicode_matches:
-        if match.group(1) and match.group(2) and match.group(3):
-            email = f"{match.group(1)}@{match.group(2)}.{match.group(3)}"
-            filtered_emails.add(email.lower())
-    
-    return list(filtered_emails)
-
-def simple_extract_phones(text):
-    """Extract phone numbers without using Selenium"""
-    phone_pattern = r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phones = re.findall(phone_pattern, text)
-    return list(set(phones))
-
-def simple_extract_social(text):
-    """Extract social media links without using Selenium"""
-    social_patterns = {
-        'linkedin': r'(?:https?:\/\/)?(?:www\.)?linkedin\.com\/(?:in|company)\/[a-zA-Z0-9_-]+\/?',
-        'twitter': r'(?:https?:\/\/)?(?:www\.)?(?:twitter\.com|x\.com)\/[a-zA-Z0-9_-]+\/?',
-        'facebook': r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/(?:profile\.php\?id=\d+|[a-zA-Z0-9._-]+)\/?',
+# Requests-based scraper, used for every URL before any browser escalation
+def simple_error_result(url, error):
+    """Build the result dict for a URL the simple scraper could not scrape"""
+    return {
+        'url': url,
+        'domain': urllib.parse.urlparse(url).netloc if url.startswith(('http://', 'https://')) else '',
+        'emails': [],
+        'phones': [],
+        'social_media': {},
+        'status': f"Error (simple scraper): {str(error)}",
+        'fetch_tier': STATIC_TIER,
+        'escalation_reason': ''
     }
-    
-    social = {}
-    for platform, pattern in social_patterns.items():
-        matches = re.findall(pattern, text)
-        if matches:
-            social[platform] = matches[0]
-    return social
-
-def decode_cloudflare_email(encoded_email):
-    """Decode a Cloudflare protected email"""
-    try:
-        # Cloudflare encoding uses a simple XOR cipher
-        decoded = ""
-        
-        # Convert hex to bytes
-        hex_encoded = bytes.fromhex(encoded_email)
-        
-        # First byte is the key
-        key = hex_encoded[0]
-        
-        # Decode each byte with XOR
-        for i in range(1, len(hex_encoded)):
-            decoded += chr(hex_encoded[i] ^ key)
-        
-        return decoded
-    except Exception as e:
-        logger.warning(f"Failed to decode Cloudflare email: {str(e)}")
-        return None
-
-def find_cloudflare_emails(html):
-    """Find Cloudflare protected emails in HTML content"""
-    # Look for Cloudflare protected email patterns
-    cf_pattern = r'<a[^>]*href="/cdn-cgi/l/email-protection#([a-zA-Z0-9]+)"[^>]*>.*?</a>'
-    cf_data_pattern = r'<a[^>]*data-cfemail="([a-zA-Z0-9]+)"[^>]*>.*?</a>'
-    
-    emails = []
-    
-    # Find emails with href pattern
-    for match in re.finditer(cf_pattern, html, re.IGNORECASE):
-        encoded = match.group(1)
-        decoded = decode_cloudflare_email(encoded)
-        if decoded and '@' in decoded:
-            emails.append(decoded.lower())
-    
-    # Find emails with data-cfemail pattern
-    for match in re.finditer(cf_data_pattern, html, re.IGNORECASE):
-        encoded = match.group(1)
-        decoded = decode_cloudflare_email(encoded)
-        if decoded and '@' in decoded:
-            emails.append(decoded.lower())
-    
-    return list(set(emails))
-
-def find_mailto_links(soup):
-    """Extract email addresses from mailto links"""
-    emails = []
-    
-    # Find all mailto links
-    for link in soup.find_all('a', href=True):
-        href = link.get('href', '')
-        if href.startswith('mailto:'):
-            # Extract email from mailto: link
-            email = href.replace('mailto:', '').strip()
-            # Remove any query parameters
-            email = email.split('?')[0].strip()
-            if '@' in email and '.' in email:
-                emails.append(email.lower())
-    
-    return list(set(emails))
-
-def find_image_emails(soup):
-    """Find email addresses in image alt tags"""
-    emails = []
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    
-    # Find all images
-    for img in soup.find_all('img', alt=True):
-        alt_text = img.get('alt', '')
-        # Check for email patterns in alt text
-        matches = re.findall(email_pattern, alt_text)
-        for email in matches:
-            if '@' in email and '.' in email:
-                emails.append(email.lower())
-    
-    # Also check title attributes which sometimes contain emails
-    for elem in soup.find_all(title=True):
-        title_text = elem.get('title', '')
-        matches = re.findall(email_pattern, title_text)
-        for email in matches:
-            if '@' in email and '.' in email:
-                emails.append(email.lower())
-    
-    return list(set(emails))
 
 def simple_scrape_url(url):
     """Simple fallback scraper using requests instead of Selenium"""
+    scheduler = get_host_scheduler()
+    robots = get_robots_cache()
+    responses = get_response_cache()
+    extractions = get_extraction_cache()
     try:
         logger.info(f"Using simple scraper for URL: {url}")
         
         # Normalize URL
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
-            
-        # Get domain
-        domain = urllib.parse.urlparse(url).netloc
         
-        # Make request with timeout
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Parse content
-        content = response.text
-        soup = BeautifulSoup(content, 'html.parser')
-        text = soup.get_text()
-        
-        # Extract information
-        emails = simple_extract_emails(text)
-        phones = simple_extract_phones(text)
-        social = simple_extract_social(content)
-        
-        # Check for Cloudflare protected emails
-        cloudflare_emails = find_cloudflare_emails(content)
-        if cloudflare_emails:
-            logger.info(f"Found {len(cloudflare_emails)} Cloudflare protected emails")
-            emails.extend(cloudflare_emails)
+        with polite_slot(scheduler, url, robots) as host:
+            if not robots.fetch(url).allowed(url):
+                raise RobotsDisallowed(url)
             
-        # Check for emails in image alt tags
-        img_emails = find_image_emails(soup)
-        if img_emails:
-            logger.info(f"Found {len(img_emails)} emails in image alt tags")
-            emails.extend(img_emails)
+            # Make request with timeout; pages fetched by earlier jobs may come from the cache
+            _, body, charset = responses.get(url, timeout=30)
             
-        # Check for mailto links
-        mailto_emails = find_mailto_links(soup)
-        if mailto_emails:
-            logger.info(f"Found {len(mailto_emails)} emails in mailto links")
-            emails.extend(mailto_emails)
+            result, contact_urls = extractions.cached('homepage', body, lambda: parse_homepage(url, body, charset),
+                                                      url=url, charset=charset)
             
-        # Try to find and visit contact page
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if href and any(keyword in href.lower() or keyword in link.get_text().lower() 
-                           for keyword in ['contact', 'about']):
+            # Try to visit a contact page
+            for contact_url in contact_urls:
+                if not read_robots(scheduler, robots, contact_url)[0].allowed(contact_url):
+                    logger.info(f"Skipping contact page blocked by robots.txt: {contact_url}")
+                    continue
                 try:
-                    # Handle relative URLs
-                    if not href.startswith(('http://', 'https://')):
-                        contact_url = urllib.parse.urljoin(url, href)
-                    else:
-                        contact_url = href
-                        
-                    # Visit contact page
                     logger.info(f"Visiting contact page: {contact_url}")
-                    contact_response = requests.get(contact_url, headers=headers, timeout=15)
-                    if contact_response.ok:
-                        contact_content = contact_response.text
-                        contact_soup = BeautifulSoup(contact_content, 'html.parser')
-                        contact_text = contact_soup.get_text()
-                        
-                        # Extract additional information
-                        emails.extend(simple_extract_emails(contact_text))
-                        phones.extend(simple_extract_phones(contact_text))
-                        social.update(simple_extract_social(contact_content))
-                        
-                        # Remove duplicates
-                        emails = list(set(emails))
-                        phones = list(set(phones))
+                    ok, contact_body, contact_charset = responses.get(
+                        contact_url, timeout=15, raise_for_status=False,
+                        before_request=lambda: scheduler.wait_turn(host)
+                    )
+                    if ok:
+                        found = extractions.cached('contact', contact_body,
+                                                   lambda: parse_contact_page(contact_body, contact_charset),
+                                                   charset=contact_charset)
+                        merge_contact_page(result, found)
                 except Exception as e:
-                    logger.warning(f"Error visiting contact page {href}: {str(e)}")
+                    logger.warning(f"Error visiting contact page {contact_url}: {str(e)}")
                     continue
                     
                 # Only check one contact page to avoid too many requests
                 break
             
-        logger.info(f"Simple scraper found: {len(emails)} emails, {len(phones)} phones")
-        return {
-            'url': url,
-            'domain': domain,
-            'emails': emails,
-            'phones': phones,
-            'social_media': social,
-            'status': 'success (simple scraper)'
-        }
+        logger.info(f"Simple scraper found: {len(result['emails'])} emails, {len(result['phones'])} phones")
+        return result
+    except RobotsDisallowed as e:
+        logger.info(str(e))
+        return simple_error_result(url, e)
     except Exception as e:
         logger.error(f"Simple scraper error for {url}: {str(e)}")
-        return {
-            'url': url,
-            'domain': urllib.parse.urlparse(url).netloc if url.startswith(('http://', 'https://')) else '',
-            'emails': [],
-            'phones': [],
-            'social_media': {},
-            'status': f"Error (simple scraper): {str(e)}"
-        }
+        return simple_error_result(url, e)
 
-def run_scrape_job(job, urls, headless=True, user_id=None):
-    """Run scraping job in a separate thread"""
+def run_scrape_job(job, urls, headless=True, user_id=None, completed_results=None, only_new=False):
+    """
+    Run scraping job in a separate thread
+    
+    completed_results holds (URL index, result) pairs from an earlier attempt,
+    e.g. iter_checkpoints(); those URLs are not scraped again. Results are
+    written to the result file as they finish and not kept in memory, apart
+    from the job's counts and preview. Inputs that are the same page spelled
+    differently (scheme, www, host case, trailing slash, tracking parameters)
+    are fetched once and the result is copied to each of them. For a user's
+    job, every result gets the job and time each contact was first found for
+    that user; only_new drops the contacts found by earlier jobs.
+    """
+    writer = None
+    dedup = None
     try:
-        job.status = "running"
+        job.start()
+        
+        # Check contacts against the ones the user got from earlier jobs
+        if user_id and app.config['SCRAPE_CONTACT_DEDUP']:
+            dedup = ContactDedup(
+                user_id, job.job_id,
+                capacity=app.config['SCRAPE_DEDUP_FILTER_CAPACITY'],
+                error_rate=app.config['SCRAPE_DEDUP_FILTER_ERROR_RATE']
+            )
+            with app.app_context():
+                dedup.load()
         
         # Create job history record if user is authenticated
         job_history = None
         if user_id:
             with app.app_context():
-                job_history = ScrapeJobHistory(
-                    job_id=job.job_id,
-                    user_id=user_id,
-                    total_urls=len(urls),
-                    created_at=datetime.now(timezone.utc),
-                    status='in_progress'
-                )
-                db.session.add(job_history)
-                db.session.commit()
+                # A requeued job already has its history record from the first attempt
+                job_history = ScrapeJobHistory.query.filter_by(job_id=job.job_id, user_id=user_id).first()
+                if job_history is None:
+                    job_history = ScrapeJobHistory(
+                        job_id=job.job_id,
+                        user_id=user_id,
+                        total_urls=len(urls),
+                        created_at=datetime.now(timezone.utc),
+                        status='in_progress'
+                    )
+                    db.session.add(job_history)
+                    db.session.commit()
         
         # Use simple scraper by default for better performance
         logger.info("Using requests-based scraper for better performance")
         
-        # Process URLs with simple scraper
-        results = []
         total = len(urls)
+        completed = 0
+        escalate_browser = app.config['SCRAPE_BROWSER_ESCALATION']
+        browser_pending = {}  # Fetch position -> static result waiting for the browser tier
+        
+        # Results are streamed to disk as they finish; a resumed job rewrites its own files
+        writer = StreamingResultWriter(
+            f"results/scrape_results_{job.job_id}",
+            extra_formats=app.config['SCRAPE_RESULT_EXTRA_FORMATS']
+        )
+        
+        # Resume from checkpoints: restore finished URLs and scrape only the rest
+        done = bytearray(total)
+        with app.app_context():
+            for i, result in completed_results or ():
+                done[i] = 1
+                job.add_result(result)
+                writer.write(result)
+                completed += 1
+        remaining = [i for i in range(total) if not done[i]]
+        if completed:
+            logger.info(f"Resuming job {job.job_id}: {completed} URLs already done, {len(remaining)} remaining")
+            job.update_progress(completed, total)
         
         # Log the number of URLs to process
         logger.info(f"Processing {total} URLs for job {job.job_id}")
@@ -715,9 +778,28 @@ def run_scrape_job(job, urls, headless=True, user_id=None):
         if is_single_url:
             logger.info("Special handling for single URL job")
         
-        for i, url in enumerate(urls):
-            logger.info(f"Processing URL {i+1}/{total}: {url}")
-            result = simple_scrape_url(url)
+        # Collapse spellings of the same page to one fetch each
+        if app.config['SCRAPE_COLLAPSE_URLS']:
+            fetches = collapse_urls(urls, remaining)
+            if len(fetches) < len(remaining):
+                logger.info(f"Collapsed {len(remaining)} URLs to {len(fetches)} distinct pages for job {job.job_id}")
+        else:
+            fetches = [(urls[i], [i]) for i in remaining]
+        
+        def record_fetch(k, result, escalated=False):
+            """Record a fetched page for every input URL it stands for"""
+            # JavaScript-rendered pages are recorded once the browser tier is done with them
+            if escalate_browser and not escalated and result.get('escalation_reason'):
+                browser_pending[k] = result
+                return
+            
+            indexes = fetches[k][1]
+            for i, row in zip(indexes, fan_out(result, [urls[i] for i in indexes])):
+                record_result(i, row)
+        
+        def record_result(i, result):
+            """Track a finished URL on the job as soon as it completes"""
+            nonlocal completed
             
             # CRITICAL FIX: Ensure fields are properly formatted for the first URL
             if i == 0:
@@ -730,83 +812,79 @@ def run_scrape_job(job, urls, headless=True, user_id=None):
                     logger.warning(f"Converting phones to list format: {result['phones']}")
                     result['phones'] = [result['phones']] if result['phones'] else []
             
-            results.append(result)
+            if dedup:
+                with app.app_context():
+                    dedup.annotate(result, only_new=only_new)
             
             # Use the add_result method to track the result
-            job.add_result(result)
+            job.add_result(result, index=i)
+            writer.write(result)
             
             # Log results for debugging, especially for first URL
             if i == 0:
                 logger.info(f"Result for first URL: {result}")
                 # Log important field types for debugging
                 logger.info(f"First result field types - emails: {type(result.get('emails'))}, phones: {type(result.get('phones'))}")
-                
-            job.update_progress(i+1, total)
             
-        # Generate timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        result_file = f"results/scrape_results_{timestamp}.xlsx"
-        
-        # Log the final results
-        logger.info(f"Job {job.job_id} completed with {len(results)} results")
-        if results:
-            logger.info(f"First result: {results[0]}")
-        
-        # Export results
-        df = pd.DataFrame(results)
-        
-        # Handle empty DataFrame
-        if df.empty:
-            logger.warning(f"No results found for job {job.job_id}")
-            df = pd.DataFrame(columns=['url', 'domain', 'emails', 'phones', 'social_media', 'status'])
+            completed += 1
+            job.update_progress(completed, total)
+        
+        parse_pool = get_parse_pool()
+        engine = AsyncFetchEngine(
+            max_concurrency=app.config['SCRAPE_CONCURRENCY'],
+            max_per_host=app.config['HTTP_POOL_MAX_PER_HOST'],
+            parse_executor=parse_pool.executor(),
+            max_pending_parses=parse_pool.max_pending,
+            scheduler=get_host_scheduler(),
+            robots=get_robots_cache(),
+            cache=get_response_cache(),
+            extraction_cache=get_extraction_cache()
+        )
+        if engine.available():
+            # Fetch URLs concurrently; each result is recorded as soon as it finishes
+            logger.info(f"Using async fetch engine with concurrency {engine.max_concurrency}")
+            engine.run(
+                [url for url, _ in fetches],
+                parse_homepage,
+                parse_contact_page,
+                merge_contact_page,
+                simple_error_result,
+                on_result=record_fetch
+            )
         else:
-            logger.info(f"Created DataFrame with {len(df)} rows and columns: {list(df.columns)}")
-            
-            # For single URL jobs, ensure the row is properly formatted
-            if is_single_url:
-                logger.info(f"Single URL DataFrame row: {df.iloc[0].to_dict()}")
-                
-                # EXTRA VALIDATION: Make sure the first result is properly stored and accessible
-                if len(job.results) > 0:
-                    first_result = job.results[0]
-                    logger.info("FINAL VALIDATION - First result that will be sent to frontend:")
-                    logger.info(f"- complete object: {first_result}")
-                    logger.info(f"- emails (type: {type(first_result.get('emails', []))}, value: {first_result.get('emails', [])})")
-                    logger.info(f"- phones (type: {type(first_result.get('phones', []))}, value: {first_result.get('phones', [])})")
-        
-        # Convert social media dict to columns
-        if 'social_media' in df.columns:
-            social_df = pd.json_normalize(df['social_media'].fillna({}))
-            df = df.drop('social_media', axis=1)
+            logger.warning("aiohttp is not installed, processing URLs sequentially")
+            for k, (url, indexes) in enumerate(fetches):
+                logger.info(f"Processing URL {indexes[0]+1}/{total}: {url}")
+                record_fetch(k, simple_scrape_url(url))
+        
+        # Second tier: only pages that look JavaScript-rendered are loaded in Chrome
+        if browser_pending:
+            scraper = ContactScraper(
+                max_workers=app.config['SCRAPE_BROWSER_WORKERS'],
+                headless=headless,
+                resource_allowlist=app.config['SCRAPE_BROWSER_ALLOWLIST'],
+                scheduler=get_host_scheduler(),
+                robots=get_robots_cache(),
+                extraction_cache=get_extraction_cache()
+            )
+            escalate_to_browser(browser_pending, list(browser_pending), scraper)
+            for k, result in browser_pending.items():
+                record_fetch(k, result, escalated=True)
             
-            # Combine with social media columns
-            if not social_df.empty:
-                final_df = pd.concat([df, social_df], axis=1)
-            else:
-                final_df = df
-        else:
-            final_df = df
+        # Finish the result files; every row was written as its URL completed
+        writer.close()
         
-        # Clean up lists in cells
-        for col in final_df.columns:
-            if final_df[col].dtype == 'object':
-                final_df[col] = final_df[col].apply(
-                    lambda x: ', '.join(map(str, x)) if isinstance(x, list) else x
-                )
+        if dedup:
+            with app.app_context():
+                dedup.save()
+            logger.info(f"Contact dedup for job {job.job_id}: {dedup.stats()}")
         
-        # Log the final DataFrame before saving
-        logger.info(f"Final DataFrame has {len(final_df)} rows")
-        if not final_df.empty:
-            logger.info(f"First row in final DataFrame: {final_df.iloc[0].to_dict() if len(final_df) > 0 else 'No rows'}")
-        
-        # Special save handling for single URL jobs
-        if is_single_url and not final_df.empty:
-            logger.info("Ensuring single URL result is properly saved")
-            # Force write of a valid single-row DataFrame
-            first_row = final_df.iloc[0].to_dict()
-            logger.info(f"Single URL first row: {first_row}")
-            
-        final_df.to_excel(result_file, index=False)
+        result_file = writer.result_path
+        
+        # Log the final results
+        logger.info(f"Job {job.job_id} completed with {job.result_count} results")
+        if job.results:
+            logger.info(f"First result: {job.results[0]}")
         logger.info(f"Results exported to {result_file}")
         
         # Mark job as completed
@@ -822,10 +900,9 @@ def run_scrape_job(job, urls, headless=True, user_id=None):
                     job_history.status = 'completed'
                     job_history.completed_at = datetime.now(timezone.utc)
                     job_history.result_file = result_file
-                    job_history.successful_urls = len(results)
-                    # Count total emails found across all results
-                    total_emails = sum(len(result.get('emails', [])) for result in results if isinstance(result.get('emails', []), list))
-                    job_history.emails_found = total_emails
+                    job_history.successful_urls = job.result_count
+                    # Emails were counted as the results came in
+                    job_history.emails_found = job.emails_found
                     
                     db.session.commit()
                     logger.info(f"Successfully updated job history for {job.job_id} to completed status")
@@ -839,9 +916,8 @@ def run_scrape_job(job, urls, headless=True, user_id=None):
                             db_job.status = 'completed'
                             db_job.completed_at = datetime.now(timezone.utc)
                             db_job.result_file = result_file
-                            db_job.successful_urls = len(results)
-                            total_emails = sum(len(result.get('emails', [])) for result in results if isinstance(result.get('emails', []), list))
-                            db_job.emails_found = total_emails
+                            db_job.successful_urls = job.result_count
+                            db_job.emails_found = job.emails_found
                             db.session.commit()
                             logger.info(f"Successfully updated job history for {job.job_id} using alternative method")
                     except Exception as e2:
@@ -852,6 +928,21 @@ def run_scrape_job(job, urls, headless=True, user_id=None):
         logger.error(f"Error in scrape job {job.job_id}: {str(e)}")
         job.fail(str(e))
         
+        # Keep the rows written so far readable
+        if writer:
+            try:
+                writer.close()
+            except Exception as close_error:
+                logger.warning(f"Error closing result files for {job.job_id}: {str(close_error)}")
+        
+        # Contacts already reported as new stay recorded for the resumed job
+        if dedup and dedup.bloom is not None:
+            try:
+                with app.app_context():
+                    dedup.save()
+            except Exception as dedup_error:
+                logger.warning(f"Error saving contact dedup index for {job.job_id}: {str(dedup_error)}")
+        
         # Update job history record if exists
         if job_history:
             with app.app_context():
@@ -879,6 +970,100 @@ def run_scrape_job(job, urls, headless=True, user_id=None):
                         db.session.rollback()
 
 
+# Scrape queue workers. Jobs are queued in the database; worker.py runs them in
+# separate processes, and the web process can run a few itself as well.
+_embedded_workers = []
+_embedded_workers_lock = threading.Lock()
+
+def start_scrape_job(urls, headless=True, user_id=None, only_new=False):
+    """Queue a scrape job and return its job ID"""
+    job_id = new_job_id()
+    enqueue_job(job_id, urls, headless=headless, user_id=user_id, only_new=only_new)
+    start_embedded_workers()
+    return job_id
+
+def find_job(job_id):
+    """Find a job run by this process, or load it from the scrape queue"""
+    job = job_registry.get(job_id)
+    if job is not None:
+        return job
+    
+    record = get_queued_job(job_id)
+    if record is None:
+        return None
+    
+    # Results are read from the result file when they are asked for
+    job = ScrapeJob.from_queue_record(record, with_results=False)
+    # Finished jobs don't change any more, keep them for the next request; the
+    # cached view is the status with its result preview, so that is what is measured
+    if record.status in (COMPLETED, ERROR):
+        job_registry.add_finished(job, size=len(json.dumps(job.to_dict(), default=str)))
+    return job
+
+def run_queued_job(job, urls, headless, user_id, completed_results=None, only_new=False):
+    """Run a claimed queue job, sending heartbeats until it finishes"""
+    stop_heartbeat = threading.Event()
+    
+    def send_heartbeats():
+        while not stop_heartbeat.wait(app.config['SCRAPE_JOB_STALE_AFTER'] / 5):
+            try:
+                with app.app_context():
+                    heartbeat(job.record_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for job {job.job_id}: {str(e)}")
+    
+    heartbeat_thread = threading.Thread(target=send_heartbeats, daemon=True)
+    heartbeat_thread.start()
+    job_registry.add_running(job)
+    try:
+        run_scrape_job(job, urls, headless, user_id, completed_results, only_new)
+    finally:
+        stop_heartbeat.set()
+        # The queue row holds the outcome from here on
+        job_registry.remove_running(job.job_id)
+
+def run_queue_worker(worker_id=None, stop_event=None):
+    """Claim and run queued scrape jobs one at a time until stop_event is set"""
+    worker_id = worker_id or default_worker_id()
+    stop_event = stop_event or threading.Event()
+    logger.info(f"Scrape worker {worker_id} started")
+    
+    while not stop_event.is_set():
+        claimed = None
+        try:
+            with app.app_context():
+                requeue_stale_jobs(app.config['SCRAPE_JOB_STALE_AFTER'], app.config['SCRAPE_JOB_MAX_ATTEMPTS'])
+                record = claim_next_job(worker_id)
+                if record:
+                    claimed = (QueuedScrapeJob(record), job_urls(record), record.headless, record.user_id,
+                               iter_checkpoints(record.id), bool(record.only_new))
+        except Exception as e:
+            logger.error(f"Scrape worker {worker_id} could not read the queue: {str(e)}")
+        
+        if claimed is None:
+            stop_event.wait(app.config['SCRAPE_WORKER_POLL_INTERVAL'])
+            continue
+        
+        logger.info(f"Scrape worker {worker_id} picked up job {claimed[0].job_id}")
+        run_queued_job(*claimed)
+    
+    logger.info(f"Scrape worker {worker_id} stopped")
+
+def start_embedded_workers():
+    """Start the web process's queue worker threads if they are not running"""
+    with _embedded_workers_lock:
+        _embedded_workers[:] = [thread for thread in _embedded_workers if thread.is_alive()]
+        for _ in range(app.config['SCRAPE_EMBEDDED_WORKERS'] - len(_embedded_workers)):
+            thread = threading.Thread(target=run_queue_worker, daemon=True)
+            thread.start()
+            _embedded_workers.append(thread)
+
+@app.before_first_request
+def resume_queued_jobs():
+    """Pick up jobs left in the queue before this process started"""
+    start_embedded_workers()
+
+
 @app.route('/')
 def index():
     """Render the main landing page with scraping interface."""
@@ -965,16 +1150,13 @@ def preview_file():
         file.save(temp_file_path)
         
         try:
-            # Read and count URLs
-            urls = process_url_file(temp_file_path)
-            url_count = len(urls)
+            # Count URLs and show the first 5 as preview, without loading the whole file
+            url_count, preview_urls = preview_url_file(temp_file_path, limit=5)
             
             # Get user's limit
             current_user_obj = current_user if current_user.is_authenticated else None
             user_limit = get_user_url_limit(current_user_obj)
             
-            preview_urls = urls[:5]  # Show first 5 URLs as preview
-            
             return json_response({
                 'url_count': url_count,
                 'user_limit': user_limit,
@@ -1015,6 +1197,11 @@ def upload_urls():
         if 'file' not in request.files:
             return json_response({'error': 'No file part'}, 400)
         
+        try:
+            only_new = bool(parse_bool(request.form.get('only_new')))
+        except ValueError as e:
+            return json_response({'error': f"only_new: {str(e)}"}, 400)
+        
         file = request.files['file']
         if file.filename == '':
             return json_response({'error': 'No selected file'}, 400)
@@ -1028,37 +1215,25 @@ def upload_urls():
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(file_path)
         
-        # Process URLs
-        urls = process_url_file(file_path)
+        # Get dynamic URL limit based on user status
+        current_user_obj = current_user if current_user.is_authenticated else None
+        max_urls = get_user_url_limit(current_user_obj)
+        
+        # Process URLs; one past the limit is enough to reject the file
+        urls = process_url_file(file_path, limit=max_urls + 1)
         
         # Check if we have valid URLs
         if not urls:
             return json_response({'error': 'No valid URLs found in the file'}, 400)
         
-        # Get dynamic URL limit based on user status
-        current_user_obj = current_user if current_user.is_authenticated else None
-        max_urls = get_user_url_limit(current_user_obj)
-        
         # Limit number of URLs
         if len(urls) > max_urls:
             return json_response({
                 'error': f'Too many URLs. Maximum allowed is {max_urls} URLs per batch for your account type'
             }, 400)
         
-        # Generate job ID
-        job_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Create job
-        job = ScrapeJob(job_id, len(urls))
-        active_jobs[job_id] = job
-        
-        # Start scraping thread
-        thread = threading.Thread(
-            target=run_scrape_job, 
-            args=(job, urls, True, user_id)
-        )
-        thread.daemon = True
-        thread.start()
+        # Queue the job; a scrape worker picks it up
+        job_id = start_scrape_job(urls, headless=True, user_id=user_id, only_new=only_new)
         
         return json_response({
             'success': True,
@@ -1075,28 +1250,65 @@ def upload_urls():
 @app.route('/api/jobs/<job_id>', methods=['GET'])
 def get_job_status(job_id):
     """Get status of a specific job"""
-    if job_id not in active_jobs:
+    job = find_job(job_id)
+    if job is None:
         return json_response({'error': 'Job not found'}, 404)
     
-    job = active_jobs[job_id]
     return json_response(job.to_dict())
 
 
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Stream progress and newly found contacts of a job as Server-Sent Events"""
+    if find_job(job_id) is None:
+        return json_response({'error': 'Job not found'}, 404)
+    
+    # Browsers send the last event ID when they reconnect
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id', '')
+    sent = int(last_event_id) if last_event_id.isdigit() else 0
+    
+    stream = JobEventStream(app, job_id, job_registry.running, ScrapeJob.from_queue_record, sent=sent)
+    response = Response(iter(stream), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
+
+
 @app.route('/api/jobs', methods=['GET'])
 def get_all_jobs():
-    """Get status of all jobs"""
+    """
+    Get status of the newest jobs, one page at a time.
+    
+    Query parameters:
+        limit: jobs per page (default SCRAPE_JOBS_PAGE_SIZE, at most 100)
+        before: next_before from the previous page
+    """
+    limit = max(1, min(request.args.get('limit', app.config['SCRAPE_JOBS_PAGE_SIZE'], type=int), 100))
+    before = request.args.get('before', type=int)
+    
+    records = recent_jobs(limit=limit, before_id=before)
+    jobs = []
+    for record in records:
+        # Jobs running here have live progress; the rest are summarised without their results
+        job = job_registry.running(record.job_id) or ScrapeJob.from_queue_record(record, with_results=False)
+        summary = job.progress_dict()
+        summary['result_file'] = job.result_file
+        summary['error'] = job.error
+        jobs.append(summary)
+    
     return json_response({
-        'jobs': [job.to_dict() for job in active_jobs.values()]
+        'jobs': jobs,
+        'next_before': records[-1].id if len(records) == limit else None
     })
 
 
 @app.route('/api/download/<job_id>', methods=['GET'])
 def download_results(job_id):
     """Download results file"""
-    if job_id not in active_jobs:
+    job = find_job(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job = active_jobs[job_id]
     
     if job.status != "completed" or not job.result_file:
         return jsonify({'error': 'Results not available'}), 404
@@ -1105,8 +1317,11 @@ def download_results(job_id):
         # Set appropriate headers for file download
         filename = f"scrape_results_{job_id}.xlsx"
         
+        # Results are stored as Parquet; the Excel copy is made on first download
+        xlsx_path = export_xlsx(job.result_file)
+        
         response = send_file(
-            job.result_file, 
+            xlsx_path, 
             as_attachment=True,
             download_name=filename,
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
@@ -1125,99 +1340,58 @@ def download_results(job_id):
 
 @app.route('/api/results/<job_id>', methods=['GET'])
 def get_job_results(job_id):
-    """Get detailed results for a specific job"""
-    if job_id not in active_jobs:
+    """
+    Get one page of results for a specific job.
+
+    Query parameters:
+        cursor: next_cursor from the previous page, omit for the first page
+        limit: results per page (default 100, at most 1000)
+        fields: comma-separated fields to return, e.g. url,emails
+        has_email: true or false
+        domain: only this domain and its subdomains
+        status: only results whose status contains this text, e.g. success or error
+    """
+    job = find_job(job_id)
+    if job is None:
         logger.error(f"Job not found: {job_id}")
         return json_response({'error': 'Job not found'}, 404)
     
-    job = active_jobs[job_id]
     
     if job.status != "completed":
         logger.error(f"Job not completed: {job_id}, status: {job.status}")
         return json_response({'error': 'Results not available - job not completed'}, 404)
     
-    logger.info(f"Job {job_id} has {len(job.results)} raw results")
+    try:
+        fields = parse_fields(request.args.get('fields'))
+        filters = {
+            'has_email': parse_bool(request.args.get('has_email')),
+            'domain': request.args.get('domain', '').strip() or None,
+            'status': request.args.get('status', '').strip() or None
+        }
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        cursor = request.args.get('cursor')
+        decode_cursor(cursor)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
     
     try:
-        # For all cases, prefer job.results as the primary source
-        if job.results and len(job.results) > 0:
-            logger.info(f"Using results directly from job object: {len(job.results)} results")
-            
-            results = []
-            for idx, result in enumerate(job.results):
-                if idx == 0:
-                    logger.info(f"Processing job result [0]: {result}")
-                
-                processed_result = {
-                    'url': result.get('url', ''),
-                    'domain': result.get('domain', ''),
-                    'emails': result.get('emails', []) if isinstance(result.get('emails', []), list) else [],
-                    'phones': result.get('phones', []) if isinstance(result.get('phones', []), list) else [],
-                    'status': result.get('status', ''),
-                    'social_media': result.get('social_media', {})
-                }
-                results.append(processed_result)
-            
-            logger.info(f"Processed {len(results)} results directly from job.results")
-            
-            if results:
-                return json_response({
-                    'job_id': job_id,
-                    'total_results': len(results),
-                    'results': results
-                })
-        
-        # Fallback to Excel file
         if not job.result_file:
             logger.error(f"No result file available for job {job_id}")
             return json_response({'error': 'Results file not available'}, 404)
-            
-        logger.info(f"Reading results from Excel file: {job.result_file}")
-        df = pd.read_excel(job.result_file)
-        
-        logger.info(f"Read DataFrame with {len(df)} rows and columns: {list(df.columns)}")
-        
-        if df.empty:
-            logger.warning(f"DataFrame is empty for job {job_id}")
-            return json_response({
-                'job_id': job_id,
-                'total_results': 0,
-                'results': []
-            })
         
-        # Format results from Excel
-        results = []
-        for idx, row in df.iterrows():
-            if idx == 0:
-                logger.info(f"Processing Excel row [0]: {row.to_dict()}")
-                
-            result = {
-                'url': row.get('url', ''),
-                'domain': row.get('domain', ''),
-                'emails': row.get('emails', '').split(', ') if isinstance(row.get('emails', ''), str) and row.get('emails', '') else [],
-                'phones': row.get('phones', '').split(', ') if isinstance(row.get('phones', ''), str) and row.get('phones', '') else [],
-                'status': row.get('status', '')
-            }
-            
-            # Add social media if present
-            social_media = {}
-            for col in df.columns:
-                if col in ['linkedin', 'twitter', 'facebook']:
-                    if pd.notna(row.get(col)):
-                        social_media[col] = row.get(col)
-            
-            result['social_media'] = social_media
-            results.append(result)
-        
-        logger.info(f"Formatted {len(results)} results from Excel for job {job_id}")
+        # Only the requested and filtered columns are read from the file
+        columns = list(dict.fromkeys(fields + filter_fields(**filters)))
+        read = lambda start: iter_results(job.result_file, columns=columns, offset=start)
+        total_results = count_results(job.result_file)
         
-        if results:
-            logger.info(f"First result from Excel: {results[0]}")
+        results, next_cursor = page_results(read, cursor=cursor, limit=limit, fields=fields, **filters)
+        logger.info(f"Returning {len(results)} of {total_results} results for job {job_id}")
         
         return json_response({
             'job_id': job_id,
-            'total_results': len(results),
-            'results': results
+            'total_results': total_results,
+            'results': results,
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -1259,6 +1433,7 @@ def manual_scrape():
         
         # Filter out empty URLs
         urls = [url.strip() for url in urls if url and isinstance(url, str)]
+        only_new = data.get('only_new') is True
         
         if not urls:
             return json_response({'error': 'No valid URLs provided'}, 400)
@@ -1273,20 +1448,8 @@ def manual_scrape():
                 'error': f'Too many URLs. Maximum allowed is {max_urls} URLs per batch for your account type'
             }, 400)
         
-        # Generate job ID
-        job_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Create job
-        job = ScrapeJob(job_id, len(urls))
-        active_jobs[job_id] = job
-        
-        # Start scraping thread
-        thread = threading.Thread(
-            target=run_scrape_job, 
-            args=(job, urls, True, user_id)
-        )
-        thread.daemon = True
-        thread.start()
+        # Queue the job; a scrape worker picks it up
+        job_id = start_scrape_job(urls, headless=True, user_id=user_id, only_new=only_new)
         
         return json_response({
             'success': True,
@@ -1403,9 +1566,11 @@ def sync_job_statuses():
         messages = []
         
         for db_job in stuck_jobs:
+            memory_job = job_registry.running(db_job.job_id)
+            queued_job = None if memory_job else get_queued_job(db_job.job_id)
+            
             # Check if this job exists in memory
-            if db_job.job_id in active_jobs:
-                memory_job = active_jobs[db_job.job_id]
+            if memory_job:
                 
                 # If memory job is completed but database isn't, update database
                 if memory_job.status == "completed" and db_job.status == 'in_progress':
@@ -1414,10 +1579,8 @@ def sync_job_statuses():
                         db_job.completed_at = datetime.now(timezone.utc)
                         if memory_job.result_file:
                             db_job.result_file = memory_job.result_file
-                        if hasattr(memory_job, 'results'):
-                            total_emails = sum(len(result.get('emails', [])) for result in memory_job.results if isinstance(result.get('emails', []), list))
-                            db_job.emails_found = total_emails
-                            db_job.successful_urls = len(memory_job.results)
+                        db_job.emails_found = memory_job.emails_found
+                        db_job.successful_urls = memory_job.result_count
                         
                         db.session.commit()
                         fixed_count += 1
@@ -1436,6 +1599,36 @@ def sync_job_statuses():
                     except Exception as e:
                         db.session.rollback()
                         messages.append(f"Error fixing job {db_job.job_id}: {str(e)}")
+            elif queued_job:
+                # Jobs run by queue workers: the queue row has the outcome
+                if queued_job.status == COMPLETED:
+                    try:
+                        db_job.status = 'completed'
+                        db_job.completed_at = queued_job.finished_at or datetime.now(timezone.utc)
+                        db_job.result_file = queued_job.result_file
+                        if queued_job.result_file:
+                            # Only the emails column is read from the result file
+                            results = iter_results(queued_job.result_file, columns=['emails'])
+                            db_job.emails_found = sum(len(result.get('emails') or []) for result in results)
+                            db_job.successful_urls = count_results(queued_job.result_file)
+                        db.session.commit()
+                        fixed_count += 1
+                        messages.append(f"Fixed job {db_job.job_id}: completed")
+                    except Exception as e:
+                        db.session.rollback()
+                        messages.append(f"Error fixing job {db_job.job_id}: {str(e)}")
+                
+                elif queued_job.status == ERROR or is_stale(queued_job, app.config['SCRAPE_JOB_STALE_AFTER']):
+                    # Stuck or crashed: restart from its checkpoints instead of failing it
+                    try:
+                        done = resume_job(queued_job)
+                        job_registry.discard(queued_job.job_id)
+                        start_embedded_workers()
+                        fixed_count += 1
+                        messages.append(f"Restarted job {db_job.job_id}: {done} of {queued_job.total_urls} URLs already done")
+                    except Exception as e:
+                        db.session.rollback()
+                        messages.append(f"Error restarting job {db_job.job_id}: {str(e)}")
             else:
                 # For jobs not in memory, check if they're old and mark as failed
                 if db_job.created_at:
@@ -1462,6 +1655,63 @@ def sync_job_statuses():
         logger.error(f"Error in job sync: {str(e)}")
         return json_response({'error': str(e)}, 500)
 
+@app.route('/api/admin/jobs/<job_id>/resume', methods=['POST'])
+@login_required
+def resume_scrape_job(job_id):
+    """Restart a failed or stuck job, skipping the URLs it already finished"""
+    if not current_user.is_admin():
+        return json_response({'error': 'Admin access required'}, 403)
+    
+    queued_job = get_queued_job(job_id)
+    if queued_job is None:
+        return json_response({'error': 'Job not found'}, 404)
+    
+    if queued_job.status == RUNNING and not is_stale(queued_job, app.config['SCRAPE_JOB_STALE_AFTER']):
+        return json_response({'error': 'Job is still running'}, 409)
+    if queued_job.status not in (RUNNING, ERROR):
+        return json_response({'error': f'Job is {queued_job.status}, only failed or stuck jobs can be resumed'}, 409)
+    
+    done = resume_job(queued_job)
+    job_registry.discard(job_id)
+    start_embedded_workers()
+    return json_response({
+        'success': True,
+        'job_id': job_id,
+        'completed_urls': done,
+        'remaining_urls': queued_job.total_urls - done
+    })
+
+@app.route('/api/admin/http-pool', methods=['GET'])
+@login_required
+def http_pool_stats():
+    """Connection reuse statistics for the shared HTTP pool"""
+    if not current_user.is_admin():
+        return json_response({'error': 'Admin access required'}, 403)
+    
+    return json_response(get_pool().stats())
+
+@app.route('/api/admin/response-cache', methods=['GET'])
+@login_required
+def response_cache_stats():
+    """Hit, revalidation and miss counts for the shared page and extraction caches"""
+    if not current_user.is_admin():
+        return json_response({'error': 'Admin access required'}, 403)
+    
+    stats = get_response_cache().stats()
+    stats['extraction'] = get_extraction_cache().stats()
+    return json_response(stats)
+
+@app.route('/api/admin/host-scheduler', methods=['GET'])
+@login_required
+def host_scheduler_stats():
+    """Per-host politeness limits, the hosts currently being scraped and robots.txt cache counters"""
+    if not current_user.is_admin():
+        return json_response({'error': 'Admin access required'}, 403)
+    
+    stats = get_host_scheduler().stats()
+    stats['robots'] = get_robots_cache().stats()
+    return json_response(stats)
+
 @app.route('/api/user/credits')
 @login_required
 def get_user_credits():
@@ -1556,6 +1806,7 @@ if __name__ == '__main__':
     with app.app_context():
         # Create database tables
         db.create_all()
+        upgrade_queue_table()
         
         # Load settings
         load_settings()
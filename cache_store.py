@@ -0,0 +1,288 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    used_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS cache_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Added after the first release of the cache file
+USED_AT_COLUMN = 'ALTER TABLE cache_entries ADD COLUMN used_at REAL NOT NULL DEFAULT 0'
+USED_AT_INDEX = 'CREATE INDEX IF NOT EXISTS ix_cache_entries_used_at ON cache_entries (namespace, used_at)'
+
+
+class CacheStore:
+    """
+    Key-value cache kept in a SQLite file on local disk.
+
+    Web processes, embedded worker threads and worker.py processes on the
+    same machine open the same file, so anything cached by one job is
+    available to the next one and survives restarts. Entries are grouped by
+    namespace and carry an expiry time; what an expired entry is still good
+    for is up to the caller.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the store, creating the file and table if needed.
+
+        Args:
+            path (str): SQLite file path
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(cache_entries)')]
+            if 'used_at' not in columns:
+                conn.execute(USED_AT_COLUMN)
+            conn.execute(USED_AT_INDEX)
+
+    def _connect(self):
+        # sqlite3 connections can't be shared between threads, so each thread opens its own
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            # WAL lets readers in other processes continue while one process writes
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace, key):
+        """
+        Look up an entry, expired or not.
+
+        Returns:
+            tuple: (value, expires_at) or None if there is no entry
+        """
+        row = self._connect().execute(
+            'SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?',
+            (namespace, key)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, namespace, key, value, ttl):
+        """
+        Store an entry, replacing any earlier one.
+
+        Args:
+            namespace (str): Entry group, e.g. 'robots'
+            key (str): Entry key within the namespace
+            value (bytes or str): Entry value
+            ttl (float): Seconds until the entry expires
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, used_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (namespace, key, value, now + ttl, now)
+            )
+
+    def touch(self, namespace, key, ttl=None):
+        """
+        Mark an entry as just used, for least-recently-used eviction.
+
+        Args:
+            ttl (float): If given, also restart the entry's expiry from now
+        """
+        now = time.time()
+        with self._connect() as conn:
+            if ttl is None:
+                conn.execute('UPDATE cache_entries SET used_at = ? WHERE namespace = ? AND key = ?',
+                             (now, namespace, key))
+            else:
+                conn.execute('UPDATE cache_entries SET used_at = ?, expires_at = ? WHERE namespace = ? AND key = ?',
+                             (now, now + ttl, namespace, key))
+
+    def evict(self, namespace, max_bytes):
+        """
+        Remove a namespace's least recently used entries until it fits in max_bytes.
+
+        Returns:
+            int: Entries removed
+        """
+        conn = self._connect()
+        total = conn.execute('SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries WHERE namespace = ?',
+                             (namespace,)).fetchone()[0]
+        if total <= max_bytes:
+            return 0
+
+        doomed = []
+        rows = conn.execute('SELECT key, LENGTH(value) FROM cache_entries WHERE namespace = ? ORDER BY used_at',
+                            (namespace,))
+        for key, size in rows:
+            if total <= max_bytes:
+                break
+            doomed.append((namespace, key))
+            total -= size
+        rows.close()
+        with conn:
+            conn.executemany('DELETE FROM cache_entries WHERE namespace = ? AND key = ?', doomed)
+        return len(doomed)
+
+    def delete(self, namespace, key):
+        """Remove an entry."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM cache_entries WHERE namespace = ? AND key = ?', (namespace, key))
+
+    def purge_expired(self, namespace):
+        """
+        Remove a namespace's expired entries.
+
+        Returns:
+            int: Entries removed
+        """
+        with self._connect() as conn:
+            cursor = conn.execute('DELETE FROM cache_entries WHERE namespace = ? AND expires_at < ?',
+                                  (namespace, time.time()))
+            return cursor.rowcount
+
+    def add_counters(self, counts):
+        """
+        Add to named counters shared by every process using the file.
+
+        Args:
+            counts (dict): Counter name -> amount to add
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT INTO cache_counters (name, value) VALUES (?, ?) '
+                'ON CONFLICT (name) DO UPDATE SET value = value + excluded.value',
+                list(counts.items())
+            )
+
+    def counters(self, prefix):
+        """Return the counters whose names start with prefix, without the prefix."""
+        rows = self._connect().execute('SELECT name, value FROM cache_counters WHERE name LIKE ?',
+                                       (prefix + '%',))
+        return {name[len(prefix):]: value for name, value in rows}
+
+    def delete_without_prefix(self, namespace, prefix, unused_for=0):
+        """
+        Remove a namespace's entries whose key doesn't start with prefix.
+
+        Args:
+            unused_for (float): Only remove entries not written or used for
+                this many seconds
+
+        Returns:
+            int: Entries removed
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'DELETE FROM cache_entries WHERE namespace = ? AND substr(key, 1, ?) != ? AND used_at <= ?',
+                (namespace, len(prefix), prefix, time.time() - unused_for)
+            )
+            return cursor.rowcount
+
+    def stats(self, namespace):
+        """Return the entry count and stored bytes of a namespace."""
+        entries, size = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries WHERE namespace = ?',
+            (namespace,)
+        ).fetchone()
+        return {'entries': entries, 'bytes': size}
+
+
+class CounterBuffer:
+    """
+    Counters for one cache, added up in memory and written to the store in batches.
+
+    Writing on every hit would add a database write to every lookup, so
+    counts are flushed after flush_events updates or flush_seconds, whichever
+    comes first. Counts not yet flushed when a process exits are lost.
+    """
+
+    def __init__(self, store, prefix, flush_events=20, flush_seconds=10):
+        """
+        Initialize the buffer.
+
+        Args:
+            store (CacheStore): Store that keeps the totals
+            prefix (str): Counter name prefix, e.g. 'responses.'
+            flush_events (int): Updates buffered before a write
+            flush_seconds (float): Longest time between writes while counting
+        """
+        self.store = store
+        self.prefix = prefix
+        self.flush_events = flush_events
+        self.flush_seconds = flush_seconds
+        self._counts = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, name, amount=1):
+        """Add to a counter."""
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+            self._pending += 1
+            due = self._pending >= self.flush_events or time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write buffered updates to the store."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        if counts:
+            try:
+                self.store.add_counters({self.prefix + name: value for name, value in counts.items()})
+            except Exception as e:
+                logger.warning(f"Could not save cache counters: {str(e)}")
+
+    def totals(self, names):
+        """
+        Return the totals across every process, after flushing this one.
+
+        Args:
+            names (iterable): Counters to report, missing ones are 0
+        """
+        self.flush()
+        totals = dict.fromkeys(names, 0)
+        totals.update(self.store.counters(self.prefix))
+        return totals
+
+
+_cache_store = None
+_cache_store_lock = threading.Lock()
+
+
+def configure_cache_store(path='cache/scrape_cache.db'):
+    """Replace the shared cache store with one using the given file."""
+    global _cache_store
+    with _cache_store_lock:
+        _cache_store = CacheStore(path)
+        return _cache_store
+
+
+def get_cache_store():
+    """Return the shared cache store, creating it at the default path on first use."""
+    global _cache_store
+    with _cache_store_lock:
+        if _cache_store is None:
+            _cache_store = CacheStore('cache/scrape_cache.db')
+        return _cache_store
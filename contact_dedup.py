@@ -0,0 +1,365 @@
+import hashlib
+import logging
+import math
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from job_queue import MAX_CONTACT_LENGTH
+from models import db, SeenContact, ContactFilter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Result fields checked for repeats, with the contact kind they hold
+CONTACT_FIELDS = (('email', 'emails'), ('phone', 'phones'))
+
+# Values per IN (...) list when confirming filter hits in the database
+LOOKUP_CHUNK_SIZE = 500
+
+# Tries to merge a job's filter into the saved one while other jobs keep changing it
+SAVE_ATTEMPTS = 5
+
+# All database access below uses db.session, so call it inside an app context.
+
+
+def normalize_contact(kind, value):
+    """
+    Return the form of an email or phone number used to recognise repeats.
+
+    Emails are lower-cased; phone numbers keep only their digits, so
+    '(212) 555-7890' and '212.555.7890' are the same number.
+
+    Returns:
+        str: The normalized value, or None if nothing usable is left
+    """
+    if not isinstance(value, str):
+        return None
+    if kind == 'email':
+        normalized = value.strip().lower()
+    else:
+        normalized = ''.join(char for char in value if char.isdigit())
+    if not normalized or len(normalized) > MAX_CONTACT_LENGTH:
+        return None
+    return normalized
+
+
+class BloomFilter:
+    """
+    Set of strings in a fixed number of bits.
+
+    Membership tests can return false positives, at roughly the error rate the
+    filter was sized for, but never false negatives.
+    """
+
+    def __init__(self, size, hashes, bits=None, items=0):
+        """
+        Initialize the filter.
+
+        Args:
+            size (int): Number of bits, a multiple of 8
+            hashes (int): Bit positions set per item
+            bits (bytes): Saved filter contents, empty if None
+            items (int): Items already added to the saved contents
+        """
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray(size // 8)
+        self.items = items
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=0.01):
+        """Return an empty filter that holds capacity items at about error_rate false positives."""
+        capacity = max(int(capacity), 1)
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        size = max(64, (size + 7) // 8 * 8)
+        hashes = max(1, int(size / capacity * math.log(2)))
+        return cls(size, hashes)
+
+    @classmethod
+    def from_bytes(cls, bits, hashes, items=0):
+        """Return a filter saved with to_bytes()."""
+        return cls(len(bits) * 8, hashes, bits, items)
+
+    def to_bytes(self):
+        return bytes(self.bits)
+
+    def capacity(self):
+        """Items the filter was sized for; past that the false positive rate climbs quickly."""
+        return int(self.size * math.log(2) / self.hashes)
+
+    def _positions(self, item):
+        # Double hashing: two 64-bit halves of one digest give every position
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        step = int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def same_shape(self, other):
+        return self.size == other.size and self.hashes == other.hashes
+
+    def merge(self, other):
+        """Add everything in another filter of the same shape to this one."""
+        merged = int.from_bytes(self.bits, 'little') | int.from_bytes(other.bits, 'little')
+        self.bits = bytearray(merged.to_bytes(len(self.bits), 'little'))
+
+
+def filter_key(key):
+    """Return the Bloom filter item for a (kind, normalized value) pair."""
+    return f"{key[0]}:{key[1]}"
+
+
+class ContactDedup:
+    """
+    Tells which of a job's emails and phones its user already got from earlier jobs.
+
+    seen_contacts holds the job and time each normalized contact was first
+    found for the user, one row per contact with a unique index. The user's
+    Bloom filter over those rows is kept in contact_filters: a contact the
+    filter doesn't contain is new without asking the database, and only
+    filter hits are confirmed with an exact query. Contacts first found by
+    this job are written before their result is returned; if another job of
+    the same user stored one first, the result reports that job instead.
+
+    The filter is loaded when the job starts and merged back into the saved
+    one when it ends, with a compare-and-swap so concurrent jobs of the same
+    user don't drop each other's additions.
+    """
+
+    def __init__(self, user_id, job_id, capacity=100000, error_rate=0.01):
+        """
+        Initialize the index for one job.
+
+        Args:
+            user_id (int): Owner of the job
+            job_id (str): Job whose results are checked
+            capacity (int): Contacts a new filter is sized for; a full filter
+                is rebuilt from the database at twice its contents
+            error_rate (float): Target false positive rate of the filter
+        """
+        self.user_id = user_id
+        self.job_id = job_id
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = None
+        self._loaded_items = 0
+        self._known = {}  # (kind, value) -> (first job ID, first seen at), for contacts already looked up
+        self.queries = 0
+        self.skipped = 0
+        self.false_positives = 0
+
+    def load(self):
+        """Load the user's saved filter, building it from seen_contacts if it is missing or full."""
+        row = db.session.get(ContactFilter, self.user_id)
+        bloom = BloomFilter.from_bytes(row.bits, row.hashes, row.items or 0) if row else None
+        if bloom is None or bloom.items > bloom.capacity():
+            bloom = self._rebuild()
+        self.bloom = bloom
+        self._loaded_items = bloom.items
+        return self
+
+    def _rebuild(self):
+        """Build a filter from seen_contacts, sized for twice the user's contacts."""
+        query = db.session.query(SeenContact.kind, SeenContact.value).filter(SeenContact.user_id == self.user_id)
+        count = query.count()
+        bloom = BloomFilter.for_capacity(max(self.capacity, count * 2), self.error_rate)
+        for key in query.yield_per(1000):
+            bloom.add(filter_key(key))
+        if count:
+            logger.info(f"Rebuilt contact filter for user {self.user_id} from {count} contacts")
+        return bloom
+
+    def _first_sightings(self, keys):
+        """Return the stored first sightings of (kind, value) pairs."""
+        wanted = set(keys)
+        values = sorted({value for _, value in wanted})
+        found = {}
+        for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+            self.queries += 1
+            rows = (
+                db.session.query(SeenContact.kind, SeenContact.value, SeenContact.first_job_id,
+                                 SeenContact.first_seen_at)
+                .filter(SeenContact.user_id == self.user_id,
+                        SeenContact.value.in_(values[start:start + LOOKUP_CHUNK_SIZE]))
+                .all()
+            )
+            for kind, value, job_id, seen_at in rows:
+                if (kind, value) in wanted:
+                    found[(kind, value)] = (job_id, seen_at)
+        return found
+
+    def lookup(self, keys):
+        """
+        Return where contacts were first found, recording the ones that are new.
+
+        Args:
+            keys (iterable): (kind, normalized value) pairs
+
+        Returns:
+            dict: (kind, value) -> (first job ID, first seen datetime); new
+                  contacts get this job and the current time
+        """
+        found = {}
+        candidates = []
+        for key in set(keys):
+            if key in self._known:
+                found[key] = self._known[key]
+            elif filter_key(key) in self.bloom:
+                candidates.append(key)
+            else:
+                self.skipped += 1
+
+        if candidates:
+            confirmed = self._first_sightings(candidates)
+            self.false_positives += len(candidates) - len(confirmed)
+            found.update(confirmed)
+
+        new = set(keys) - set(found)
+        if new:
+            now = datetime.utcnow()
+            for key in new:
+                found[key] = (self.job_id, now)
+                self.bloom.add(filter_key(key))
+            found.update(self._claim(new, now))
+        self._known.update(found)
+        return found
+
+    def annotate(self, result, only_new=False):
+        """
+        Add 'first_seen' to a result: each email and phone -> {'job_id', 'seen_at'}.
+
+        Args:
+            result (dict): Result for one URL, changed in place
+            only_new (bool): Also drop emails and phones first found by earlier jobs
+
+        Returns:
+            dict: The result
+        """
+        contacts = {}
+        for kind, field in CONTACT_FIELDS:
+            values = result.get(field)
+            if not isinstance(values, list):
+                continue
+            for value in values:
+                normalized = normalize_contact(kind, value)
+                if normalized:
+                    contacts[value] = (kind, normalized)
+
+        sightings = self.lookup(contacts.values()) if contacts else {}
+        result['first_seen'] = {
+            value: {'job_id': sightings[key][0], 'seen_at': sightings[key][1].isoformat()}
+            for value, key in contacts.items()
+        }
+
+        if only_new:
+            for kind, field in CONTACT_FIELDS:
+                if isinstance(result.get(field), list):
+                    result[field] = [value for value in result[field]
+                                     if value not in contacts or sightings[contacts[value]][0] == self.job_id]
+        return result
+
+    def _claim(self, keys, seen_at):
+        """
+        Store contacts as first found by this job.
+
+        Args:
+            keys (set): (kind, normalized value) pairs the database doesn't have yet
+            seen_at (datetime): When this job found them
+
+        Returns:
+            dict: (kind, value) -> (first job ID, first seen datetime) for the
+                  contacts another job of the user stored in the meantime
+        """
+        rows = [
+            {
+                'user_id': self.user_id,
+                'kind': kind,
+                'value': value,
+                'first_job_id': self.job_id,
+                'first_seen_at': seen_at
+            }
+            for kind, value in keys
+        ]
+        try:
+            db.session.bulk_insert_mappings(SeenContact, rows)
+            db.session.commit()
+            return {}
+        except IntegrityError:
+            db.session.rollback()
+
+        taken = []
+        for row in rows:
+            try:
+                db.session.bulk_insert_mappings(SeenContact, [row])
+                db.session.commit()
+            except IntegrityError:
+                # Another job of the same user stored it first, so it isn't new to this one
+                db.session.rollback()
+                taken.append((row['kind'], row['value']))
+        return self._first_sightings(taken)
+
+    def save(self):
+        """
+        Merge this job's filter into the user's saved one.
+
+        The saved filter is only replaced if it is still the one that was read,
+        since SQLite has no row locks; when another job saved in between, its
+        filter is read and merged again.
+        """
+        added = self.bloom.items - self._loaded_items
+        for _ in range(SAVE_ATTEMPTS):
+            saved = (
+                db.session.query(ContactFilter.bits, ContactFilter.hashes, ContactFilter.items)
+                .filter(ContactFilter.user_id == self.user_id)
+                .first()
+            )
+            if saved is None:
+                bloom = self.bloom
+                db.session.add(ContactFilter(user_id=self.user_id, bits=bloom.to_bytes(), hashes=bloom.hashes,
+                                             items=bloom.items, updated_at=datetime.utcnow()))
+                try:
+                    db.session.commit()
+                except IntegrityError:
+                    # Another job saved the first filter for this user meanwhile
+                    db.session.rollback()
+                    continue
+            else:
+                saved_bloom = BloomFilter.from_bytes(saved.bits, saved.hashes, saved.items or 0)
+                if self.bloom.same_shape(saved_bloom):
+                    bloom = BloomFilter(self.bloom.size, self.bloom.hashes, self.bloom.bits, saved_bloom.items + added)
+                    bloom.merge(saved_bloom)
+                else:
+                    # Another job rebuilt the filter meanwhile; every contact is in seen_contacts by now
+                    bloom = self._rebuild()
+                updated = (
+                    ContactFilter.query
+                    .filter(ContactFilter.user_id == self.user_id,
+                            ContactFilter.bits == saved.bits,
+                            ContactFilter.hashes == saved.hashes,
+                            ContactFilter.items == saved.items)
+                    .update({'bits': bloom.to_bytes(), 'hashes': bloom.hashes, 'items': bloom.items,
+                             'updated_at': datetime.utcnow()}, synchronize_session=False)
+                )
+                db.session.commit()
+                if not updated:
+                    continue
+            self.bloom = bloom
+            self._loaded_items = bloom.items
+            return
+        logger.warning(f"Contact filter for user {self.user_id} kept changing; not saved after {SAVE_ATTEMPTS} tries")
+
+    def stats(self):
+        """Return how often the filter saved a database lookup."""
+        return {
+            'queries': self.queries,
+            'skipped_lookups': self.skipped,
+            'false_positives': self.false_positives
+        }
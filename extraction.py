@@ -0,0 +1,337 @@
+import re
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output can change, cached extraction results are keyed on it
+ENGINE_VERSION = '3'
+
+# Standard email pattern
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Emails with "at" and "dot" text encoding
+ENCODED_EMAIL_PATTERN = re.compile(
+    r'([a-zA-Z0-9._%+-]+)[\s]*(?:\[at\]|@|[\(\[\{]at[\)\]\}]|&#64;|%40)[\s]*([a-zA-Z0-9.-]+)[\s]*(?:\[dot\]|\.|\(dot\)|\[dot\]|&#46;|%2E)[\s]*([a-zA-Z]{2,})',
+    re.IGNORECASE
+)
+
+# JavaScript obfuscated emails (common pattern using concatenation)
+JS_EMAIL_PATTERN = re.compile(
+    r'document\.write\([\'"]([a-zA-Z0-9._%+-]+)[\'"][\s]*\+[\s]*[\'"]@[\'"][\s]*\+[\s]*[\'"]([a-zA-Z0-9.-]+)[\s]*[\'"][\s]*\+[\s]*[\'"]\.[\'"][\s]*\+[\s]*[\'"]([a-zA-Z]{2,})[\'"]'
+)
+
+# HTML entity encoded emails (like &#64; for @ and &#46; for .)
+ENTITY_EMAIL_PATTERN = re.compile(
+    r'([a-zA-Z0-9._%+-]+)(?:&#64;|&#0*64;|%40)([a-zA-Z0-9.-]+)(?:&#46;|&#0*46;|%2E)([a-zA-Z]{2,})'
+)
+
+# Separated email parts with CSS display tricks
+CSS_EMAIL_PATTERN = re.compile(
+    r'<span[^>]*data-user=["\']([^"\']+)["\'][^>]*>.*?</span>.*?<span[^>]*data-domain=["\']([^"\']+)["\'][^>]*>.*?</span>'
+)
+
+# Unicode obfuscation (where @ is replaced by \u0040 and . by \u002E)
+UNICODE_EMAIL_PATTERN = re.compile(
+    r'([a-zA-Z0-9._%+-]+)(?:\\u0*40|\\x40)([a-zA-Z0-9.-]+)(?:\\u0*2e|\\x2e)([a-zA-Z]{2,})'
+)
+
+# Cheap prefilter for the email patterns. Every email pattern needs one of
+# these tokens, so the full patterns only run on the text around the hits:
+# 'at' covers the plain, encoded, entity and unicode forms, 'js' the
+# document.write concatenation and 'css' the data-user/data-domain spans.
+# The leading lookahead lets the regex engine skip ahead on the first
+# character instead of trying every branch at every position.
+EMAIL_ANCHOR_PATTERN = re.compile(
+    r'(?=[@(\[{&%\\d])(?:'
+    r'(?P<js>document\.write\()'
+    r'|(?P<css>data-user=)'
+    r'|(?P<at>@|[\(\[\{][aA][tT][\)\]\}]|&#0*64;|%40|\\u0*40|\\x40))'
+)
+
+# Text kept on each side of an anchor, and after a data-user anchor where the
+# matching data-domain span can be further away
+WINDOW_RADIUS = 320
+CSS_WINDOW_AFTER = 2048
+
+# Characters an address can be made of; windows never end inside a run of them
+ADDRESS_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-')
+
+# Placeholder domains that are never real contacts
+INVALID_EMAIL_MARKERS = ('@example.', '@domain.', '@email.')
+
+# International format: +1-123-456-7890, +1 (123) 456-7890, etc.
+INTERNATIONAL_PHONE_PATTERN = re.compile(r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+# US format without country code: (123) 456-7890, 123-456-7890, 123.456.7890, etc.
+US_PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+NON_DIGIT_PATTERN = re.compile(r'\D')
+
+SOCIAL_PATTERNS = {
+    'linkedin': re.compile(r'(?:https?:\/\/)?(?:www\.)?linkedin\.com\/(?:in|company)\/[a-zA-Z0-9_-]+\/?'),
+    'twitter': re.compile(r'(?:https?:\/\/)?(?:www\.)?(?:twitter\.com|x\.com)\/[a-zA-Z0-9_-]+\/?'),
+    'facebook': re.compile(r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/(?:profile\.php\?id=\d+|[a-zA-Z0-9._-]+)\/?'),
+    'instagram': re.compile(r'(?:https?:\/\/)?(?:www\.)?instagram\.com\/[a-zA-Z0-9._-]+\/?'),
+    'youtube': re.compile(r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/(?:channel|user)\/[a-zA-Z0-9_-]+\/?'),
+    'github': re.compile(r'(?:https?:\/\/)?(?:www\.)?github\.com\/[a-zA-Z0-9_-]+\/?'),
+}
+
+# Cloudflare email protection links
+CLOUDFLARE_HREF_PATTERN = re.compile(r'<a[^>]*href="/cdn-cgi/l/email-protection#([a-zA-Z0-9]+)"[^>]*>.*?</a>', re.IGNORECASE)
+CLOUDFLARE_DATA_PATTERN = re.compile(r'<a[^>]*data-cfemail="([a-zA-Z0-9]+)"[^>]*>.*?</a>', re.IGNORECASE)
+
+
+def _merge_windows(text, spans):
+    """
+    Turn anchor spans into non-overlapping text windows.
+
+    Window edges are pushed outwards past address characters (up to
+    WINDOW_RADIUS more) so an address is never cut in half.
+    """
+    windows = []
+    text_length = len(text)
+    for start, end in spans:
+        start = max(0, start)
+        end = min(text_length, end)
+
+        limit = max(0, start - WINDOW_RADIUS)
+        while start > limit and text[start - 1] in ADDRESS_CHARS:
+            start -= 1
+        limit = min(text_length, end + WINDOW_RADIUS)
+        while end < limit and text[end] in ADDRESS_CHARS:
+            end += 1
+
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+
+    return [text[start:end] for start, end in windows]
+
+
+def _email_windows(text):
+    """
+    Find every email anchor in one pass over the text.
+
+    Returns:
+        dict: Anchor group ('at', 'js', 'css') -> list of text windows
+    """
+    spans = {'at': [], 'js': [], 'css': []}
+    for match in EMAIL_ANCHOR_PATTERN.finditer(text):
+        group = match.lastgroup
+        after = CSS_WINDOW_AFTER if group == 'css' else WINDOW_RADIUS
+        spans[group].append((match.start() - WINDOW_RADIUS, match.end() + after))
+
+    return {group: _merge_windows(text, group_spans) for group, group_spans in spans.items()}
+
+
+def extract_emails(text):
+    """
+    Extract email addresses from text, including common obfuscations.
+
+    The text is scanned once for anchor tokens ('@', '[at]', '&#64;',
+    'document.write(', 'data-user=', ...) and the email patterns only run on
+    the windows around those hits, so large pages with few addresses cost
+    one scan instead of seven.
+
+    Args:
+        text (str): Text to extract emails from
+
+    Returns:
+        list: List of unique, lowercased email addresses
+    """
+    filtered_emails = set()
+    windows = _email_windows(text)
+
+    for window in windows['at']:
+        for email in EMAIL_PATTERN.findall(window):
+            lowered = email.lower()
+
+            # Skip placeholder addresses and likely false positives
+            if any(invalid in lowered for invalid in INVALID_EMAIL_MARKERS):
+                continue
+            if '..' in email or '@.' in email or '.@' in email:
+                continue
+
+            filtered_emails.add(lowered)
+
+        for match in ENCODED_EMAIL_PATTERN.finditer(window):
+            if match.group(1) and match.group(2) and match.group(3):
+                email = f"{match.group(1).strip()}@{match.group(2).strip()}.{match.group(3).strip()}"
+                filtered_emails.add(email.lower())
+
+        for pattern in (ENTITY_EMAIL_PATTERN, UNICODE_EMAIL_PATTERN):
+            for match in pattern.finditer(window):
+                if match.group(1) and match.group(2) and match.group(3):
+                    email = f"{match.group(1)}@{match.group(2)}.{match.group(3)}"
+                    filtered_emails.add(email.lower())
+
+    for window in windows['js']:
+        for match in JS_EMAIL_PATTERN.finditer(window):
+            if match.group(1) and match.group(2) and match.group(3):
+                email = f"{match.group(1)}@{match.group(2)}.{match.group(3)}"
+                filtered_emails.add(email.lower())
+
+    for window in windows['css']:
+        for match in CSS_EMAIL_PATTERN.finditer(window):
+            if match.group(1) and match.group(2):
+                email = f"{match.group(1)}@{match.group(2)}"
+                filtered_emails.add(email.lower())
+
+    return list(filtered_emails)
+
+
+def extract_phones(text):
+    """
+    Extract phone numbers from text.
+
+    Args:
+        text (str): Text to extract phone numbers from
+
+    Returns:
+        list: List of unique phone numbers with 10 to 15 digits
+    """
+    phones = INTERNATIONAL_PHONE_PATTERN.findall(text)
+    phones.extend(US_PHONE_PATTERN.findall(text))
+
+    normalized_phones = set()
+    for phone in phones:
+        digits_only = NON_DIGIT_PATTERN.sub('', phone)
+
+        # Skip if too short or too long
+        if len(digits_only) < 10 or len(digits_only) > 15:
+            continue
+
+        normalized_phones.add(phone)
+
+    return list(normalized_phones)
+
+
+def extract_social_media(text):
+    """
+    Extract social media profile links from text or HTML.
+
+    Args:
+        text (str): Text to extract social media links from
+
+    Returns:
+        dict: First profile URL found per platform
+    """
+    social_profiles = {}
+    for platform, pattern in SOCIAL_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            # Add https:// if not present
+            url = match.group(0)
+            if not url.startswith('http'):
+                url = 'https://' + url.lstrip('/')
+            social_profiles[platform] = url
+
+    return social_profiles
+
+
+def decode_cloudflare_email(encoded_email):
+    """
+    Decode a Cloudflare protected email.
+
+    Cloudflare encodes emails as hex where the first byte is an XOR key for
+    the remaining bytes.
+
+    Args:
+        encoded_email (str): The hex encoded email string
+
+    Returns:
+        str: Decoded email address or None if decoding fails
+    """
+    try:
+        hex_encoded = bytes.fromhex(encoded_email)
+        key = hex_encoded[0]
+        return ''.join(chr(byte ^ key) for byte in hex_encoded[1:])
+    except Exception as e:
+        logger.warning(f"Failed to decode Cloudflare email: {str(e)}")
+        return None
+
+
+def find_cloudflare_emails(html):
+    """
+    Find Cloudflare protected emails in HTML content.
+
+    Args:
+        html (str): HTML content
+
+    Returns:
+        list: List of decoded email addresses
+    """
+    emails = set()
+    for pattern in (CLOUDFLARE_HREF_PATTERN, CLOUDFLARE_DATA_PATTERN):
+        for match in pattern.finditer(html):
+            decoded = decode_cloudflare_email(match.group(1))
+            if decoded and '@' in decoded:
+                emails.add(decoded.lower())
+
+    return list(emails)
+
+
+def find_image_emails(page):
+    """
+    Find email addresses in image alt and element title attributes.
+
+    Args:
+        page (ParsedPage): Parsed page from page_parser.parse_page
+
+    Returns:
+        list: List of email addresses
+    """
+    emails = set()
+    for attribute_text in page.attribute_texts:
+        for email in EMAIL_PATTERN.findall(attribute_text):
+            emails.add(email.lower())
+
+    return list(emails)
+
+
+def find_mailto_links(page):
+    """
+    Extract email addresses from mailto links.
+
+    Args:
+        page (ParsedPage): Parsed page from page_parser.parse_page
+
+    Returns:
+        list: List of email addresses
+    """
+    emails = set()
+    for href, _ in page.links:
+        if href.startswith('mailto:'):
+            # Drop the scheme and any query parameters
+            email = href[len('mailto:'):].split('?')[0].strip()
+            if '@' in email and '.' in email:
+                emails.add(email.lower())
+
+    return list(emails)
+
+
+def extract(html, text):
+    """
+    Extract every contact type from a page.
+
+    Args:
+        html (str): Raw page HTML, used for Cloudflare emails and social links
+        text (str): Page text, used for emails and phone numbers
+
+    Returns:
+        dict: 'emails', 'phones' and 'social_media' for the page
+    """
+    emails = set(extract_emails(text))
+
+    cloudflare_emails = find_cloudflare_emails(html)
+    if cloudflare_emails:
+        logger.info(f"Found {len(cloudflare_emails)} Cloudflare protected emails")
+        emails.update(cloudflare_emails)
+
+    return {
+        'emails': list(emails),
+        'phones': extract_phones(text),
+        'social_media': extract_social_media(html)
+    }
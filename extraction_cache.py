@@ -0,0 +1,203 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+
+import extraction
+import fetch_strategy
+import parse_pool
+from cache_store import CounterBuffer, get_cache_store
+from page_parser import get_backend
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Cache store namespace for extraction results
+NAMESPACE = 'extraction'
+
+# Prefix of this cache's counters in the cache store
+COUNTER_PREFIX = 'extraction.'
+
+COUNTERS = ('hits', 'misses', 'evictions')
+
+# Seconds entries of other cache versions are kept after their last write, so
+# old and new workers can share the cache during a rolling deploy
+OTHER_VERSION_GRACE = 86400
+
+
+def cache_version():
+    """
+    Return the version of the code whose output is cached.
+
+    Besides the extraction patterns (extraction.ENGINE_VERSION), a cached
+    homepage result holds the contact links and decoding of parse_pool and
+    the escalation decision and browser contact links of fetch_strategy, so
+    bumping any of their versions starts the cache over.
+    """
+    return f"{extraction.ENGINE_VERSION}.{parse_pool.PARSE_VERSION}.{fetch_strategy.STRATEGY_VERSION}"
+
+
+def content_key(kind, body, url='', charset=None):
+    """
+    Return the cache key for a page's extraction result.
+
+    Args:
+        kind (str): What was extracted, e.g. 'homepage' or 'contact'
+        body (bytes or str): Page content exactly as fetched or rendered
+        url (str): Page URL, for results that depend on it (relative links)
+        charset (str): Charset the body is decoded with, None to sniff it
+
+    Returns:
+        str: cache_version(), then a SHA-256 of the kind, URL, charset,
+             active parser backend and content
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8', errors='surrogatepass')
+    digest = hashlib.sha256()
+    digest.update(f"{kind}\0{url}\0{charset or ''}\0{get_backend()}\0".encode('utf-8'))
+    digest.update(body)
+    return f"{cache_version()}:{digest.hexdigest()}"
+
+
+class ExtractionCache:
+    """
+    Extraction results keyed by a hash of the page content.
+
+    A refetched page is often byte-identical to the last copy; its emails,
+    phones and social links are then read from the cache instead of parsing
+    the HTML and running every extraction pattern again.
+
+    Keys start with cache_version(), so bumping it invalidates every
+    earlier result. Entries from other versions are deleted when the cache
+    is created, once no process has written them for OTHER_VERSION_GRACE
+    seconds. Keys also cover the charset and the HTML parser backend,
+    since both change the text the patterns run on, and for homepages the
+    URL, because their contact links are resolved against it.
+    """
+
+    def __init__(self, enabled=True, ttl=30 * 86400, max_bytes=64 * 1024 * 1024, store=None):
+        """
+        Initialize the cache.
+
+        Args:
+            enabled (bool): False extracts every page
+            ttl (int): Seconds an entry is kept
+            max_bytes (int): Total size of cached results before eviction
+            store (CacheStore): Persistent store, defaults to the shared one
+        """
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.store = store or get_cache_store()
+        self.counters = CounterBuffer(self.store, COUNTER_PREFIX)
+        self._lock = threading.Lock()
+        self._bytes_since_evict = 0
+
+        if enabled:
+            removed = self.store.purge_expired(NAMESPACE)
+            removed += self.store.delete_without_prefix(NAMESPACE, f"{cache_version()}:",
+                                                        unused_for=OTHER_VERSION_GRACE)
+            if removed:
+                logger.info(f"Dropped {removed} expired extraction results or ones from other engine versions")
+
+    def get(self, key):
+        """
+        Return a cached extraction result.
+
+        Returns:
+            The result as stored (JSON types), or None on a miss
+        """
+        if not self.enabled:
+            return None
+        try:
+            row = self.store.get(NAMESPACE, key)
+        except Exception as e:
+            logger.warning(f"Extraction cache read failed: {str(e)}")
+            return None
+        if row is None or row[1] <= time.time():
+            self.counters.add('misses')
+            return None
+        self.counters.add('hits')
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """Cache an extraction result; value must be JSON-serializable."""
+        if not self.enabled:
+            return
+        data = json.dumps(value)
+        try:
+            self.store.set(NAMESPACE, key, data, self.ttl)
+        except Exception as e:
+            logger.warning(f"Extraction cache write failed: {str(e)}")
+            return
+
+        # Checking the total size is a table scan, so do it once per tenth of the budget written
+        with self._lock:
+            self._bytes_since_evict += len(data)
+            due = self._bytes_since_evict >= self.max_bytes // 10
+            if due:
+                self._bytes_since_evict = 0
+        if due:
+            evicted = self.store.evict(NAMESPACE, self.max_bytes)
+            if evicted:
+                self.counters.add('evictions', evicted)
+
+    def cached(self, kind, body, extract, url='', charset=None):
+        """
+        Return the extraction result for a page, running extract() on a miss.
+
+        Args:
+            kind (str): What is extracted, part of the key
+            body (bytes or str): Page content
+            extract (function): Called with no arguments to compute the result
+            url (str): Page URL, for results that depend on it
+            charset (str): Charset extract() decodes the body with
+
+        Returns:
+            The cached or freshly computed result
+        """
+        if not self.enabled:
+            return extract()
+        key = content_key(kind, body, url, charset)
+        value = self.get(key)
+        if value is None:
+            value = extract()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        """Return hit/miss counts across all processes and the cache size."""
+        counts = self.counters.totals(COUNTERS)
+        lookups = counts['hits'] + counts['misses']
+        stats = {
+            'enabled': self.enabled,
+            'engine_version': cache_version(),
+            'hit_rate': round(counts['hits'] / lookups, 3) if lookups else 0
+        }
+        stats.update(counts)
+        stats.update(self.store.stats(NAMESPACE))
+        return stats
+
+
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+
+def configure_extraction_cache(enabled=True, max_bytes=64 * 1024 * 1024, store=None):
+    """Replace the shared extraction cache with one using the given settings."""
+    global _extraction_cache
+    with _extraction_cache_lock:
+        if _extraction_cache is not None:
+            _extraction_cache.counters.flush()
+        _extraction_cache = ExtractionCache(enabled=enabled, max_bytes=max_bytes, store=store)
+        return _extraction_cache
+
+
+def get_extraction_cache():
+    """Return the shared extraction cache, creating it with default settings on first use."""
+    global _extraction_cache
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = ExtractionCache()
+        return _extraction_cache
@@ -0,0 +1,294 @@
+import asyncio
+import logging
+
+from extraction_cache import content_key
+from host_scheduler import HostQueue, url_host
+from http_pool import DEFAULT_HEADERS
+from robots_cache import RobotsDisallowed
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetchEngine:
+    """
+    Concurrent fetch engine for the requests-based scraper.
+
+    Each URL goes through the same steps as simple_scrape_url (homepage fetch,
+    parse, one contact page follow-up), but up to max_concurrency URLs are in
+    flight at once instead of one after another.
+
+    Fetching and parsing are separate stages. Raw response bodies are handed
+    to parse_executor (normally the worker processes of a ParsePool), and at
+    most max_pending_parses pages wait for or sit in that stage at a time;
+    fetchers pause when parsing falls behind instead of piling up HTML.
+
+    With a HostScheduler, URLs are taken round-robin across hosts and each
+    request waits for its host's politeness delay, so a batch dominated by one
+    site still keeps the other hosts busy. With a RobotsCache, pages the
+    site's robots.txt disallows are not fetched.
+    """
+
+    def __init__(self, max_concurrency=20, timeout=30, contact_timeout=15, headers=None, max_per_host=10,
+                 parse_executor=None, max_pending_parses=None, scheduler=None, robots=None, cache=None,
+                 extraction_cache=None):
+        """
+        Initialize the fetch engine.
+
+        Args:
+            max_concurrency (int): Maximum number of URLs processed at once
+            timeout (int): Homepage request timeout in seconds
+            contact_timeout (int): Contact page request timeout in seconds
+            headers (dict): Request headers, defaults to a desktop Chrome user agent
+            max_per_host (int): Maximum open connections to a single host
+            parse_executor: concurrent.futures executor for the parse stage,
+                None uses the event loop's default thread pool
+            max_pending_parses (int): Pages allowed in the parse stage at once,
+                defaults to max_concurrency
+            scheduler (HostScheduler): Per-host concurrency and delay limits,
+                None fetches in input order without pacing
+            robots (RobotsCache): robots.txt rules to obey, None fetches every page
+            cache (ResponseCache): Serves and revalidates pages fetched by earlier
+                jobs, None always downloads
+            extraction_cache (ExtractionCache): Reuses extraction results for
+                byte-identical pages, None parses every page
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        self.contact_timeout = contact_timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self.max_per_host = max_per_host
+        self.parse_executor = parse_executor
+        self.max_pending_parses = max(1, int(max_pending_parses or self.max_concurrency))
+        self.scheduler = scheduler
+        self.robots = robots
+        self.cache = cache
+        self.extraction_cache = extraction_cache
+
+    @staticmethod
+    def available():
+        """Return True if the async HTTP client is installed."""
+        return aiohttp is not None
+
+    def run(self, urls, parse_homepage, parse_contact_page, merge_contact_page, error_result, on_result=None):
+        """
+        Scrape a batch of URLs and return the results in input order.
+
+        With on_result, each result is handed over as its URL finishes and
+        none are kept, so memory doesn't grow with the number of URLs.
+
+        The parse functions run in parse_executor, so with a process pool they
+        must be picklable top-level functions.
+
+        Args:
+            urls (list): URLs to scrape
+            parse_homepage (function): (url, body, encoding) -> (result, contact_urls)
+            parse_contact_page (function): (body, encoding) -> found contacts
+            merge_contact_page (function): (result, found) -> None, updates result in place
+            error_result (function): (url, error) -> result dict for a failed URL
+            on_result (function): Called as on_result(index, result) when a URL finishes
+
+        Returns:
+            list: One result dict per input URL, or None if on_result is given
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is not installed")
+
+        stages = (parse_homepage, parse_contact_page, merge_contact_page, error_result)
+        return asyncio.run(self._run(urls, stages, on_result))
+
+    async def _run(self, urls, stages, on_result):
+        results = None if on_result else [None] * len(urls)
+        # Bounded hand-off between the fetch and parse stages
+        parse_slots = asyncio.Semaphore(self.max_pending_parses)
+        if self.scheduler is not None:
+            pending = HostQueue(self.scheduler, enumerate(urls))
+        else:
+            pending = asyncio.Queue()
+            for index, url in enumerate(urls):
+                pending.put_nowait((index, url))
+
+        # Keep-alive connections are reused between a site's homepage and contact page
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency * 2, limit_per_host=self.max_per_host)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            def finish(index, result):
+                if on_result:
+                    on_result(index, result)
+                else:
+                    results[index] = result
+
+            async def worker():
+                while True:
+                    try:
+                        index, url = pending.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    finish(index, await self._scrape_one(session, parse_slots, url, None, *stages))
+
+            async def scheduled_worker():
+                while True:
+                    index, url, host, wait = pending.take()
+                    if wait is None:
+                        return
+                    if wait:
+                        # Every remaining host is busy or in its delay
+                        await asyncio.sleep(wait)
+                        continue
+                    try:
+                        result = await self._scrape_one(session, parse_slots, url, host, *stages)
+                    finally:
+                        self.scheduler.release(host)
+                    finish(index, result)
+
+            target = worker if self.scheduler is None else scheduled_worker
+            workers = [asyncio.create_task(target())
+                       for _ in range(min(self.max_concurrency, len(urls)))]
+            await asyncio.gather(*workers)
+
+        return results
+
+    async def _fetch(self, session, url, timeout, raise_for_status=True, paced_host=None):
+        """
+        Fetch a URL and return (ok, body bytes, charset from the headers).
+
+        With a response cache, a fresh cached copy is returned without a
+        request and a stale one is revalidated. paced_host waits for that
+        host's politeness delay, but only if the network is actually used.
+        """
+        loop = asyncio.get_running_loop()
+        page = None
+        if self.cache is not None:
+            # Cache reads and writes are disk I/O, keep them off the event loop
+            page = await loop.run_in_executor(None, self.cache.lookup, url)
+            if page is not None and page.fresh:
+                return True, page.body, page.charset
+
+        await self._wait_turn(paced_host)
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        headers = page.validators() if page is not None else None
+        async with session.get(url, timeout=client_timeout, headers=headers) as response:
+            if raise_for_status:
+                response.raise_for_status()
+            # Decoding happens in the parse stage, off the event loop
+            body = await response.read()
+            if self.cache is None:
+                return response.status < 400, body, response.charset
+            status, body, charset = await loop.run_in_executor(
+                None, self.cache.update, url, page, response.status, body, response.headers
+            )
+            return status < 400, body, charset
+
+    async def _read_robots(self, session, url, host):
+        """
+        Return a URL's robots.txt rules, reading robots.txt if it isn't cached.
+
+        With a scheduler, one coroutine reads a host's robots.txt while the
+        others on that host wait for it, so no URL skips the check.
+
+        Returns:
+            tuple: (RobotsRules, True if this call requested robots.txt)
+        """
+        while True:
+            rules = self.robots.cached(url)
+            if rules is not None:
+                return rules, False
+            if host is None or self.scheduler.claim_robots(host):
+                break
+            await self.scheduler.wait_robots_async(host)
+
+        rules = None
+        try:
+            rules = await self.robots.fetch_async(session, url)
+        finally:
+            if host is not None:
+                self.scheduler.set_crawl_delay(host, rules.crawl_delay if rules else None)
+        return rules, True
+
+    async def _check_robots(self, session, url, host):
+        """Read the site's robots.txt if it isn't cached, then refuse the URL if it is disallowed."""
+        rules, fetched = await self._read_robots(session, url, host)
+        if fetched:
+            # The robots.txt request used this slot's first turn
+            await self._wait_turn(host)
+        if not rules.allowed(url):
+            raise RobotsDisallowed(url)
+
+    async def _wait_turn(self, host):
+        """Wait for the host's politeness delay before another request."""
+        if host is not None:
+            await self.scheduler.wait_turn_async(host)
+
+    async def _parse(self, parse_slots, function, *args):
+        """Run a parse function in the parse stage once a slot is free."""
+        async with parse_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.parse_executor, function, *args)
+
+    async def _parse_cached(self, parse_slots, key, function, *args):
+        """Run a parse function, or reuse its result for content seen before under the same key."""
+        if self.extraction_cache is None:
+            return await self._parse(parse_slots, function, *args)
+
+        loop = asyncio.get_running_loop()
+        value = await loop.run_in_executor(None, self.extraction_cache.get, key)
+        if value is None:
+            value = await self._parse(parse_slots, function, *args)
+            await loop.run_in_executor(None, self.extraction_cache.put, key, value)
+        return value
+
+    async def _scrape_one(self, session, parse_slots, url, host, parse_homepage, parse_contact_page,
+                          merge_contact_page, error_result):
+        """Scrape one URL: homepage first, then the first reachable contact page."""
+        try:
+            logger.info(f"Using async scraper for URL: {url}")
+
+            # Normalize URL
+            if not url.startswith(('http://', 'https://')):
+                url = 'https://' + url
+
+            if self.robots is not None:
+                await self._check_robots(session, url, host)
+
+            _, body, charset = await self._fetch(session, url, self.timeout)
+
+            # Parsing is CPU work, keep it off the event loop so other fetches progress
+            result, contact_urls = await self._parse_cached(parse_slots, content_key('homepage', body, url, charset),
+                                                            parse_homepage, url, body, charset)
+
+            for contact_url in contact_urls:
+                if self.robots is not None:
+                    # A contact page on another host needs that host's robots.txt
+                    contact_host = url_host(contact_url) if self.scheduler is not None else None
+                    rules, _ = await self._read_robots(session, contact_url, contact_host)
+                    if not rules.allowed(contact_url):
+                        logger.info(f"Skipping contact page blocked by robots.txt: {contact_url}")
+                        continue
+                try:
+                    logger.info(f"Visiting contact page: {contact_url}")
+                    ok, contact_body, contact_charset = await self._fetch(session, contact_url, self.contact_timeout,
+                                                                          raise_for_status=False, paced_host=host)
+                    if ok:
+                        key = content_key('contact', contact_body, charset=contact_charset)
+                        found = await self._parse_cached(parse_slots, key,
+                                                         parse_contact_page, contact_body, contact_charset)
+                        merge_contact_page(result, found)
+                except Exception as e:
+                    logger.warning(f"Error visiting contact page {contact_url}: {str(e)}")
+                    continue
+
+                # Only check one contact page to avoid too many requests
+                break
+
+            logger.info(f"Async scraper found: {len(result['emails'])} emails, {len(result['phones'])} phones")
+            return result
+        except RobotsDisallowed as e:
+            logger.info(str(e))
+            return error_result(url, e)
+        except Exception as e:
+            logger.error(f"Async scraper error for {url}: {str(e) or type(e).__name__}")
+            return error_result(url, e)
@@ -0,0 +1,96 @@
+import re
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Fetch tiers recorded on every result
+STATIC_TIER = 'static'
+BROWSER_TIER = 'browser'
+
+# Bump when needs_browser() decides differently or BROWSER_CONTACT_KEYWORDS change;
+# cached extraction results key on it
+STRATEGY_VERSION = '1'
+
+# Link text or URL parts that mark a contact page on pages rendered in Chrome
+BROWSER_CONTACT_KEYWORDS = ['contact', 'kontakt', 'contacto', 'about', 'about us', 'get in touch', 'support']
+
+# Pages with less visible text than this are probably rendered client-side
+MIN_VISIBLE_TEXT = 200
+
+SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style|noscript|template)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+SPA_ROOT_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt|___gatsby|svelte)["\'][^>]*>\s*</div>'
+    r'|<(?:app-root|ng-app)\b'
+    r'|\bng-app=',
+    re.IGNORECASE
+)
+NOSCRIPT_PATTERN = re.compile(r'<noscript\b[^>]*>(.*?)</noscript\s*>', re.IGNORECASE | re.DOTALL)
+JS_NOTICE_PATTERN = re.compile(
+    r'(?:enable|requires?|need|turn on)\s+javascript|javascript\s+(?:is\s+)?(?:required|disabled)',
+    re.IGNORECASE
+)
+
+
+def needs_browser(html):
+    """
+    Decide whether a statically fetched page needs a real browser.
+
+    Args:
+        html (str): Page HTML from the static fetch
+
+    Returns:
+        str: Why the page looks JavaScript-rendered, or None if the static
+             HTML can be used as is
+    """
+    if not html:
+        return None
+
+    visible_text = TAG_PATTERN.sub(' ', SCRIPT_STYLE_PATTERN.sub(' ', html))
+    visible_length = len(''.join(visible_text.split()))
+
+    # Markers only count on thin pages, server-rendered apps carry them too
+    if visible_length < MIN_VISIBLE_TEXT * 5:
+        if SPA_ROOT_PATTERN.search(html):
+            return 'spa root element'
+
+        if any(JS_NOTICE_PATTERN.search(block) for block in NOSCRIPT_PATTERN.findall(html)):
+            return 'noscript javascript notice'
+
+    if visible_length < MIN_VISIBLE_TEXT:
+        return f'near-empty body text ({visible_length} chars)'
+
+    return None
+
+
+def escalate_to_browser(results, indices, scraper):
+    """
+    Re-scrape JavaScript-rendered pages with the Selenium ContactScraper.
+
+    Results are updated in place. Contacts found by the static fetch are kept
+    and merged with what the browser finds; if the browser fails the static
+    result is left untouched.
+
+    Args:
+        results (list): Result dicts from the static tier
+        indices (list): Positions in results that need the browser
+        scraper: ContactScraper instance
+    """
+    urls = list(dict.fromkeys(results[i]['url'] for i in indices))
+    logger.info(f"Escalating {len(urls)} JavaScript-rendered URLs to the browser tier")
+
+    browser_results = {result['url']: result for result in scraper.scrape_urls(urls)}
+
+    for i in indices:
+        result = results[i]
+        browser_result = browser_results.get(result['url'])
+        if not browser_result or browser_result.get('status') != 'success':
+            logger.warning(f"Browser tier failed for {result['url']}, keeping static result")
+            continue
+
+        result['emails'] = list(set(result.get('emails', [])) | set(browser_result.get('emails', [])))
+        result['phones'] = list(set(result.get('phones', [])) | set(browser_result.get('phones', [])))
+        result['social_media'] = {**result.get('social_media', {}), **browser_result.get('social_media', {})}
+        result['status'] = 'success (browser)'
+        result['fetch_tier'] = BROWSER_TIER
@@ -0,0 +1,398 @@
+import asyncio
+import logging
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before asking again while a host's robots.txt is being read
+ROBOTS_PENDING_WAIT = 0.1
+
+
+def url_host(url):
+    """Return the lower-cased host of a URL, adding https:// to bare domains."""
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return urllib.parse.urlparse(url).netloc.lower()
+
+
+class _HostState:
+    __slots__ = ('in_flight', 'next_start', 'last_start', 'crawl_delay', 'robots_pending')
+
+    def __init__(self):
+        self.in_flight = 0
+        self.next_start = 0.0
+        self.last_start = None
+        self.crawl_delay = None
+        self.robots_pending = False
+
+
+class HostScheduler:
+    """
+    Politeness limits per host, shared by every job in the process.
+
+    Each host gets at most max_per_host URLs in progress at once, and requests
+    to it start at least min_delay seconds apart, or the robots.txt
+    Crawl-delay if that is longer (capped at max_crawl_delay). Hosts are
+    independent, so throughput comes from working on many hosts at once
+    rather than hitting one host hard.
+
+    The scheduler never blocks on its own: reserve() and pace() either take
+    the slot or say how long to wait, so threads and event loops can both use
+    it.
+    """
+
+    def __init__(self, max_per_host=2, min_delay=1.0, respect_crawl_delay=True, max_crawl_delay=30.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_per_host (int): URLs of one host in progress at once
+            min_delay (float): Minimum seconds between requests to one host
+            respect_crawl_delay (bool): Read robots.txt and honor its Crawl-delay
+            max_crawl_delay (float): Longest Crawl-delay honored, in seconds
+        """
+        self.max_per_host = max(1, int(max_per_host))
+        self.min_delay = max(0.0, float(min_delay))
+        self.respect_crawl_delay = respect_crawl_delay
+        self.max_crawl_delay = max_crawl_delay
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+        return state
+
+    def _delay(self, state):
+        if state.crawl_delay is None:
+            return self.min_delay
+        return max(self.min_delay, min(state.crawl_delay, self.max_crawl_delay))
+
+    def _start_request(self, state, now):
+        state.last_start = now
+        state.next_start = now + self._delay(state)
+
+    def reserve(self, host):
+        """
+        Take a slot for a URL on host and start its first request.
+
+        Returns:
+            float: 0 if the slot was taken, otherwise seconds to wait before
+                   trying again
+        """
+        with self._lock:
+            state = self._state(host)
+            if state.robots_pending:
+                return ROBOTS_PENDING_WAIT
+            if state.in_flight >= self.max_per_host:
+                # A release wakes waiting threads; event loops retry after this
+                return max(state.next_start - time.monotonic(), ROBOTS_PENDING_WAIT)
+            now = time.monotonic()
+            if now < state.next_start:
+                return state.next_start - now
+            state.in_flight += 1
+            self._start_request(state, now)
+            return 0
+
+    def pace(self, host):
+        """
+        Start another request on a host whose slot is already held.
+
+        Returns:
+            float: 0 if the request may start now, otherwise seconds to wait
+        """
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            if now < state.next_start:
+                return state.next_start - now
+            self._start_request(state, now)
+            return 0
+
+    def release(self, host):
+        """Give back a slot taken with reserve()."""
+        with self._changed:
+            state = self._state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            self._changed.notify_all()
+
+    def claim_robots(self, host):
+        """
+        Return True if the caller should read the host's robots.txt.
+
+        Only one caller at a time gets True. It must then call
+        set_crawl_delay(); other URLs on the host wait until it does.
+        """
+        with self._lock:
+            state = self._state(host)
+            if state.robots_pending:
+                return False
+            state.robots_pending = True
+            return True
+
+    def set_crawl_delay(self, host, delay):
+        """
+        Record a host's robots.txt Crawl-delay.
+
+        Args:
+            host (str): Host name
+            delay (float): Crawl-delay in seconds, None if robots.txt has none
+                or could not be read
+        """
+        if not self.respect_crawl_delay:
+            delay = None
+        with self._changed:
+            state = self._state(host)
+            state.robots_pending = False
+            state.crawl_delay = delay
+            if delay is not None and state.last_start is not None:
+                state.next_start = max(state.next_start, state.last_start + self._delay(state))
+            self._changed.notify_all()
+        if delay is not None:
+            logger.info(f"Honoring Crawl-delay of {delay}s for {host}")
+
+    def robots_pending(self, host):
+        """Return True while a caller that claimed the host's robots.txt is reading it."""
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and state.robots_pending
+
+    def wait_robots(self, host):
+        """Block the thread until the host's robots.txt is no longer being read."""
+        with self._changed:
+            while host in self._hosts and self._hosts[host].robots_pending:
+                self._changed.wait(ROBOTS_PENDING_WAIT)
+
+    async def wait_robots_async(self, host):
+        """Wait in a coroutine until the host's robots.txt is no longer being read."""
+        while self.robots_pending(host):
+            await asyncio.sleep(ROBOTS_PENDING_WAIT)
+
+    def crawl_delay(self, host):
+        """Return the Crawl-delay recorded for a host, or None."""
+        with self._lock:
+            state = self._hosts.get(host)
+            return state.crawl_delay if state else None
+
+    def _wait(self, timeout):
+        with self._changed:
+            self._changed.wait(timeout)
+
+    @contextmanager
+    def slot(self, host):
+        """Hold a slot for host in a thread, waiting until one is free."""
+        while True:
+            wait = self.reserve(host)
+            if not wait:
+                break
+            self._wait(wait)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def wait_turn(self, host):
+        """Block the thread until another request to host may start."""
+        while True:
+            wait = self.pace(host)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    @asynccontextmanager
+    async def slot_async(self, host):
+        """Hold a slot for host in a coroutine, waiting until one is free."""
+        while True:
+            wait = self.reserve(host)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    async def wait_turn_async(self, host):
+        """Wait in a coroutine until another request to host may start."""
+        while True:
+            wait = self.pace(host)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def stats(self):
+        """Return the current limits and the busiest hosts."""
+        with self._lock:
+            busy = sorted(((state.in_flight, host) for host, state in self._hosts.items() if state.in_flight),
+                          reverse=True)
+            delayed = {host: state.crawl_delay for host, state in self._hosts.items() if state.crawl_delay}
+            return {
+                'max_per_host': self.max_per_host,
+                'min_delay': self.min_delay,
+                'hosts_seen': len(self._hosts),
+                'busy_hosts': {host: in_flight for in_flight, host in busy[:20]},
+                'crawl_delays': dict(sorted(delayed.items(), key=lambda item: -item[1])[:20])
+            }
+
+
+def read_robots(scheduler, robots, url):
+    """
+    Return the robots.txt rules for a URL, reading robots.txt if it isn't cached.
+
+    One thread at a time reads a host's robots.txt and applies its
+    Crawl-delay; the others wait for it and use the cached rules, so no URL
+    skips the check while the read is in progress.
+
+    Args:
+        scheduler (HostScheduler): Politeness limits, None just fetches
+        robots (RobotsCache): robots.txt rules cache
+        url (str): URL to check
+
+    Returns:
+        tuple: (RobotsRules, True if this call requested robots.txt)
+    """
+    host = url_host(url)
+    while True:
+        rules = robots.cached(url)
+        if rules is not None:
+            return rules, False
+        if scheduler is None or scheduler.claim_robots(host):
+            break
+        scheduler.wait_robots(host)
+
+    rules = None
+    try:
+        rules = robots.fetch(url)
+    finally:
+        if scheduler is not None:
+            scheduler.set_crawl_delay(host, rules.crawl_delay if rules else None)
+    return rules, True
+
+
+@contextmanager
+def polite_slot(scheduler, url, robots=None):
+    """
+    Hold a slot for a URL's host in a thread.
+
+    With a RobotsCache, the site's robots.txt is fetched first if it isn't
+    cached, and its Crawl-delay is applied to the host.
+
+    Yields:
+        str: The host; pass it to scheduler.wait_turn() before each further request
+    """
+    host = url_host(url)
+    with scheduler.slot(host):
+        if robots is not None and read_robots(scheduler, robots, url)[1]:
+            # The robots.txt request used this slot's first turn
+            scheduler.wait_turn(host)
+        yield host
+
+
+class HostQueue:
+    """
+    A job's URLs grouped by host and handed out round-robin.
+
+    take() skips hosts that are busy or still in their delay, so one slow or
+    crawl-delayed host never holds up the others.
+    """
+
+    def __init__(self, scheduler, items):
+        """
+        Initialize the queue.
+
+        Args:
+            scheduler (HostScheduler): Politeness limits to respect
+            items (iterable): (key, url) pairs; key is returned with the URL
+        """
+        self.scheduler = scheduler
+        self._hosts = OrderedDict()
+        self._lock = threading.Lock()
+        for key, url in items:
+            self._hosts.setdefault(url_host(url), deque()).append((key, url))
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(pending) for pending in self._hosts.values())
+
+    def take(self):
+        """
+        Take the next URL whose host has a free slot.
+
+        The slot is reserved on the scheduler; release it with
+        scheduler.release(host) when the URL is done.
+
+        Returns:
+            tuple: (key, url, host, 0) for a URL to scrape now,
+                   (None, None, None, wait) if every remaining host is busy,
+                   (None, None, None, None) when the queue is empty
+        """
+        with self._lock:
+            if not self._hosts:
+                return None, None, None, None
+
+            shortest_wait = None
+            for host in list(self._hosts):
+                wait = self.scheduler.reserve(host)
+                if wait:
+                    shortest_wait = wait if shortest_wait is None else min(shortest_wait, wait)
+                    continue
+
+                pending = self._hosts[host]
+                key, url = pending.popleft()
+                # Rotate the host to the back so the next take starts with another host
+                if pending:
+                    self._hosts.move_to_end(host)
+                else:
+                    del self._hosts[host]
+                return key, url, host, 0
+
+            return None, None, None, shortest_wait
+
+
+def interleave(urls):
+    """
+    Reorder URLs round-robin by host, keeping each host's own order.
+
+    Returns:
+        list: Indexes into urls in the new order
+    """
+    by_host = OrderedDict()
+    for index, url in enumerate(urls):
+        by_host.setdefault(url_host(url), deque()).append(index)
+
+    order = []
+    while by_host:
+        for host in list(by_host):
+            order.append(by_host[host].popleft())
+            if not by_host[host]:
+                del by_host[host]
+    return order
+
+
+_host_scheduler = None
+_host_scheduler_lock = threading.Lock()
+
+
+def configure_host_scheduler(max_per_host=2, min_delay=1.0, respect_crawl_delay=True, max_crawl_delay=30.0):
+    """Replace the shared host scheduler with one using the given limits."""
+    global _host_scheduler
+    with _host_scheduler_lock:
+        _host_scheduler = HostScheduler(max_per_host=max_per_host, min_delay=min_delay,
+                                        respect_crawl_delay=respect_crawl_delay, max_crawl_delay=max_crawl_delay)
+        return _host_scheduler
+
+
+def get_host_scheduler():
+    """Return the shared host scheduler, creating it with default limits on first use."""
+    global _host_scheduler
+    with _host_scheduler_lock:
+        if _host_scheduler is None:
+            _host_scheduler = HostScheduler()
+        return _host_scheduler
@@ -0,0 +1,118 @@
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+}
+
+
+class HttpPool:
+    """
+    Shared, thread-safe HTTP session for all requests-based fetches.
+
+    Connections are kept alive per host, so the homepage fetch, the contact
+    page fetch and any later request to the same site reuse one TCP + TLS
+    connection instead of doing a fresh handshake each time.
+    """
+
+    def __init__(self, max_hosts=100, max_per_host=10, headers=None):
+        """
+        Initialize the pool.
+
+        Args:
+            max_hosts (int): Number of per-host connection pools kept open
+            max_per_host (int): Maximum connections to a single host; extra
+                requests wait for a free connection instead of opening more
+            headers (dict): Default request headers
+        """
+        self.max_hosts = max_hosts
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._request_count = 0
+
+        self._adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=max_per_host,
+            pool_block=True,
+            max_retries=0
+        )
+        self._session = requests.Session()
+        self._session.headers.update(headers or DEFAULT_HEADERS)
+        self._session.mount('http://', self._adapter)
+        self._session.mount('https://', self._adapter)
+
+    def get(self, url, **kwargs):
+        """Send a GET request through the shared session."""
+        with self._lock:
+            self._request_count += 1
+        return self._session.get(url, **kwargs)
+
+    def stats(self):
+        """
+        Return connection pool statistics.
+
+        Returns:
+            dict: Request count, connections opened, reuse ratio, idle
+                  connections and a per-host breakdown
+        """
+        pools = self._adapter.poolmanager.pools
+        hosts = []
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            hosts.append({
+                'host': f"{key.key_scheme}://{key.key_host}:{key.key_port or ''}".rstrip(':'),
+                'requests': pool.num_requests,
+                'connections_opened': pool.num_connections,
+                'idle_connections': idle
+            })
+
+        total_requests = sum(host['requests'] for host in hosts)
+        total_connections = sum(host['connections_opened'] for host in hosts)
+        reuse_ratio = 1 - (total_connections / total_requests) if total_requests else 0
+
+        return {
+            'requests': self._request_count,
+            'connections_opened': total_connections,
+            'reuse_ratio': round(reuse_ratio, 3),
+            'open_hosts': len(hosts),
+            'idle_connections': sum(host['idle_connections'] for host in hosts),
+            'max_hosts': self.max_hosts,
+            'max_per_host': self.max_per_host,
+            'hosts': hosts
+        }
+
+    def close(self):
+        """Close every pooled connection."""
+        self._session.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(max_hosts=100, max_per_host=10, headers=None):
+    """Replace the shared pool with one using the given limits."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = HttpPool(max_hosts=max_hosts, max_per_host=max_per_host, headers=headers)
+        return _pool
+
+
+def get_pool():
+    """Return the shared pool, creating it with default limits on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpPool()
+        return _pool
@@ -0,0 +1,167 @@
+import json
+import logging
+import time
+
+from job_queue import get_queued_job, checkpoints_since
+from result_pages import project, DEFAULT_FIELDS
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Statuses after which a job sends no more events
+FINISHED_STATUSES = ('completed', 'error')
+
+# Milliseconds the browser waits before reconnecting a closed stream
+RECONNECT_DELAY = 1000
+
+# Checkpoints read at a time for a client that fell behind a running job
+CATCH_UP_BATCH = 1000
+
+
+def format_event(event, data, event_id=None):
+    """
+    Encode one Server-Sent Event.
+
+    Args:
+        event (str): Event name the client listens for
+        data (dict): JSON payload
+        event_id (int): Sent back by the browser as Last-Event-ID when it reconnects
+
+    Returns:
+        str: The event in text/event-stream format
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class JobEventStream:
+    """
+    Server-Sent Events for one scrape job.
+
+    A job running in this process wakes the stream whenever it changes. A job
+    run by another worker is read from the scrape queue every
+    SCRAPE_PROGRESS_INTERVAL seconds, which is as often as workers write their
+    progress. Either way the client gets a 'progress' event when the counts or
+    the status change, a 'result' event for every finished URL and a final
+    'done' event with the full job status.
+
+    Event IDs count the results sent so far, so a reconnecting browser (which
+    sends Last-Event-ID) continues after the last result it received. A job
+    running here only keeps its latest results in memory; a client further
+    behind catches up from the job's checkpoints first.
+    """
+
+    def __init__(self, app, job_id, find_running, job_view, sent=0):
+        """
+        Initialize the stream.
+
+        Args:
+            app (Flask): Application, for its config and app contexts
+            job_id (str): Public job ID
+            find_running (callable): Returns the job if this process is running it, else None
+            job_view (callable): Builds a ScrapeJob from a scrape queue row
+            sent (int): Results the client already has
+        """
+        self.app = app
+        self.job_id = job_id
+        self.find_running = find_running
+        self.job_view = job_view
+        self.sent = sent
+        self._last_checkpoint_id = None
+
+    def _queued_job(self):
+        """Read a job run elsewhere and the results it checkpointed since the last read."""
+        with self.app.app_context():
+            record = get_queued_job(self.job_id)
+            if record is None:
+                return None, []
+
+            job = self.job_view(record)
+            if job.status in FINISHED_STATUSES:
+                return job, []
+
+            # The first read skips what the client already has, later reads continue by ID
+            rows = checkpoints_since(
+                record.id,
+                after_id=self._last_checkpoint_id,
+                offset=self.sent if self._last_checkpoint_id is None else 0
+            )
+            if rows:
+                self._last_checkpoint_id = rows[-1][0]
+            return job, [result for _, result in rows]
+
+    def _missed_results(self, job):
+        """Read results of a job running here that are no longer in its memory."""
+        record_id = getattr(job, 'record_id', None)
+        if record_id is None:
+            # Nothing else has them; continue from the oldest result still kept
+            self.sent = max(self.sent, job.result_count - len(job.recent_results))
+            return job.results_since(self.sent) or []
+        with self.app.app_context():
+            rows = checkpoints_since(record_id, offset=self.sent, limit=CATCH_UP_BATCH)
+        return [result for _, result in rows]
+
+    def __iter__(self):
+        config = self.app.config
+        deadline = time.monotonic() + config['SCRAPE_EVENTS_MAX_DURATION']
+        last_write = time.monotonic()
+        last_progress = None
+
+        yield f"retry: {RECONNECT_DELAY}\n\n"
+
+        while True:
+            job = self.find_running(self.job_id)
+            local = job is not None
+            catching_up = False
+            if local:
+                version = job.version
+                new_results = job.results_since(self.sent)
+                if new_results is None:
+                    new_results = self._missed_results(job)
+                    catching_up = bool(new_results)
+            else:
+                job, new_results = self._queued_job()
+                if job is None:
+                    yield format_event('done', {'job_id': self.job_id, 'status': 'error', 'error': 'Job not found'})
+                    return
+
+            chunks = []
+            for result in new_results:
+                self.sent += 1
+                chunks.append(format_event('result', project(result, DEFAULT_FIELDS), self.sent))
+
+            if job.status in FINISHED_STATUSES and not catching_up:
+                chunks.append(format_event('done', job.to_dict(), self.sent))
+                yield ''.join(chunks)
+                return
+
+            # Progress is only sent when it changed, not on every wake-up
+            progress = job.progress_dict()
+            key = (progress['status'], progress['completed_urls'], progress['total_urls'])
+            if key != last_progress:
+                last_progress = key
+                chunks.append(format_event('progress', progress, self.sent))
+
+            now = time.monotonic()
+            if chunks:
+                yield ''.join(chunks)
+                last_write = now
+            elif now - last_write >= config['SCRAPE_EVENTS_KEEPALIVE']:
+                # Comment line, keeps proxies from closing an idle connection
+                yield ': keep-alive\n\n'
+                last_write = now
+
+            # End the response now and then; the browser reconnects right away
+            if now >= deadline:
+                return
+
+            if catching_up:
+                continue
+            if local:
+                job.wait_for_change(version, timeout=config['SCRAPE_EVENTS_KEEPALIVE'])
+            else:
+                time.sleep(config['SCRAPE_PROGRESS_INTERVAL'])
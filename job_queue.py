@@ -0,0 +1,374 @@
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import defer
+from models import db, ScrapeQueueJob, ScrapeCheckpoint, Contact
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Queue row statuses
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+ERROR = 'error'
+
+# Longest contact value stored; longer matches are extraction noise
+MAX_CONTACT_LENGTH = 255
+
+# Columns added to scrape_queue after the table was first released, with their DDL
+ADDED_QUEUE_COLUMNS = {
+    'only_new': 'BOOLEAN DEFAULT FALSE'
+}
+
+# All functions below use db.session, so call them inside an app context.
+
+
+def upgrade_queue_table():
+    """Add columns missing from a scrape_queue table created by an older version; run after db.create_all()."""
+    existing = {column['name'] for column in inspect(db.engine).get_columns(ScrapeQueueJob.__tablename__)}
+    for name, ddl in ADDED_QUEUE_COLUMNS.items():
+        if name not in existing:
+            db.session.execute(text(f"ALTER TABLE {ScrapeQueueJob.__tablename__} ADD COLUMN {name} {ddl}"))
+            logger.info(f"Added column {name} to {ScrapeQueueJob.__tablename__}")
+    db.session.commit()
+
+
+def default_worker_id():
+    """Identify this worker in the queue table (host, process and thread)."""
+    return f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+
+
+def enqueue_job(job_id, urls, headless=True, user_id=None, only_new=False):
+    """
+    Add a scrape job to the queue.
+
+    Args:
+        job_id (str): Public job ID returned to the client
+        urls (list): URLs to scrape
+        headless (bool): Run Chrome headless for escalated pages
+        user_id (int): Owner of the job, None for anonymous jobs
+        only_new (bool): Drop emails and phones the user got from earlier jobs
+
+    Returns:
+        ScrapeQueueJob: The new queue row
+    """
+    record = ScrapeQueueJob(
+        job_id=job_id,
+        user_id=user_id,
+        urls=json.dumps(urls),
+        headless=headless,
+        only_new=only_new,
+        status=QUEUED,
+        total_urls=len(urls),
+        completed_urls=0,
+        created_at=datetime.utcnow()
+    )
+    db.session.add(record)
+    db.session.commit()
+    logger.info(f"Queued job {job_id} with {len(urls)} URLs")
+    return record
+
+
+def claim_next_job(worker_id):
+    """
+    Take the oldest queued job and mark it as running for this worker.
+
+    The status check is part of the UPDATE, so when several workers race for
+    the same row only one of them gets it.
+
+    Args:
+        worker_id (str): Worker claiming the job
+
+    Returns:
+        ScrapeQueueJob: The claimed row, or None if the queue is empty
+    """
+    candidates = (
+        db.session.query(ScrapeQueueJob.id)
+        .filter_by(status=QUEUED)
+        .order_by(ScrapeQueueJob.id)
+        .limit(5)
+        .all()
+    )
+    for (record_id,) in candidates:
+        now = datetime.utcnow()
+        claimed = ScrapeQueueJob.query.filter_by(id=record_id, status=QUEUED).update({
+            'status': RUNNING,
+            'worker_id': worker_id,
+            'started_at': now,
+            'heartbeat_at': now,
+            'attempts': ScrapeQueueJob.attempts + 1
+        }, synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            return ScrapeQueueJob.query.get(record_id)
+
+    return None
+
+
+def heartbeat(record_id):
+    """Record that the worker running a job is still alive."""
+    ScrapeQueueJob.query.filter_by(id=record_id, status=RUNNING).update(
+        {'heartbeat_at': datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+
+
+def contact_rows(job_id, user_id, result, created_at=None):
+    """
+    Turn a scrape result into rows for the contacts table.
+
+    Args:
+        job_id (str): Job that produced the result
+        user_id (int): Owner of the job, None for anonymous jobs
+        result (dict): Result dict for one URL
+        created_at (datetime): Timestamp for the rows, defaults to now
+
+    Returns:
+        list: Column mappings, one per distinct email and phone number
+    """
+    created_at = created_at or datetime.utcnow()
+    url = result.get('url') or ''
+    domain = (result.get('domain') or '').lower() or None
+    rows = []
+    for kind, values in (('email', result.get('emails')), ('phone', result.get('phones'))):
+        if not isinstance(values, list):
+            continue
+        seen = set()
+        for value in values:
+            if not isinstance(value, str):
+                continue
+            value = value.strip()
+            if kind == 'email':
+                value = value.lower()
+            if not value or len(value) > MAX_CONTACT_LENGTH or value in seen:
+                continue
+            seen.add(value)
+            rows.append({
+                'job_id': job_id,
+                'user_id': user_id,
+                'url': url,
+                'domain': domain,
+                'kind': kind,
+                'value': value,
+                'source': result.get('fetch_tier'),
+                'created_at': created_at
+            })
+    return rows
+
+
+def save_progress(record_id, completed_urls, total_urls, checkpoints=None, contacts=None):
+    """
+    Store a running job's progress where every web worker can read it.
+
+    Args:
+        record_id (int): Queue row ID
+        completed_urls (int): URLs finished so far
+        total_urls (int): URLs in the job
+        checkpoints (list): (url index, result dict) pairs finished since the
+            last call, written in the same transaction as the progress
+        contacts (list): contact_rows() of those results; written with their
+            checkpoints, so a resumed job neither loses nor repeats them
+    """
+    if contacts:
+        db.session.bulk_insert_mappings(Contact, contacts)
+    if checkpoints:
+        now = datetime.utcnow()
+        db.session.bulk_insert_mappings(ScrapeCheckpoint, [
+            {
+                'queue_job_id': record_id,
+                'url_index': index,
+                'result': json.dumps(result, default=str),
+                'created_at': now
+            }
+            for index, result in checkpoints
+        ])
+    ScrapeQueueJob.query.filter_by(id=record_id).update({
+        'completed_urls': completed_urls,
+        'total_urls': total_urls,
+        'heartbeat_at': datetime.utcnow()
+    }, synchronize_session=False)
+    db.session.commit()
+
+
+def iter_checkpoints(record_id, batch_size=1000):
+    """
+    Yield the results a job already finished, for resuming it, in URL order.
+
+    Rows are fetched batch_size at a time, so a resumed job never holds all
+    of them. The query runs on the first iteration, inside the caller's app
+    context.
+
+    Yields:
+        tuple: (URL index, result dict)
+    """
+    query = (
+        db.session.query(ScrapeCheckpoint.url_index, ScrapeCheckpoint.result)
+        .filter_by(queue_job_id=record_id)
+        .order_by(ScrapeCheckpoint.url_index)
+    )
+    for url_index, result in query.yield_per(batch_size):
+        yield url_index, json.loads(result)
+
+
+def load_checkpoints(record_id):
+    """
+    Return the results a job already finished.
+
+    Returns:
+        dict: URL index -> result dict
+    """
+    return dict(iter_checkpoints(record_id))
+
+
+def checkpoints_since(record_id, after_id=None, offset=0, limit=None):
+    """
+    Return checkpointed results in the order they were saved.
+
+    Args:
+        record_id (int): Queue row ID
+        after_id (int): Only checkpoints saved after this checkpoint ID
+        offset (int): Checkpoints to skip, used when after_id is not known yet
+        limit (int): Most checkpoints to return, None for all
+
+    Returns:
+        list: (checkpoint ID, result dict) pairs
+    """
+    query = (
+        db.session.query(ScrapeCheckpoint.id, ScrapeCheckpoint.result)
+        .filter(ScrapeCheckpoint.queue_job_id == record_id)
+    )
+    if after_id is not None:
+        query = query.filter(ScrapeCheckpoint.id > after_id)
+    rows = query.order_by(ScrapeCheckpoint.id).offset(offset).limit(limit).all()
+    return [(checkpoint_id, json.loads(result)) for checkpoint_id, result in rows]
+
+
+def finish_job(record_id, status, result_file=None, error=None):
+    """
+    Store the outcome of a job.
+
+    The results themselves stay in the result file; the queue row only
+    records where it is.
+
+    Args:
+        record_id (int): Queue row ID
+        status (str): COMPLETED or ERROR
+        result_file (str): Path of the results file
+        error (str): Error message for failed jobs
+    """
+    values = {
+        'status': status,
+        'finished_at': datetime.utcnow(),
+        'result_file': result_file,
+        'error': error
+    }
+    ScrapeQueueJob.query.filter_by(id=record_id).update(values, synchronize_session=False)
+
+    # Completed jobs have their result file; failed jobs keep their
+    # checkpoints so they can be resumed
+    if status == COMPLETED:
+        ScrapeCheckpoint.query.filter_by(queue_job_id=record_id).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def resume_job(record):
+    """
+    Put a failed or stuck job back in the queue.
+
+    The worker that picks it up skips every URL that has a checkpoint and
+    continues with the rest.
+
+    Args:
+        record (ScrapeQueueJob): Queue row to resume
+
+    Returns:
+        int: Number of URLs already done
+    """
+    record.status = QUEUED
+    record.worker_id = None
+    record.error = None
+    record.finished_at = None
+    record.attempts = 0
+    db.session.commit()
+
+    done = ScrapeCheckpoint.query.filter_by(queue_job_id=record.id).count()
+    logger.info(f"Resuming job {record.job_id}, {done} of {record.total_urls} URLs already done")
+    return done
+
+
+def is_stale(record, stale_after):
+    """Return True if a running job has not sent a heartbeat for stale_after seconds."""
+    if record.status != RUNNING:
+        return False
+    last_seen = record.heartbeat_at or record.started_at
+    return last_seen is None or datetime.utcnow() - last_seen > timedelta(seconds=stale_after)
+
+
+def requeue_stale_jobs(stale_after, max_attempts):
+    """
+    Recover jobs whose worker stopped sending heartbeats.
+
+    Jobs that have not used up their attempts go back to the queue, the rest
+    are marked as failed.
+
+    Args:
+        stale_after (int): Seconds without a heartbeat before a job is stale
+        max_attempts (int): How many times a job may be started
+
+    Returns:
+        int: Number of jobs recovered or failed
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+    stale_jobs = ScrapeQueueJob.query.filter(
+        ScrapeQueueJob.status == RUNNING,
+        ScrapeQueueJob.heartbeat_at < cutoff
+    ).all()
+
+    for record in stale_jobs:
+        if (record.attempts or 0) >= max_attempts:
+            logger.warning(f"Job {record.job_id} stalled on {record.worker_id} too often, marking as failed")
+            record.status = ERROR
+            record.error = f"Worker stopped responding after {record.attempts} attempts"
+            record.finished_at = datetime.utcnow()
+        else:
+            logger.warning(f"Job {record.job_id} stalled on {record.worker_id}, putting it back in the queue")
+            record.status = QUEUED
+            record.worker_id = None
+
+    if stale_jobs:
+        db.session.commit()
+    return len(stale_jobs)
+
+
+def get_queued_job(job_id):
+    """Return the newest queue row for a public job ID, or None."""
+    return ScrapeQueueJob.query.filter_by(job_id=job_id).order_by(ScrapeQueueJob.id.desc()).first()
+
+
+def recent_jobs(limit=100, before_id=None):
+    """
+    Return the newest queue rows, newest first, without their results.
+
+    Args:
+        limit (int): Rows to return
+        before_id (int): Only rows older than this queue row ID, for paging
+
+    Returns:
+        list: ScrapeQueueJob rows; reading .results loads them one row at a time
+    """
+    query = ScrapeQueueJob.query.options(defer(ScrapeQueueJob.results), defer(ScrapeQueueJob.urls))
+    if before_id is not None:
+        query = query.filter(ScrapeQueueJob.id < before_id)
+    return query.order_by(ScrapeQueueJob.id.desc()).limit(limit).all()
+
+
+def job_urls(record):
+    """Return the URL list stored on a queue row."""
+    return json.loads(record.urls or '[]')
+
@@ -0,0 +1,175 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Crockford's base32, the ULID alphabet
+ULID_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+
+def new_job_id():
+    """
+    Return a new unique job ID.
+
+    IDs are ULIDs: 48 bits of millisecond timestamp followed by 80 random
+    bits, written as 26 base32 characters. They sort by creation time, and two
+    jobs started in the same second or on different machines still get
+    different IDs.
+
+    Returns:
+        str: The job ID
+    """
+    value = (int(time.time() * 1000) << 80) | int.from_bytes(os.urandom(10), 'big')
+    chars = []
+    for _ in range(26):
+        value, index = divmod(value, 32)
+        chars.append(ULID_ALPHABET[index])
+    return ''.join(reversed(chars))
+
+
+class JobRegistry:
+    """
+    Jobs this process knows about.
+
+    Running jobs stay here until they finish. Finished jobs live in the scrape
+    queue table; a copy is kept here so repeated status and result requests
+    don't reload them from the database. Copies expire after ttl seconds,
+    and the least recently used ones are dropped when there are more than
+    max_finished of them or their cached views take more than memory_budget
+    bytes.
+    """
+
+    def __init__(self, ttl=600, max_finished=200, memory_budget=64 * 1024 * 1024):
+        """
+        Initialize the registry.
+
+        Args:
+            ttl (int): Seconds a finished job is kept after it was loaded
+            max_finished (int): Most finished jobs kept at once
+            memory_budget (int): Bytes kept for finished jobs, measured as
+                the JSON size of their status view with its result preview
+        """
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self.memory_budget = memory_budget
+        self._running = {}
+        self._finished = OrderedDict()  # job_id -> (job, size, expires_at), oldest use first
+        self._finished_bytes = 0
+        self._lock = threading.Lock()
+
+    def add_running(self, job):
+        """Register a job that this process is running."""
+        with self._lock:
+            self._drop(job.job_id)
+            self._running[job.job_id] = job
+
+    def remove_running(self, job_id):
+        """Forget a job once its outcome is in the scrape queue."""
+        with self._lock:
+            self._running.pop(job_id, None)
+
+    def running(self, job_id):
+        """Return the job if this process is running it, else None."""
+        return self._running.get(job_id)
+
+    def running_jobs(self):
+        """Return the jobs this process is running."""
+        return list(self._running.values())
+
+    def get(self, job_id):
+        """
+        Return a running job or an unexpired finished copy.
+
+        Returns:
+            ScrapeJob: The job, or None if it has to be loaded from the database
+        """
+        with self._lock:
+            job = self._running.get(job_id)
+            if job is not None:
+                return job
+
+            entry = self._finished.get(job_id)
+            if entry is None:
+                return None
+            if entry[2] < time.monotonic():
+                self._drop(job_id)
+                return None
+            self._finished.move_to_end(job_id)
+            return entry[0]
+
+    def add_finished(self, job, size):
+        """
+        Keep a copy of a finished job loaded from the database.
+
+        Args:
+            job (ScrapeJob): Completed or failed job
+            size (int): Approximate bytes the cached view takes
+        """
+        if size > self.memory_budget:
+            return
+        with self._lock:
+            if job.job_id in self._running:
+                return
+            self._drop(job.job_id)
+            self._finished[job.job_id] = (job, size, time.monotonic() + self.ttl)
+            self._finished_bytes += size
+            self._evict()
+
+    def discard(self, job_id):
+        """Drop the finished copy of a job, e.g. after it was put back in the queue."""
+        with self._lock:
+            self._drop(job_id)
+
+    def stats(self):
+        """Return counts for monitoring."""
+        with self._lock:
+            return {
+                'running': len(self._running),
+                'finished_cached': len(self._finished),
+                'finished_bytes': self._finished_bytes,
+                'memory_budget': self.memory_budget
+            }
+
+    def _drop(self, job_id):
+        entry = self._finished.pop(job_id, None)
+        if entry is not None:
+            self._finished_bytes -= entry[1]
+
+    def _evict(self):
+        now = time.monotonic()
+        for job_id in [job_id for job_id, entry in self._finished.items() if entry[2] < now]:
+            self._drop(job_id)
+        while self._finished and (len(self._finished) > self.max_finished
+                                  or self._finished_bytes > self.memory_budget):
+            job_id, (_, size, _) = self._finished.popitem(last=False)
+            self._finished_bytes -= size
+            logger.debug(f"Evicted finished job {job_id} from the job registry")
+
+
+_job_registry = None
+_job_registry_lock = threading.Lock()
+
+
+def configure_job_registry(ttl=600, max_finished=200, memory_budget=64 * 1024 * 1024):
+    """Replace the shared job registry with one using the given limits, keeping running jobs."""
+    global _job_registry
+    with _job_registry_lock:
+        registry = JobRegistry(ttl=ttl, max_finished=max_finished, memory_budget=memory_budget)
+        if _job_registry is not None:
+            for job in _job_registry.running_jobs():
+                registry.add_running(job)
+        _job_registry = registry
+        return _job_registry
+
+
+def get_job_registry():
+    """Return the shared job registry, creating it with default limits on first use."""
+    global _job_registry
+    with _job_registry_lock:
+        if _job_registry is None:
+            _job_registry = JobRegistry()
+        return _job_registry
@@ -274,6 +274,90 @@ class ScrapeJobHistory(db.Model):
     def __repr__(self):
         return f'<ScrapeJobHistory {self.job_id}>'
 
+# ScrapeQueueJob model - durable queue of scrape jobs, run by worker.py
+class ScrapeQueueJob(db.Model):
+    __tablename__ = 'scrape_queue'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(100), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    urls = db.Column(db.Text, nullable=False)  # JSON list of URLs
+    headless = db.Column(db.Boolean, default=True)
+    status = db.Column(db.String(50), default='queued', index=True)  # queued, running, completed, error
+    total_urls = db.Column(db.Integer, nullable=False)
+    completed_urls = db.Column(db.Integer, default=0)
+    results = db.Column(db.Text)  # JSON results of jobs finished by older versions; results now live in result_file
+    result_file = db.Column(db.String(255))
+    error = db.Column(db.Text)
+    worker_id = db.Column(db.String(100))
+    attempts = db.Column(db.Integer, default=0)
+    only_new = db.Column(db.Boolean, default=False)  # Return only contacts the user hasn't seen in earlier jobs
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<ScrapeQueueJob {self.job_id}>'
+
+# ScrapeCheckpoint model - finished URLs of a queued job, so a restarted job can resume
+class ScrapeCheckpoint(db.Model):
+    __tablename__ = 'scrape_checkpoints'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    queue_job_id = db.Column(db.Integer, db.ForeignKey('scrape_queue.id'), nullable=False, index=True)
+    url_index = db.Column(db.Integer, nullable=False)  # Position of the URL in the job's URL list
+    result = db.Column(db.Text, nullable=False)  # JSON result dict
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ScrapeCheckpoint {self.queue_job_id}:{self.url_index}>'
+
+# Contact model - one email or phone number found by a scrape job, written as the job runs
+class Contact(db.Model):
+    __tablename__ = 'contacts'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(100), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
+    url = db.Column(db.Text, nullable=False)  # Scraped URL the contact was found for
+    domain = db.Column(db.String(255), index=True)
+    kind = db.Column(db.String(20), nullable=False)  # email, phone
+    value = db.Column(db.String(255), nullable=False, index=True)
+    source = db.Column(db.String(20))  # Fetch tier that found it: static, browser
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Contact {self.kind}:{self.value}>'
+
+# SeenContact model - where each of a user's normalized emails and phones was first found, for cross-job dedup
+class SeenContact(db.Model):
+    __tablename__ = 'seen_contacts'
+    __table_args__ = (db.UniqueConstraint('user_id', 'kind', 'value', name='uq_seen_contacts_user_kind_value'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # email, phone
+    value = db.Column(db.String(255), nullable=False)  # Normalized: lower-case email, phone digits
+    first_job_id = db.Column(db.String(100), nullable=False)
+    first_seen_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SeenContact {self.kind}:{self.value}>'
+
+# ContactFilter model - a user's persisted Bloom filter over their seen contacts
+class ContactFilter(db.Model):
+    __tablename__ = 'contact_filters'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    bits = db.Column(db.LargeBinary, nullable=False)
+    hashes = db.Column(db.Integer, nullable=False)
+    items = db.Column(db.Integer, default=0)  # Contacts added, to know when the filter is too full
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ContactFilter {self.user_id}>'
+
 # ApiKey model
 class ApiKey(db.Model):
     __tablename__ = 'api_keys'
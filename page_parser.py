@@ -0,0 +1,273 @@
+import logging
+import threading
+from html.parser import HTMLParser
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Fastest first; html.parser ships with Python and is always available
+PARSER_BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+# Text inside these elements is not page text (matches BeautifulSoup.get_text).
+# Lexbor keeps <template> contents out of the tree, so every backend skips
+# the links and attributes inside them too.
+NON_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+
+class ParsedPage:
+    """
+    Everything the extractors need from one page, collected in a single walk.
+
+    Attributes:
+        text (str): Visible page text, script and style contents excluded
+        links (list): (href, link text) for every <a href>, in document order
+        attribute_texts (list): <img alt> values followed by every title attribute
+    """
+
+    __slots__ = ('text', 'links', 'attribute_texts')
+
+    def __init__(self, text='', links=None, attribute_texts=None):
+        self.text = text
+        self.links = links or []
+        self.attribute_texts = attribute_texts or []
+
+
+class _PageCollector(HTMLParser):
+    """Pure Python backend built on the standard library tokenizer."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text_parts = []
+        self.links = []
+        self.alt_texts = []
+        self.title_texts = []
+        self._open_links = []
+        self._hidden_tag = None
+        self._hidden_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._hidden_tag:
+            if tag == self._hidden_tag:
+                self._hidden_depth += 1
+            return
+
+        attributes = {}
+        for name, value in attrs:
+            attributes.setdefault(name, value or '')
+
+        if tag == 'img' and 'alt' in attributes:
+            self.alt_texts.append(attributes['alt'])
+        if 'title' in attributes:
+            self.title_texts.append(attributes['title'])
+        if tag == 'a':
+            # Anchors without href are tracked too so their end tags pair up
+            link = [attributes['href'], []] if 'href' in attributes else None
+            if link:
+                self.links.append(link)
+            self._open_links.append(link)
+        if tag in NON_TEXT_TAGS:
+            self._hidden_tag = tag
+            self._hidden_depth = 1
+
+    def handle_endtag(self, tag):
+        if self._hidden_tag:
+            if tag == self._hidden_tag:
+                self._hidden_depth -= 1
+                if not self._hidden_depth:
+                    self._hidden_tag = None
+        elif tag == 'a' and self._open_links:
+            self._open_links.pop()
+
+    def handle_data(self, data):
+        if self._hidden_tag:
+            return
+        self.text_parts.append(data)
+        for link in self._open_links:
+            if link:
+                link[1].append(data)
+
+    def page(self):
+        return ParsedPage(
+            text=''.join(self.text_parts),
+            links=[(href, ''.join(parts)) for href, parts in self.links],
+            attribute_texts=self.alt_texts + self.title_texts
+        )
+
+
+def _parse_html_parser(html):
+    collector = _PageCollector()
+    collector.feed(html)
+    collector.close()
+    return collector.page()
+
+
+def _parse_lxml(html):
+    # Comments are dropped at parse time so their tails merge into the text
+    parser = etree.HTMLParser(remove_comments=True, remove_pis=True)
+    parser.feed(html)
+    root = parser.close()
+    if root is None:
+        return ParsedPage()
+
+    text_parts = []
+    links = []
+    alt_texts = []
+    title_texts = []
+    open_links = []
+    hidden = 0  # Depth inside a script, style or template element
+
+    def add_text(data):
+        text_parts.append(data)
+        for link in open_links:
+            if link:
+                link[1].append(data)
+
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if hidden:
+                hidden += 1
+                continue
+            attributes = element.attrib
+            if tag == 'img' and 'alt' in attributes:
+                alt_texts.append(attributes['alt'])
+            if 'title' in attributes:
+                title_texts.append(attributes['title'])
+            if tag == 'a':
+                link = [attributes['href'], []] if 'href' in attributes else None
+                if link:
+                    links.append(link)
+                open_links.append(link)
+            if tag in NON_TEXT_TAGS:
+                hidden = 1
+            elif element.text:
+                add_text(element.text)
+        else:
+            if hidden:
+                hidden -= 1
+                if hidden:
+                    continue
+            elif tag == 'a':
+                open_links.pop()
+            if element.tail:
+                add_text(element.tail)
+
+    return ParsedPage(
+        text=''.join(text_parts),
+        links=[(href, ''.join(parts)) for href, parts in links],
+        attribute_texts=alt_texts + title_texts
+    )
+
+
+def _parse_selectolax(html):
+    tree = LexborHTMLParser(html)
+    if tree.root is None:
+        return ParsedPage()
+
+    text_parts = []
+    links = []
+    alt_texts = []
+    title_texts = []
+
+    def is_text(node):
+        return node.tag == '-text' and (node.parent is None or node.parent.tag not in NON_TEXT_TAGS)
+
+    for node in tree.root.traverse(include_text=True):
+        tag = node.tag
+        if tag == '-text':
+            if is_text(node):
+                text_parts.append(node.text_content)
+            continue
+        if tag.startswith('-'):
+            # Comments and doctype
+            continue
+
+        attributes = node.attributes
+        if not attributes:
+            continue
+        if tag == 'img' and 'alt' in attributes:
+            alt_texts.append(attributes['alt'] or '')
+        if 'title' in attributes:
+            title_texts.append(attributes['title'] or '')
+        if tag == 'a' and 'href' in attributes:
+            link_text = ''.join(child.text_content for child in node.traverse(include_text=True) if is_text(child))
+            links.append((attributes['href'] or '', link_text))
+
+    return ParsedPage(
+        text=''.join(text_parts),
+        links=links,
+        attribute_texts=alt_texts + title_texts
+    )
+
+
+_PARSERS = {
+    'selectolax': (_parse_selectolax, lambda: LexborHTMLParser is not None),
+    'lxml': (_parse_lxml, lambda: etree is not None),
+    'html.parser': (_parse_html_parser, lambda: True),
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def available_backends():
+    """Return the installed parser backends, fastest first."""
+    return [name for name in PARSER_BACKENDS if _PARSERS[name][1]()]
+
+
+def configure_parser(backend=None):
+    """
+    Choose the parser backend used by parse_page.
+
+    Args:
+        backend (str): One of PARSER_BACKENDS; empty or None picks the fastest
+            installed backend. An unavailable backend falls back the same way.
+
+    Returns:
+        str: The backend in use
+    """
+    global _backend
+    installed = available_backends()
+    if backend and backend not in installed:
+        logger.warning(f"HTML parser backend '{backend}' is not available, using {installed[0]}")
+        backend = None
+
+    with _backend_lock:
+        _backend = backend or installed[0]
+        logger.info(f"Using HTML parser backend: {_backend}")
+        return _backend
+
+
+def get_backend():
+    """Return the active parser backend, picking the fastest on first use."""
+    if _backend is None:
+        return configure_parser()
+    return _backend
+
+
+def parse_page(html, backend=None):
+    """
+    Parse a page once and collect its text, links and attribute texts.
+
+    Args:
+        html (str): Page HTML
+        backend (str): Override the configured backend for this call
+
+    Returns:
+        ParsedPage: The collected page data
+    """
+    if not html:
+        return ParsedPage()
+
+    parse = _PARSERS[backend or get_backend()][0]
+    return parse(html)
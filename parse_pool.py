@@ -0,0 +1,207 @@
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+
+from extraction import extract, find_image_emails, find_mailto_links
+from fetch_strategy import needs_browser, STATIC_TIER
+from page_parser import configure_parser, parse_page
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Charset declared in the first bytes of a page without a Content-Type charset
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-]+)', re.IGNORECASE)
+
+CONTACT_LINK_KEYWORDS = ['contact', 'about']
+
+# Bump when parse_homepage() or parse_contact_page() output changes outside extraction.py
+# (contact link keywords, decoding); cached extraction results key on it
+PARSE_VERSION = '1'
+
+
+# Parse stage. These run inside the worker processes, so they must stay
+# top-level functions that take and return plain picklable values.
+def decode_body(body, encoding=None):
+    """
+    Decode a fetched response body.
+
+    Args:
+        body (bytes or str): Raw response body; text is returned unchanged
+        encoding (str): Charset from the Content-Type header, if any
+
+    Returns:
+        str: Decoded page HTML
+    """
+    if isinstance(body, str):
+        return body
+
+    if not encoding:
+        match = META_CHARSET_PATTERN.search(body[:2048])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+
+    try:
+        return body.decode(encoding, errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+
+def parse_homepage(url, body, encoding=None):
+    """
+    Extract contact information from a fetched homepage.
+
+    Args:
+        url (str): Page URL, used for the domain and relative contact links
+        body (bytes or str): Page body from the fetch stage
+        encoding (str): Charset from the Content-Type header, if any
+
+    Returns:
+        tuple: (result dict, candidate contact page URLs in the order they
+               should be tried)
+    """
+    content = decode_body(body, encoding)
+
+    # Parse content once, every extractor below reads from the same pass
+    page = parse_page(content)
+
+    found = extract(content, page.text)
+    emails = found['emails']
+    emails.extend(find_image_emails(page))
+    emails.extend(find_mailto_links(page))
+
+    # Collect contact page candidates
+    contact_urls = []
+    for href, link_text in page.links:
+        if href and any(keyword in href.lower() or keyword in link_text.lower()
+                        for keyword in CONTACT_LINK_KEYWORDS):
+            # Handle relative URLs
+            if not href.startswith(('http://', 'https://')):
+                contact_urls.append(urllib.parse.urljoin(url, href))
+            else:
+                contact_urls.append(href)
+
+    result = {
+        'url': url,
+        'domain': urllib.parse.urlparse(url).netloc,
+        'emails': emails,
+        'phones': found['phones'],
+        'social_media': found['social_media'],
+        'status': 'success (simple scraper)',
+        'fetch_tier': STATIC_TIER,
+        # Non-empty when the page looks JavaScript-rendered and should go to the browser tier
+        'escalation_reason': needs_browser(content) or ''
+    }
+    return result, contact_urls
+
+
+def parse_contact_page(body, encoding=None):
+    """
+    Extract contact information from a fetched contact page.
+
+    Args:
+        body (bytes or str): Page body from the fetch stage
+        encoding (str): Charset from the Content-Type header, if any
+
+    Returns:
+        dict: 'emails', 'phones' and 'social_media' found on the page
+    """
+    content = decode_body(body, encoding)
+    return extract(content, parse_page(content).text)
+
+
+def merge_contact_page(result, found):
+    """Merge contact page findings into a homepage result, in place."""
+    result['emails'] = list(set(result['emails']) | set(found['emails']))
+    result['phones'] = list(set(result['phones']) | set(found['phones']))
+    result['social_media'].update(found['social_media'])
+
+
+class ParsePool:
+    """
+    Worker processes for the CPU-bound parse stage.
+
+    Fetching stays on the event loop; parsing and regex extraction run here so
+    they use every core instead of competing for the GIL with the fetchers and
+    with other jobs. The processes are started on first use.
+    """
+
+    def __init__(self, workers=None, max_pending=None, parser_backend=None):
+        """
+        Initialize the pool.
+
+        Args:
+            workers (int): Worker processes, defaults to the CPU count. 0 keeps
+                parsing in threads of the fetching process.
+            max_pending (int): Pages a single job may have waiting for or in
+                the parse stage, defaults to twice the worker count
+            parser_backend (str): HTML parser backend for the workers
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else max(0, int(workers))
+        self.max_pending = max_pending or max(1, self.workers) * 2
+        self.parser_backend = parser_backend
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        """
+        Return the process pool executor, starting or replacing it if needed.
+
+        Returns:
+            ProcessPoolExecutor: The worker pool, or None when workers is 0
+        """
+        if not self.workers:
+            return None
+
+        with self._lock:
+            # A crashed worker breaks the whole executor, start a fresh one
+            if self._executor is not None and getattr(self._executor, '_broken', False):
+                logger.warning("Parse pool is broken, starting new worker processes")
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+            if self._executor is None:
+                # The app runs scrape jobs in threads, so don't fork the live process
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=configure_parser,
+                    initargs=(self.parser_backend,)
+                )
+                logger.info(f"Started parse pool with {self.workers} worker processes")
+
+            return self._executor
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def configure_parse_pool(workers=None, max_pending=None, parser_backend=None):
+    """Replace the shared parse pool with one using the given limits."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown()
+        _parse_pool = ParsePool(workers=workers, max_pending=max_pending, parser_backend=parser_backend)
+        return _parse_pool
+
+
+def get_parse_pool():
+    """Return the shared parse pool, creating it with default limits on first use."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ParsePool()
+        return _parse_pool
@@ -0,0 +1,270 @@
+import json
+import logging
+import threading
+import time
+import urllib.parse
+
+from cache_store import CounterBuffer, get_cache_store
+from http_pool import get_pool
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Cache store namespace for page responses
+NAMESPACE = 'responses'
+
+# Prefix of this cache's counters in the cache store
+COUNTER_PREFIX = 'responses.'
+
+COUNTERS = ('hits', 'revalidated', 'misses', 'stores', 'evictions')
+
+
+def normalize_url(url):
+    """
+    Return the cache key for a URL.
+
+    Scheme and host are lower-cased, default ports and fragments dropped and
+    an empty path becomes '/', so trivially different spellings of a page
+    share one entry. The query string is kept as is.
+    """
+    if not url.lower().startswith(('http://', 'https://')):
+        url = 'https://' + url
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    if port and (scheme, port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{port}"
+    return urllib.parse.urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+
+def header_charset(headers):
+    """Return the charset from a Content-Type header, or None."""
+    content_type = headers.get('Content-Type', '')
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'charset' and value.strip():
+            return value.strip().strip('"\'')
+    return None
+
+
+class CachedPage:
+    """A cached 200 response."""
+
+    __slots__ = ('url', 'body', 'charset', 'etag', 'last_modified', 'fresh')
+
+    def __init__(self, url, body, charset, etag, last_modified, fresh):
+        self.url = url
+        self.body = body
+        self.charset = charset
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fresh = fresh
+
+    def validators(self):
+        """Return the headers that ask the server whether this copy is still current."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Page bodies shared by every job, kept in the cache store.
+
+    Popular sites are submitted by many users; a homepage or contact page
+    fetched by one job is served to the next one from disk while it is
+    younger than ttl seconds. After that the cached copy is revalidated with
+    If-None-Match / If-Modified-Since, and a 304 reply reuses it without
+    downloading the page again. Once the cached bodies take more than
+    max_bytes, the least recently used ones are evicted.
+
+    Hit, revalidation and miss counts are kept in the store as well, so they
+    cover every process sharing the cache file.
+    """
+
+    def __init__(self, enabled=True, ttl=3600, max_bytes=512 * 1024 * 1024, max_body=2 * 1024 * 1024, store=None):
+        """
+        Initialize the cache.
+
+        Args:
+            enabled (bool): False sends every request to the network
+            ttl (int): Seconds a page is served without asking the server
+            max_bytes (int): Total size of cached bodies before eviction
+            max_body (int): Larger pages are not cached
+            store (CacheStore): Persistent store, defaults to the shared one
+        """
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_body = max_body
+        self.store = store or get_cache_store()
+        self.counters = CounterBuffer(self.store, COUNTER_PREFIX)
+        self._lock = threading.Lock()
+        self._bytes_since_evict = 0
+
+    def lookup(self, url):
+        """
+        Return the cached copy of a page, fresh or not.
+
+        Returns:
+            CachedPage: The cached response, or None if the page isn't cached
+        """
+        if not self.enabled:
+            return None
+        key = normalize_url(url)
+        try:
+            row = self.store.get(NAMESPACE, key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {key}: {str(e)}")
+            return None
+        if row is None:
+            self.counters.add('misses')
+            return None
+
+        header, _, body = row[0].partition(b'\n')
+        meta = json.loads(header)
+        page = CachedPage(key, body, meta['charset'], meta['etag'], meta['last_modified'], row[1] > time.time())
+        if page.fresh:
+            self.counters.add('hits')
+            try:
+                self.store.touch(NAMESPACE, key)
+            except Exception as e:
+                logger.warning(f"Response cache update failed for {key}: {str(e)}")
+        return page
+
+    def save(self, url, body, headers):
+        """
+        Cache a 200 response.
+
+        Args:
+            url (str): Requested URL
+            body (bytes): Response body
+            headers: Response headers (any case-insensitive mapping)
+        """
+        if not self.enabled or len(body) > self.max_body:
+            return
+        if 'no-store' in headers.get('Cache-Control', '').lower():
+            return
+
+        key = normalize_url(url)
+        meta = {
+            'charset': header_charset(headers),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified')
+        }
+        try:
+            self.store.set(NAMESPACE, key, json.dumps(meta).encode() + b'\n' + body, self.ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed for {key}: {str(e)}")
+            return
+        self.counters.add('stores')
+
+        # Checking the total size is a table scan, so do it once per tenth of the budget written
+        with self._lock:
+            self._bytes_since_evict += len(body)
+            due = self._bytes_since_evict >= self.max_bytes // 10
+            if due:
+                self._bytes_since_evict = 0
+        if due:
+            evicted = self.store.evict(NAMESPACE, self.max_bytes)
+            if evicted:
+                logger.info(f"Evicted {evicted} pages from the response cache")
+                self.counters.add('evictions', evicted)
+
+    def update(self, url, page, status, body, headers):
+        """
+        Update the cache with the server's reply to a page request.
+
+        Args:
+            url (str): Requested URL
+            page (CachedPage): The stale copy the request revalidated, or None
+            status (int): HTTP status of the reply
+            body (bytes): Reply body
+            headers: Reply headers (any case-insensitive mapping)
+
+        Returns:
+            tuple: (status, body, charset) to use; a 304 for a cached page
+                   becomes a 200 with the cached body
+        """
+        if page is not None and status == 304:
+            self.counters.add('revalidated')
+            try:
+                self.store.touch(NAMESPACE, page.url, ttl=self.ttl)
+            except Exception as e:
+                logger.warning(f"Response cache update failed for {page.url}: {str(e)}")
+            return 200, page.body, page.charset
+
+        if page is not None:
+            # The cached copy was out of date
+            self.counters.add('misses')
+        if status == 200:
+            self.save(url, body, headers)
+        return status, body, header_charset(headers)
+
+    def get(self, url, timeout, raise_for_status=True, before_request=None):
+        """
+        GET a page through the cache with the shared HTTP pool.
+
+        Args:
+            url (str): Page URL
+            timeout (int): Request timeout in seconds
+            raise_for_status (bool): Raise requests.HTTPError for 4xx/5xx replies
+            before_request (function): Called right before a network request,
+                e.g. to wait for the host's politeness delay; not called for
+                fresh cache hits
+
+        Returns:
+            tuple: (ok, body bytes, charset from the headers)
+        """
+        page = self.lookup(url)
+        if page is not None and page.fresh:
+            return True, page.body, page.charset
+
+        if before_request:
+            before_request()
+        response = get_pool().get(url, timeout=timeout, headers=page.validators() if page else None)
+        if raise_for_status:
+            response.raise_for_status()
+        status, body, charset = self.update(url, page, response.status_code, response.content, response.headers)
+        return status < 400, body, charset
+
+    def stats(self):
+        """Return hit/miss counts across all processes and the cache size."""
+        counts = self.counters.totals(COUNTERS)
+        lookups = counts['hits'] + counts['revalidated'] + counts['misses']
+        stats = {
+            'enabled': self.enabled,
+            'ttl': self.ttl,
+            'max_bytes': self.max_bytes,
+            'hit_rate': round((counts['hits'] + counts['revalidated']) / lookups, 3) if lookups else 0
+        }
+        stats.update(counts)
+        stats.update(self.store.stats(NAMESPACE))
+        return stats
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def configure_response_cache(enabled=True, ttl=3600, max_bytes=512 * 1024 * 1024, store=None):
+    """Replace the shared response cache with one using the given settings."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is not None:
+            _response_cache.counters.flush()
+        _response_cache = ResponseCache(enabled=enabled, ttl=ttl, max_bytes=max_bytes, store=store)
+        return _response_cache
+
+
+def get_response_cache():
+    """Return the shared response cache, creating it with default settings on first use."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
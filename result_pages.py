@@ -0,0 +1,188 @@
+import base64
+import binascii
+import logging
+from itertools import islice
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Fields a client can ask for with ?fields=
+RESULT_FIELDS = ['url', 'domain', 'emails', 'phones', 'status', 'social_media', 'fetch_tier', 'escalation_reason',
+                 'first_seen']
+
+# Fields returned when the request does not choose any
+DEFAULT_FIELDS = ['url', 'domain', 'emails', 'phones', 'status', 'social_media', 'fetch_tier']
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(position):
+    """Turn a position in the job's results into an opaque cursor string."""
+    return base64.urlsafe_b64encode(f"r{position}".encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Turn a cursor back into a position in the job's results.
+
+    Args:
+        cursor (str): Cursor from a previous page, None or '' for the first page
+
+    Returns:
+        int: Position of the first result to look at
+
+    Raises:
+        ValueError: If the cursor was not made by encode_cursor
+    """
+    if not cursor:
+        return 0
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not value.startswith('r') or not value[1:].isdigit():
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return int(value[1:])
+
+
+def parse_fields(value):
+    """
+    Parse the ?fields= parameter.
+
+    Args:
+        value (str): Comma-separated field names, None or '' for the defaults
+
+    Returns:
+        list: Field names in RESULT_FIELDS order
+
+    Raises:
+        ValueError: If a field is not in RESULT_FIELDS
+    """
+    if not value:
+        return list(DEFAULT_FIELDS)
+    requested = {field.strip() for field in value.split(',') if field.strip()}
+    unknown = requested - set(RESULT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [field for field in RESULT_FIELDS if field in requested]
+
+
+def parse_bool(value):
+    """Parse a true/false query parameter, None when it is not given."""
+    if value is None or value == '':
+        return None
+    lowered = value.lower()
+    if lowered in ('1', 'true', 'yes'):
+        return True
+    if lowered in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f"Expected true or false, got '{value}'")
+
+
+def filter_fields(has_email=None, domain=None, status=None):
+    """Return the fields the given filters need to read."""
+    fields = []
+    if has_email is not None:
+        fields.append('emails')
+    if domain:
+        fields.append('domain')
+    if status:
+        fields.append('status')
+    return fields
+
+
+def matches(result, has_email=None, domain=None, status=None):
+    """
+    Check a result against the server-side filters.
+
+    Args:
+        result (dict): Result for one URL
+        has_email (bool): Keep only results with (True) or without (False) emails
+        domain (str): Keep results for this domain or its subdomains
+        status (str): Keep results whose status contains this text, e.g. 'success' or 'error'
+
+    Returns:
+        bool: True if the result passes every filter that is set
+    """
+    if has_email is not None and bool(result.get('emails')) != has_email:
+        return False
+    if domain:
+        result_domain = (result.get('domain') or '').lower()
+        if result_domain.startswith('www.'):
+            result_domain = result_domain[4:]
+        wanted = domain.lower()
+        if wanted.startswith('www.'):
+            wanted = wanted[4:]
+        if result_domain != wanted and not result_domain.endswith(f".{wanted}"):
+            return False
+    if status and status.lower() not in (result.get('status') or '').lower():
+        return False
+    return True
+
+
+def project(result, fields):
+    """Return only the requested fields of a result, with list and dict defaults."""
+    projected = {}
+    for field in fields:
+        value = result.get(field)
+        if field in ('emails', 'phones'):
+            value = value if isinstance(value, list) else []
+        elif field in ('social_media', 'first_seen'):
+            value = value if isinstance(value, dict) else {}
+        elif value is None:
+            value = ''
+        projected[field] = value
+    return projected
+
+
+def page_results(read, cursor=None, limit=DEFAULT_PAGE_SIZE, fields=None, has_email=None, domain=None, status=None):
+    """
+    Build one page of filtered results.
+
+    The cursor is the position after the last result looked at, so filtered
+    pages stay stable while a job is still appending results.
+
+    Args:
+        read (callable): read(start) returns an iterator over the job's results
+            from position start, reading at least the requested and filter fields
+        cursor (str): Cursor from the previous page, None for the first page
+        limit (int): Maximum results on the page, capped at MAX_PAGE_SIZE
+        fields (list): Fields to return, defaults to DEFAULT_FIELDS
+        has_email (bool): Filter, see matches
+        domain (str): Filter, see matches
+        status (str): Filter, see matches
+
+    Returns:
+        tuple: (list of projected results, next cursor or None on the last page)
+    """
+    fields = fields or list(DEFAULT_FIELDS)
+    limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+    position = decode_cursor(cursor)
+
+    page = []
+    exhausted = True
+    for result in read(position):
+        position += 1
+        if matches(result, has_email=has_email, domain=domain, status=status):
+            page.append(project(result, fields))
+            if len(page) == limit:
+                exhausted = False
+                break
+
+    # A full page may have held the last match; look for the next one so the client
+    # does not ask for an empty page, and start the next page right at it
+    if not exhausted:
+        exhausted = True
+        for skipped, result in enumerate(read(position)):
+            if matches(result, has_email=has_email, domain=domain, status=status):
+                position += skipped
+                exhausted = False
+                break
+
+    return page, None if exhausted else encode_cursor(position)
+
+
+def read_list(results):
+    """Return a read(start) function for page_results over an in-memory result list."""
+    return lambda start: islice(results, start, None)
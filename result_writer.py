@@ -0,0 +1,396 @@
+import csv
+import json
+import logging
+import os
+import tempfile
+
+from extraction import SOCIAL_PATTERNS
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+try:
+    from openpyxl import Workbook, load_workbook
+except ImportError:
+    Workbook = None
+    load_workbook = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Spreadsheet columns; social profiles get one column per platform
+RESULT_COLUMNS = ['url', 'domain', 'emails', 'phones', 'status', 'fetch_tier', 'escalation_reason', 'first_seen']
+SOCIAL_COLUMNS = list(SOCIAL_PATTERNS)
+
+# Formats that can be written next to the main result file
+EXTRA_FORMATS = ('xlsx', 'csv', 'jsonl')
+
+# Columns stored as lists in the Parquet file
+LIST_COLUMNS = ('emails', 'phones')
+
+# Dict columns, stored as JSON text in every format
+JSON_COLUMNS = ('first_seen',)
+
+# Rows buffered per Parquet row group; readers load whole row groups
+PARQUET_ROW_GROUP_SIZE = 1000
+
+
+def flatten_result(result):
+    """
+    Turn a result dict into one spreadsheet row.
+
+    Lists are joined with ', ' and social profiles are spread over the
+    SOCIAL_COLUMNS, the same layout the Excel export has always used.
+
+    Args:
+        result (dict): Result for one URL
+
+    Returns:
+        list: Cell values in RESULT_COLUMNS + SOCIAL_COLUMNS order
+    """
+    row = []
+    for column in RESULT_COLUMNS:
+        value = result.get(column, '')
+        if isinstance(value, list):
+            value = ', '.join(map(str, value))
+        elif column in JSON_COLUMNS:
+            value = json.dumps(value, default=str) if value else ''
+        row.append('' if value is None else value)
+
+    social = result.get('social_media') or {}
+    row.extend(social.get(platform, '') for platform in SOCIAL_COLUMNS)
+    return row
+
+
+def parquet_available():
+    """Return True if pyarrow is installed and results can be stored as Parquet."""
+    return pq is not None
+
+
+def _parquet_schema():
+    """Arrow schema of the Parquet result file."""
+    fields = []
+    for column in RESULT_COLUMNS + SOCIAL_COLUMNS:
+        if column in LIST_COLUMNS:
+            fields.append(pa.field(column, pa.list_(pa.string())))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def _columnar_row(result):
+    """Turn a result dict into one Parquet row, keeping emails and phones as lists."""
+    row = {}
+    for column in RESULT_COLUMNS:
+        value = result.get(column)
+        if column in LIST_COLUMNS:
+            row[column] = [str(item) for item in value] if isinstance(value, list) else []
+        elif column in JSON_COLUMNS:
+            row[column] = json.dumps(value, default=str) if value else None
+        else:
+            row[column] = '' if value is None else str(value)
+
+    social = result.get('social_media') or {}
+    for platform in SOCIAL_COLUMNS:
+        row[platform] = social.get(platform) or None
+    return row
+
+
+class _ExcelSheet:
+    """Write-only Excel sheet, using xlsxwriter if installed and openpyxl otherwise."""
+
+    def __init__(self, path, header):
+        self.path = path
+        self._rows = 0
+        if xlsxwriter is not None:
+            self._workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+            self._sheet = self._workbook.add_worksheet()
+            self._sheet.write_row(0, 0, header)
+        elif Workbook is not None:
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet()
+            self._sheet.append(header)
+        else:
+            raise RuntimeError("xlsxwriter or openpyxl is required to write results")
+
+    def append(self, row):
+        self._rows += 1
+        if xlsxwriter is not None:
+            self._sheet.write_row(self._rows, 0, row)
+        else:
+            self._sheet.append(row)
+
+    def close(self):
+        if xlsxwriter is not None:
+            self._workbook.close()
+        else:
+            self._workbook.save(self.path)
+
+
+class StreamingResultWriter:
+    """
+    Append scrape results to disk as each URL finishes.
+
+    Results are stored in a Parquet file, one row group per
+    PARQUET_ROW_GROUP_SIZE results, so readers can load just the columns and
+    rows they need. Without pyarrow the Excel file is the main file instead,
+    written row by row in constant memory. CSV, JSON Lines and Excel copies
+    can be written alongside.
+    """
+
+    def __init__(self, base_path, extra_formats=None):
+        """
+        Open the result files.
+
+        Args:
+            base_path (str): Path without extension, e.g. results/scrape_results_<timestamp>
+            extra_formats (list): Any of EXTRA_FORMATS to write next to the main file
+        """
+        self.format = 'parquet' if parquet_available() else 'xlsx'
+        self.result_path = f"{base_path}.{self.format}"
+        self.paths = {self.format: self.result_path}
+        self.rows_written = 0
+        header = RESULT_COLUMNS + SOCIAL_COLUMNS
+
+        directory = os.path.dirname(base_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._parquet = None
+        self._row_group = []
+        if self.format == 'parquet':
+            self._parquet = pq.ParquetWriter(self.result_path, _parquet_schema())
+
+        self._excel = None
+        self._csv_file = None
+        self._csv = None
+        self._jsonl_file = None
+        formats = [self.format] + [entry for entry in extra_formats or [] if entry != self.format]
+        for extra_format in formats:
+            path = f"{base_path}.{extra_format}"
+            if extra_format == 'parquet':
+                continue
+            elif extra_format == 'xlsx':
+                self._excel = _ExcelSheet(path, header)
+            elif extra_format == 'csv':
+                self._csv_file = open(path, 'w', newline='', encoding='utf-8')
+                self._csv = csv.writer(self._csv_file)
+                self._csv.writerow(header)
+            elif extra_format == 'jsonl':
+                self._jsonl_file = open(path, 'w', encoding='utf-8')
+            else:
+                logger.warning(f"Unknown result format '{extra_format}', skipping")
+                continue
+            self.paths[extra_format] = path
+
+    @property
+    def xlsx_path(self):
+        """Path of the Excel file if one is being written, else None."""
+        return self.paths.get('xlsx')
+
+    def write(self, result):
+        """Append one result to every open file."""
+        self.rows_written += 1
+
+        if self._parquet is not None:
+            self._row_group.append(_columnar_row(result))
+            if len(self._row_group) >= PARQUET_ROW_GROUP_SIZE:
+                self._flush_row_group()
+
+        if self._excel or self._csv:
+            row = flatten_result(result)
+            if self._excel:
+                self._excel.append(row)
+            # CSV and JSONL are flushed per row so they survive a crash
+            if self._csv:
+                self._csv.writerow(row)
+                self._csv_file.flush()
+        if self._jsonl_file:
+            self._jsonl_file.write(json.dumps(result, default=str) + '\n')
+            self._jsonl_file.flush()
+
+    def _flush_row_group(self):
+        if self._row_group:
+            self._parquet.write_table(pa.Table.from_pylist(self._row_group, schema=self._parquet.schema))
+            self._row_group = []
+
+    def close(self):
+        """Finish the Parquet and Excel files and close the others."""
+        if self._parquet is not None:
+            self._flush_row_group()
+            self._parquet.close()
+        if self._excel:
+            self._excel.close()
+
+        for handle in (self._csv_file, self._jsonl_file):
+            if handle:
+                handle.close()
+
+        logger.info(f"Wrote {self.rows_written} results to {', '.join(self.paths.values())}")
+
+
+def _result_columns(columns):
+    """Map requested result fields to file columns; 'social_media' covers every platform."""
+    if columns is None:
+        return RESULT_COLUMNS + SOCIAL_COLUMNS
+    file_columns = []
+    for column in columns:
+        if column == 'social_media':
+            file_columns.extend(SOCIAL_COLUMNS)
+        elif column in RESULT_COLUMNS or column in SOCIAL_COLUMNS:
+            file_columns.append(column)
+    return file_columns
+
+
+def _to_result(record, columns):
+    """Rebuild a result dict from a file row."""
+    result = {}
+    social = {}
+    for column in columns:
+        value = record.get(column)
+        if column in SOCIAL_COLUMNS:
+            if value:
+                social[column] = value
+        elif column in LIST_COLUMNS:
+            if isinstance(value, str):
+                value = value.split(', ') if value else []
+            result[column] = list(value or [])
+        elif column in JSON_COLUMNS:
+            result[column] = json.loads(value) if value else {}
+        else:
+            result[column] = '' if value is None else value
+    if any(column in SOCIAL_COLUMNS for column in columns):
+        result['social_media'] = social
+    return result
+
+
+def _iter_parquet(path, columns, offset, limit):
+    parquet_file = pq.ParquetFile(path)
+    # Files from older versions lack the columns added since
+    columns = [column for column in columns if column in parquet_file.schema_arrow.names]
+    end = None if limit is None else offset + limit
+    start_row = 0
+    for index in range(parquet_file.num_row_groups):
+        group_rows = parquet_file.metadata.row_group(index).num_rows
+        group_end = start_row + group_rows
+        # Only read the row groups that overlap the requested range
+        if group_end > offset and (end is None or start_row < end):
+            table = parquet_file.read_row_group(index, columns=columns)
+            first = max(offset - start_row, 0)
+            last = group_rows if end is None else min(end - start_row, group_rows)
+            yield from table.slice(first, last - first).to_pylist()
+        start_row = group_end
+        if end is not None and start_row >= end:
+            break
+
+
+def _iter_xlsx(path, columns, offset, limit):
+    if load_workbook is None:
+        raise RuntimeError("openpyxl is required to read Excel results")
+    workbook = load_workbook(path, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        positions = [(column, header.index(column)) for column in columns if column in header]
+        for position, row in enumerate(rows):
+            if position < offset:
+                continue
+            if limit is not None and position >= offset + limit:
+                break
+            yield {column: row[i] if i < len(row) else None for column, i in positions}
+    finally:
+        workbook.close()
+
+
+def iter_results(path, columns=None, offset=0, limit=None):
+    """
+    Read results back from a result file.
+
+    Parquet files are read one row group at a time and only for the requested
+    columns; Excel files from older jobs are read row by row.
+
+    Args:
+        path (str): .parquet or .xlsx result file
+        columns (list): Result fields to load, e.g. ['url', 'emails', 'social_media'];
+            None loads everything
+        offset (int): Results to skip
+        limit (int): Maximum number of results, None for all
+
+    Returns:
+        generator: Result dicts with emails and phones as lists and social
+                   profiles under 'social_media'
+    """
+    file_columns = _result_columns(columns)
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise RuntimeError("pyarrow is required to read Parquet results")
+        records = _iter_parquet(path, file_columns, offset, limit)
+    else:
+        records = _iter_xlsx(path, file_columns, offset, limit)
+
+    for record in records:
+        yield _to_result(record, file_columns)
+
+
+def read_results(path, columns=None, offset=0, limit=None):
+    """Return a list of results from a result file, see iter_results."""
+    return list(iter_results(path, columns=columns, offset=offset, limit=limit))
+
+
+def count_results(path):
+    """Return the number of results in a result file without reading them."""
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise RuntimeError("pyarrow is required to read Parquet results")
+        return pq.ParquetFile(path).metadata.num_rows
+    if load_workbook is None:
+        raise RuntimeError("openpyxl is required to read Excel results")
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return max(workbook.active.max_row - 1, 0)
+    finally:
+        workbook.close()
+
+
+def export_xlsx(path):
+    """
+    Return an Excel copy of a result file, writing it on first use.
+
+    Args:
+        path (str): .parquet or .xlsx result file
+
+    Returns:
+        str: Path of the .xlsx file
+    """
+    if path.endswith('.xlsx'):
+        return path
+
+    xlsx_path = f"{os.path.splitext(path)[0]}.xlsx"
+    if os.path.exists(xlsx_path) and os.path.getmtime(xlsx_path) >= os.path.getmtime(path):
+        return xlsx_path
+
+    # Write to a unique temporary name so a concurrent download never sees half a file
+    fd, partial_path = tempfile.mkstemp(dir=os.path.dirname(xlsx_path), prefix=os.path.basename(xlsx_path) + '.',
+                                        suffix='.partial')
+    os.close(fd)
+    try:
+        sheet = _ExcelSheet(partial_path, RESULT_COLUMNS + SOCIAL_COLUMNS)
+        for result in iter_results(path):
+            sheet.append(flatten_result(result))
+        sheet.close()
+        os.replace(partial_path, xlsx_path)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    logger.info(f"Exported {path} to {xlsx_path}")
+    return xlsx_path
@@ -0,0 +1,267 @@
+import json
+import logging
+import threading
+import time
+import urllib.parse
+import urllib.robotparser
+
+from cache_store import get_cache_store
+from http_pool import get_pool
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Name matched against robots.txt User-agent lines; '*' rules apply otherwise
+ROBOTS_USER_AGENT = 'ContactHarvesterPro'
+
+# Cache store namespace for robots.txt entries
+NAMESPACE = 'robots'
+
+
+class RobotsDisallowed(Exception):
+    """Raised for a URL its site's robots.txt does not let us fetch."""
+
+    def __init__(self, url):
+        super().__init__(f"Blocked by robots.txt: {url}")
+        self.url = url
+
+
+def origin(url):
+    """Return scheme://host[:port] for a URL, adding https:// to bare domains."""
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    parts = urllib.parse.urlparse(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+def robots_url(url):
+    """Return the robots.txt URL for the site a URL belongs to."""
+    return origin(url) + '/robots.txt'
+
+
+class RobotsRules:
+    """The robots.txt rules of one site, as they apply to us."""
+
+    def __init__(self, text='', user_agent=ROBOTS_USER_AGENT):
+        """
+        Parse robots.txt contents.
+
+        Args:
+            text (str): robots.txt contents, empty allows everything
+            user_agent (str): Our robots.txt user agent name
+        """
+        self.user_agent = user_agent
+        self._parser = urllib.robotparser.RobotFileParser()
+        self._parser.parse(text.splitlines())
+
+    def allowed(self, url):
+        """Return True if robots.txt lets us fetch the URL."""
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        return self._parser.can_fetch(self.user_agent, url)
+
+    @property
+    def crawl_delay(self):
+        """
+        Seconds robots.txt asks for between requests, or None.
+
+        Parsing follows urllib.robotparser, which only accepts whole seconds.
+        """
+        try:
+            delay = self._parser.crawl_delay(self.user_agent)
+        except (TypeError, ValueError):
+            return None
+        return float(delay) if delay is not None else None
+
+
+def parse_crawl_delay(robots_text, user_agent=ROBOTS_USER_AGENT):
+    """
+    Read the Crawl-delay that applies to us from a robots.txt file.
+
+    Args:
+        robots_text (str): robots.txt contents
+        user_agent (str): Our robots.txt user agent name
+
+    Returns:
+        float: Seconds between requests, or None if the file sets no delay
+    """
+    return RobotsRules(robots_text, user_agent).crawl_delay
+
+
+# Rules used when robots.txt is not checked at all
+ALLOW_ALL = RobotsRules()
+
+# robots.txt assumed for a site whose robots.txt gave a server error or could not be reached
+DISALLOW_ALL_TEXT = 'User-agent: *\nDisallow: /'
+
+
+class RobotsCache:
+    """
+    robots.txt rules per site, fetched once and reused across jobs.
+
+    Rules are kept in memory and in the shared cache store, so other worker
+    processes and later jobs don't request robots.txt again. A robots.txt
+    that was read is kept for ttl seconds. Following RFC 9309, a missing one
+    (4xx) allows everything, while a server error (5xx) or an unreachable
+    site disallows everything. Both are cached for the shorter negative_ttl,
+    so a failing site is not asked again for every URL but is retried soon.
+    """
+
+    def __init__(self, enabled=True, ttl=86400, negative_ttl=3600, store=None, timeout=15):
+        """
+        Initialize the cache.
+
+        Args:
+            enabled (bool): False allows every URL without fetching robots.txt
+            ttl (int): Seconds a fetched robots.txt is reused
+            negative_ttl (int): Seconds a missing or unreadable robots.txt is reused
+            store (CacheStore): Persistent store, defaults to the shared one
+            timeout (int): robots.txt request timeout in seconds
+        """
+        self.enabled = enabled
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.store = store or get_cache_store()
+        self.timeout = timeout
+        self._rules = {}  # origin -> (RobotsRules, expires_at)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._fetches = 0
+
+    def cached(self, url):
+        """
+        Return the cached rules for a URL's site without fetching.
+
+        Returns:
+            RobotsRules: The rules, or None if robots.txt has to be fetched
+        """
+        if not self.enabled:
+            return ALLOW_ALL
+
+        key = origin(url)
+        now = time.time()
+        with self._lock:
+            entry = self._rules.get(key)
+        if entry is not None and entry[1] > now:
+            with self._lock:
+                self._hits += 1
+            return entry[0]
+
+        row = self.store.get(NAMESPACE, key)
+        if row is None or row[1] <= now:
+            return None
+        rules = RobotsRules(json.loads(row[0])['text'])
+        with self._lock:
+            self._rules[key] = (rules, row[1])
+            self._hits += 1
+        return rules
+
+    def save(self, url, status, text=''):
+        """
+        Store the outcome of a robots.txt request.
+
+        Args:
+            url (str): Any URL of the site
+            status (int): HTTP status, None if the request failed
+            text (str): Response body
+
+        Returns:
+            RobotsRules: The rules now in effect for the site
+        """
+        if status is not None and status < 400:
+            ttl = self.ttl
+        elif status is not None and status < 500:
+            # robots.txt is unavailable, nothing is restricted
+            text, ttl = '', self.negative_ttl
+        else:
+            # robots.txt is unreachable, assume the whole site is off limits until we can read it
+            text, ttl = DISALLOW_ALL_TEXT, self.negative_ttl
+        rules = RobotsRules(text)
+        key = origin(url)
+        try:
+            self.store.set(NAMESPACE, key, json.dumps({'status': status, 'text': text}), ttl)
+        except Exception as e:
+            logger.warning(f"Could not save robots.txt for {key}: {str(e)}")
+        with self._lock:
+            self._rules[key] = (rules, time.time() + ttl)
+            self._fetches += 1
+        return rules
+
+    def fetch(self, url):
+        """
+        Return the rules for a URL's site, requesting robots.txt on a cache miss.
+
+        Uses the shared HTTP pool, so call it from a thread, not an event loop.
+        """
+        rules = self.cached(url)
+        if rules is not None:
+            return rules
+        try:
+            response = get_pool().get(robots_url(url), timeout=self.timeout)
+            return self.save(url, response.status_code, response.text)
+        except Exception as e:
+            logger.debug(f"Could not read robots.txt for {origin(url)}: {str(e)}")
+            return self.save(url, None)
+
+    async def fetch_async(self, session, url):
+        """Like fetch(), but requests robots.txt with an aiohttp session."""
+        rules = self.cached(url)
+        if rules is not None:
+            return rules
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with session.get(robots_url(url), timeout=timeout) as response:
+                body = await response.read()
+                text = body.decode(response.charset or 'utf-8', errors='replace')
+                return self.save(url, response.status, text)
+        except Exception as e:
+            logger.debug(f"Could not read robots.txt for {origin(url)}: {str(e)}")
+            return self.save(url, None)
+
+    def allowed(self, url):
+        """
+        Return True unless the cached rules disallow the URL.
+
+        Never fetches, so a site whose robots.txt wasn't read yet is allowed;
+        use host_scheduler.read_robots() to read it first.
+        """
+        rules = self.cached(url)
+        return rules is None or rules.allowed(url)
+
+    def stats(self):
+        """Return cache counters for monitoring."""
+        with self._lock:
+            stats = {
+                'enabled': self.enabled,
+                'sites_in_memory': len(self._rules),
+                'hits': self._hits,
+                'fetches': self._fetches
+            }
+        stats.update(self.store.stats(NAMESPACE))
+        return stats
+
+
+_robots_cache = None
+_robots_cache_lock = threading.Lock()
+
+
+def configure_robots_cache(enabled=True, ttl=86400, negative_ttl=3600, store=None):
+    """Replace the shared robots.txt cache with one using the given settings."""
+    global _robots_cache
+    with _robots_cache_lock:
+        _robots_cache = RobotsCache(enabled=enabled, ttl=ttl, negative_ttl=negative_ttl, store=store)
+        return _robots_cache
+
+
+def get_robots_cache():
+    """Return the shared robots.txt cache, creating it with default settings on first use."""
+    global _robots_cache
+    with _robots_cache_lock:
+        if _robots_cache is None:
+            _robots_cache = RobotsCache()
+        return _robots_cache
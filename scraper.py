@@ -1,4 +1,3 @@
-import re
 import concurrent.futures
 import pandas as pd
 from selenium import webdriver
@@ -9,23 +8,173 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from bs4 import BeautifulSoup
 import time
 import logging
 import urllib.parse
 import requests
 from tqdm import tqdm
+from extraction import extract, find_image_emails, find_mailto_links
+from page_parser import parse_page
+from parse_pool import parse_contact_page
+from host_scheduler import interleave, polite_slot, read_robots
+from robots_cache import RobotsDisallowed
+from fetch_strategy import BROWSER_CONTACT_KEYWORDS
 import os
 import sys
 import platform
+import queue
+import threading
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Subresources that never affect driver.page_source, blocked through CDP Network.setBlockedURLs
+BLOCKED_RESOURCE_PATTERNS = [
+    # Images
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp',
+    # Fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Stylesheets
+    '*.css',
+    # Media
+    '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav', '*.m4a', '*.mov', '*.avi', '*.m3u8',
+]
+
+# Analytics and ad hosts
+BLOCKED_TRACKER_PATTERNS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*googleadservices.com*', '*adservice.google.*',
+    '*connect.facebook.net*', '*hotjar.com*', '*clarity.ms*', '*segment.io*',
+    '*cdn.segment.com*', '*mixpanel.com*', '*scorecardresearch.com*', '*quantserve.com*',
+    '*adnxs.com*', '*taboola.com*', '*outbrain.com*', '*criteo.com*', '*amazon-adsystem.com*',
+]
+
+def remember_origin(driver, url):
+    """Record the origin of a page a driver loaded, so DriverPool can clear its storage."""
+    parts = urllib.parse.urlsplit(url or '')
+    if parts.scheme in ('http', 'https') and parts.netloc:
+        origins = getattr(driver, '_visited_origins', None)
+        if origins is None:
+            origins = driver._visited_origins = set()
+        origins.add(f"{parts.scheme}://{parts.netloc.lower()}")
+
+
+class DriverPool:
+    """
+    Bounded pool of warm Chrome WebDriver instances.
+    
+    Workers lease a driver, use it for one site and hand it back. Returned
+    drivers are wiped (all cookies, the HTTP cache and the storage of every
+    origin loaded during the lease, then about:blank) so no state leaks
+    between sites, and are replaced after max_pages navigations or when they
+    stop responding.
+    """
+    
+    def __init__(self, factory, size, max_pages=50):
+        """
+        Initialize the driver pool.
+        
+        Args:
+            factory (function): Creates a new WebDriver
+            size (int): Maximum number of live drivers
+            max_pages (int): Page loads after which a driver is recycled
+        """
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pages = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.recycled = 0
+    
+    def acquire(self):
+        """Lease a driver, starting a new one only if no warm driver is idle."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        try:
+            driver = self.factory()
+        except Exception:
+            self._slots.release()
+            raise
+        
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self.created += 1
+        return driver
+    
+    def release(self, driver, pages=1, broken=False):
+        """
+        Return a leased driver to the pool.
+        
+        Args:
+            driver: WebDriver from acquire()
+            pages (int): Number of page loads done during the lease
+            broken (bool): Discard the driver instead of reusing it
+        """
+        try:
+            with self._lock:
+                used = self._pages.get(id(driver), 0) + pages
+                self._pages[id(driver)] = used
+            
+            if broken or used >= self.max_pages or not self._reset(driver):
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+    
+    def _reset(self, driver):
+        """Clear browsing state so the next site starts clean. Returns False if the driver is unusable."""
+        try:
+            # WebDriver's delete_all_cookies() only reaches the current domain
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            # Storage can only be cleared per origin, so clear each one the lease loaded
+            for origin in sorted(getattr(driver, '_visited_origins', None) or ()):
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            driver._visited_origins = set()
+            driver.get('about:blank')
+            return True
+        except Exception as e:
+            logger.warning(f"Driver reset failed, recycling it: {str(e)}")
+            return False
+    
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self.recycled += 1
+        try:
+            driver.quit()
+        except Exception as quit_error:
+            logger.warning(f"Error closing driver: {str(quit_error)}")
+    
+    def close(self):
+        """Quit every idle driver."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._pages.pop(id(driver), None)
+            try:
+                driver.quit()
+            except Exception as quit_error:
+                logger.warning(f"Error closing driver: {str(quit_error)}")
+
+
 class ContactScraper:
-    def __init__(self, max_workers=5, timeout=20, headless=True):
+    def __init__(self, max_workers=5, timeout=20, headless=True, max_pages_per_driver=50,
+                 block_resources=True, resource_allowlist=None, scheduler=None, robots=None,
+                 extraction_cache=None):
         """
         Initialize the Contact Scraper.
         
@@ -33,11 +182,37 @@ class ContactScraper:
             max_workers (int): Maximum number of concurrent workers
             timeout (int): Page load timeout in seconds
             headless (bool): Whether to run browser in headless mode
+            max_pages_per_driver (int): Page loads before a pooled browser is restarted
+            block_resources (bool): Skip images, fonts, CSS, media and trackers
+            resource_allowlist (list): Entries exempt from blocking. A blocked
+                pattern (e.g. '*.css') is removed from the block list; any other
+                entry is a host (e.g. 'example.com') whose pages load everything
+            scheduler (HostScheduler): Per-host concurrency and delay limits,
+                None waits a fixed second after each contact page instead
+            robots (RobotsCache): robots.txt rules to obey, None loads every page
+            extraction_cache (ExtractionCache): Reuses extraction results for
+                identical rendered pages, None extracts every page
         """
         self.max_workers = max_workers
         self.timeout = timeout
         self.headless = headless
+        self.max_pages_per_driver = max_pages_per_driver
+        self.block_resources = block_resources
+        self.scheduler = scheduler
+        self.robots = robots
+        self.extraction_cache = extraction_cache
+        
+        allowlist = [entry.lower() for entry in (resource_allowlist or [])]
+        self.blocked_patterns = [
+            pattern for pattern in BLOCKED_RESOURCE_PATTERNS + BLOCKED_TRACKER_PATTERNS
+            if pattern not in allowlist
+        ]
+        self.allowed_hosts = [entry for entry in allowlist if not entry.startswith('*')]
+        self.driver_pool = None
         self.results = []
+    
+    # Chromedriver path from ChromeDriverManager, shared by every scraper in the process
+    _driver_path = None
         
     def setup_driver(self):
         """Set up and configure the Chrome WebDriver."""
@@ -62,172 +237,76 @@ class ContactScraper:
             # Set user agent to mimic real browser
             chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36')
             
+            # We only read page_source, so don't download images or ask for notifications/media
+            if self.block_resources:
+                chrome_options.add_experimental_option('prefs', {
+                    'profile.managed_default_content_settings.images': 2,
+                    'profile.default_content_setting_values.notifications': 2,
+                    'profile.default_content_setting_values.media_stream': 2,
+                    'profile.managed_default_content_settings.plugins': 2,
+                })
+            
             # Create driver with configured options - modern approach without Service
             # This should work better on Windows 10
-            try:
-                logger.info("Attempting to create Chrome WebDriver directly")
-                driver = webdriver.Chrome(options=chrome_options)
-            except Exception as e:
-                logger.warning(f"Direct WebDriver initialization failed: {str(e)}")
-                logger.info("Falling back to ChromeDriverManager path")
-                
-                # Fallback to ChromeDriverManager
-                driver_path = ChromeDriverManager().install()
-                service = Service(driver_path)
-                driver = webdriver.Chrome(service=service, options=chrome_options)
+            if ContactScraper._driver_path:
+                # ChromeDriverManager already resolved a driver, skip the direct attempt
+                driver = webdriver.Chrome(service=Service(ContactScraper._driver_path), options=chrome_options)
+            else:
+                try:
+                    logger.info("Attempting to create Chrome WebDriver directly")
+                    driver = webdriver.Chrome(options=chrome_options)
+                except Exception as e:
+                    logger.warning(f"Direct WebDriver initialization failed: {str(e)}")
+                    logger.info("Falling back to ChromeDriverManager path")
+                    
+                    # Fallback to ChromeDriverManager, resolved once per process
+                    ContactScraper._driver_path = ChromeDriverManager().install()
+                    service = Service(ContactScraper._driver_path)
+                    driver = webdriver.Chrome(service=service, options=chrome_options)
             
             driver.set_page_load_timeout(self.timeout)
             
             # Add undetectable properties to the navigator object
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
+            if self.block_resources:
+                try:
+                    driver.execute_cdp_cmd('Network.enable', {})
+                except Exception as e:
+                    logger.warning(f"CDP unavailable, only Chrome preferences block resources: {str(e)}")
+            
             return driver
             
         except Exception as e:
             logger.error(f"Failed to set up Chrome driver: {str(e)}")
             raise
 
-    def extract_emails(self, text):
-        """
-        Extract email addresses from text using advanced pattern matching.
-        
-        Args:
-            text (str): Text to extract emails from
-            
-        Returns:
-            list: List of unique email addresses
+    def apply_resource_blocking(self, driver, url):
         """
-        # Advanced email regex - handles various email formats
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+        Set the CDP blocked URL patterns for the next navigation.
         
-        # Find all emails using standard pattern
-        emails = re.findall(email_pattern, text)
-        
-        # Set for faster duplicate checking
-        filtered_emails = set()
-        
-        for email in emails:
-            # Skip emails with invalid TLDs or likely false positives
-            if any(invalid in email.lower() for invalid in ['@example.', '@domain.', '@email.']):
-                continue
-                
-            # Skip emails with suspicious patterns
-            if '..' in email or '@.' in email or '.@' in email:
-                continue
-                
-            # Normalized email
-            filtered_emails.add(email.lower())
-        
-        # Additional patterns for protected emails
-        
-        # Pattern for emails with "at" and "dot" text encoding
-        encoded_pattern = r'([a-zA-Z0-9._%+-]+)[\s]*(?:\[at\]|@|[\(\[\{]at[\)\]\}]|&#64;|%40)[\s]*([a-zA-Z0-9.-]+)[\s]*(?:\[dot\]|\.|\(dot\)|\[dot\]|&#46;|%2E)[\s]*([a-zA-Z]{2,})'
-        encoded_matches = re.finditer(encoded_pattern, text, re.IGNORECASE)
-        for match in encoded_matches:
-            if match.group(1) and match.group(2) and match.group(3):
-                email = f"{match.group(1).strip()}@{match.group(2).strip()}.{match.group(3).strip()}"
-                filtered_emails.add(email.lower())
-        
-        # Pattern for JavaScript obfuscated emails (common pattern using concatenation)
-        js_pattern = r'document\.write\([\'"]([a-zA-Z0-9._%+-]+)[\'"][\s]*\+[\s]*[\'"]@[\'"][\s]*\+[\s]*[\'"]([a-zA-Z0-9.-]+)[\s]*[\'"][\s]*\+[\s]*[\'"]\.[\'"][\s]*\+[\s]*[\'"]([a-zA-Z]{2,})[\'"]'
-        js_matches = re.finditer(js_pattern, text)
-        for match in js_matches:
-            if match.group(1) and match.group(2) and match.group(3):
-                email = f"{match.group(1)}@{match.group(2)}.{match.group(3)}"
-                filtered_emails.add(email.lower())
-        
-        # Pattern for HTML entity encoded emails (like &#64; for @ and &#46; for .)
-        html_entity_pattern = r'([a-zA-Z0-9._%+-]+)(?:&#64;|&#0*64;|%40)([a-zA-Z0-9.-]+)(?:&#46;|&#0*46;|%2E)([a-zA-Z]{2,})'
-        entity_matches = re.finditer(html_entity_pattern, text)
-        for match in entity_matches:
-            if match.group(1) and match.group(2) and match.group(3):
-                email = f"{match.group(1)}@{match.group(2)}.{match.group(3)}"
-                filtered_emails.add(email.lower())
-        
-        # Pattern for separated email parts with CSS display tricks
-        # This is a simplified version, as real CSS tricks can be very complex
-        css_pattern = r'<span[^>]*data-user=["\']([^"\']+)["\'][^>]*>.*?</span>.*?<span[^>]*data-domain=["\']([^"\']+)["\'][^>]*>.*?</span>'
-        css_matches = re.finditer(css_pattern, text)
-        for match in css_matches:
-            if match.group(1) and match.group(2):
-                email = f"{match.group(1)}@{match.group(2)}"
-                filtered_emails.add(email.lower())
-                
-        # Pattern for unicode obfuscation (where @ is replaced by \u0040 and . by \u002E)
-        unicode_pattern = r'([a-zA-Z0-9._%+-]+)(?:\\u0*40|\\x40)([a-zA-Z0-9.-]+)(?:\\u0*2e|\\x2e)([a-zA-Z]{2,})'
-        unicode_matches = re.finditer(unicode_pattern, text)
-        for match in unicode_matches:
-            if match.group(1) and match.group(2) and match.group(3):
-                email = f"{match.group(1)}@{match.group(2)}.{match.group(3)}"
-                filtered_emails.add(email.lower())
-                
-        return list(filtered_emails)
-
-    def extract_phones(self, text):
-        """
-        Extract phone numbers from text using advanced pattern matching.
+        Pages on an allowlisted host load every subresource. The last applied
+        list is remembered on the driver so the CDP call only happens when it
+        changes.
         
         Args:
-            text (str): Text to extract phone numbers from
-            
-        Returns:
-            list: List of unique phone numbers
-        """
-        # International format: +1-123-456-7890, +1 (123) 456-7890, etc.
-        international_pattern = r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        
-        # US format without country code: (123) 456-7890, 123-456-7890, 123.456.7890, etc.
-        us_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        
-        # Extract phone numbers
-        phones = re.findall(international_pattern, text)
-        phones.extend(re.findall(us_pattern, text))
-        
-        # Clean and normalize phone numbers
-        normalized_phones = []
-        for phone in phones:
-            # Remove non-digits
-            digits_only = re.sub(r'\D', '', phone)
-            
-            # Skip if too short or too long
-            if len(digits_only) < 10 or len(digits_only) > 15:
-                continue
-                
-            # Add to results
-            normalized_phones.append(phone)
-            
-        return list(set(normalized_phones))
-
-    def extract_social_media(self, text):
+            driver: Selenium WebDriver
+            url (str): URL about to be loaded
         """
-        Extract social media links from text.
+        if not self.block_resources:
+            return
         
-        Args:
-            text (str): Text to extract social media links from
-            
-        Returns:
-            dict: Dictionary of social media platforms and their URLs
-        """
-        social_patterns = {
-            'linkedin': r'(?:https?:\/\/)?(?:www\.)?linkedin\.com\/(?:in|company)\/[a-zA-Z0-9_-]+\/?',
-            'twitter': r'(?:https?:\/\/)?(?:www\.)?(?:twitter\.com|x\.com)\/[a-zA-Z0-9_-]+\/?',
-            'facebook': r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/(?:profile\.php\?id=\d+|[a-zA-Z0-9._-]+)\/?',
-            'instagram': r'(?:https?:\/\/)?(?:www\.)?instagram\.com\/[a-zA-Z0-9._-]+\/?',
-            'youtube': r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/(?:channel|user)\/[a-zA-Z0-9_-]+\/?',
-            'github': r'(?:https?:\/\/)?(?:www\.)?github\.com\/[a-zA-Z0-9_-]+\/?',
-        }
+        host = urllib.parse.urlparse(url).netloc.lower()
+        allowed = any(host == entry or host.endswith('.' + entry) for entry in self.allowed_hosts)
+        patterns = [] if allowed else self.blocked_patterns
         
-        social_profiles = {}
-        for platform, pattern in social_patterns.items():
-            matches = re.findall(pattern, text)
-            if matches:
-                # Add https:// if not present
-                url = matches[0]
-                if not url.startswith('http'):
-                    url = 'https://' + url.lstrip('/')
-                social_profiles[platform] = url
-                
-        return social_profiles
+        if getattr(driver, '_blocked_url_patterns', None) == patterns:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            driver._blocked_url_patterns = patterns
+        except Exception as e:
+            logger.warning(f"Could not set blocked URLs: {str(e)}")
 
     def safe_get(self, driver, url, timeout=20):
         """
@@ -242,7 +321,11 @@ class ContactScraper:
             bool: True if successful, False otherwise
         """
         try:
+            self.apply_resource_blocking(driver, url)
+            remember_origin(driver, url)
             driver.get(url)
+            # Redirects can end on another origin, whose storage needs clearing too
+            remember_origin(driver, driver.current_url)
             # Use a shorter timeout for better performance
             WebDriverWait(driver, timeout).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
@@ -252,6 +335,7 @@ class ContactScraper:
             logger.warning(f"Timeout loading URL: {url}")
             # Try to continue even if timeout - sometimes we can still get content
             try:
+                remember_origin(driver, driver.current_url)
                 # If we get some content, consider it a partial success
                 if driver.page_source and len(driver.page_source) > 500:
                     logger.info(f"Got partial content for {url} despite timeout")
@@ -266,166 +350,73 @@ class ContactScraper:
             logger.error(f"Unexpected error loading URL {url}: {str(e)}")
             return False
     
-    def decode_cloudflare_email(self, encoded_email):
-        """
-        Decode Cloudflare protected emails.
-        
-        Cloudflare email protection uses a JavaScript function to decode emails like:
-        <a href="/cdn-cgi/l/email-protection#1234567890" data-cfemail="1234567890">Protected Email</a>
-        
-        Args:
-            encoded_email (str): The hex encoded email string
-            
-        Returns:
-            str: Decoded email address or None if decoding fails
-        """
-        try:
-            # Cloudflare encoding uses a simple XOR cipher with the first character as the key
-            decoded = ""
-            
-            # Convert hex to bytes
-            hex_encoded = bytes.fromhex(encoded_email)
-            
-            # First byte is the key
-            key = hex_encoded[0]
-            
-            # Decode each byte with XOR
-            for i in range(1, len(hex_encoded)):
-                decoded += chr(hex_encoded[i] ^ key)
-            
-            return decoded
-        except Exception as e:
-            logger.warning(f"Failed to decode Cloudflare email: {str(e)}")
-            return None
-
-    def find_cloudflare_emails(self, html):
-        """
-        Find Cloudflare protected emails in HTML content.
-        
-        Args:
-            html (str): HTML content
-            
-        Returns:
-            list: List of decoded email addresses
-        """
-        # Look for Cloudflare protected email patterns
-        cf_pattern = r'<a[^>]*href="/cdn-cgi/l/email-protection#([a-zA-Z0-9]+)"[^>]*>.*?</a>'
-        cf_data_pattern = r'<a[^>]*data-cfemail="([a-zA-Z0-9]+)"[^>]*>.*?</a>'
-        
-        emails = []
-        
-        # Find emails with href pattern
-        for match in re.finditer(cf_pattern, html, re.IGNORECASE):
-            encoded = match.group(1)
-            decoded = self.decode_cloudflare_email(encoded)
-            if decoded and '@' in decoded:
-                emails.append(decoded.lower())
-        
-        # Find emails with data-cfemail pattern
-        for match in re.finditer(cf_data_pattern, html, re.IGNORECASE):
-            encoded = match.group(1)
-            decoded = self.decode_cloudflare_email(encoded)
-            if decoded and '@' in decoded:
-                emails.append(decoded.lower())
-        
-        return list(set(emails))
-
-    def find_contact_links(self, soup, base_url):
+    def find_contact_links(self, page, base_url):
         """
         Find contact page links in the website.
         
         Args:
-            soup: BeautifulSoup object
+            page (ParsedPage): Parsed page from page_parser.parse_page
             base_url (str): Base URL of the website
             
         Returns:
             list: List of contact page URLs
         """
-        contact_keywords = ['contact', 'kontakt', 'contacto', 'about', 'about us', 'get in touch', 'support']
         contact_links = []
         
         # Find all links
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            link_text = link.get_text().lower()
+        for href, link_text in page.links:
+            link_text = link_text.lower()
             
             # Skip if empty href or javascript
             if not href or href.startswith('javascript:') or href == '#':
                 continue
                 
             # Check if link text contains contact keywords
-            if any(keyword in link_text for keyword in contact_keywords):
+            if any(keyword in link_text for keyword in BROWSER_CONTACT_KEYWORDS):
                 # Handle relative URLs
                 if not href.startswith(('http://', 'https://')):
                     href = urllib.parse.urljoin(base_url, href)
                 contact_links.append(href)
                 
             # Also check href itself for contact keywords
-            elif any(keyword in href.lower() for keyword in contact_keywords):
+            elif any(keyword in href.lower() for keyword in BROWSER_CONTACT_KEYWORDS):
                 if not href.startswith(('http://', 'https://')):
                     href = urllib.parse.urljoin(base_url, href)
                 contact_links.append(href)
                 
         return list(set(contact_links))
 
-    def find_image_emails(self, soup):
-        """
-        Find email addresses in image alt tags.
-        
-        Some sites put email addresses in image alt attributes to prevent scraping.
-        
-        Args:
-            soup: BeautifulSoup object
-            
-        Returns:
-            list: List of email addresses
+    def extract_homepage(self, page_source, url):
         """
-        emails = []
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        
-        # Find all images
-        for img in soup.find_all('img', alt=True):
-            alt_text = img.get('alt', '')
-            # Check for email patterns in alt text
-            matches = re.findall(email_pattern, alt_text)
-            for email in matches:
-                if '@' in email and '.' in email:
-                    emails.append(email.lower())
-        
-        # Also check title attributes which sometimes contain emails
-        for elem in soup.find_all(title=True):
-            title_text = elem.get('title', '')
-            matches = re.findall(email_pattern, title_text)
-            for email in matches:
-                if '@' in email and '.' in email:
-                    emails.append(email.lower())
-        
-        return list(set(emails))
-    
-    def find_mailto_links(self, soup):
-        """
-        Extract email addresses from mailto links.
+        Extract contact information and contact page links from a rendered homepage.
         
         Args:
-            soup: BeautifulSoup object
+            page_source (str): Rendered page HTML
+            url (str): Page URL, used to resolve relative contact links
             
         Returns:
-            list: List of email addresses
+            dict: 'emails', 'phones', 'social_media' and 'contact_links'
         """
-        emails = []
-        
-        # Find all mailto links
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
-            if href.startswith('mailto:'):
-                # Extract email from mailto: link
-                email = href.replace('mailto:', '').strip()
-                # Remove any query parameters
-                email = email.split('?')[0].strip()
-                if '@' in email and '.' in email:
-                    emails.append(email.lower())
-        
-        return list(set(emails))
+        page = parse_page(page_source)
+        
+        # Initial search for contact information
+        found = extract(page_source, page.text)
+        
+        # Check for emails in image alt tags
+        img_emails = find_image_emails(page)
+        if img_emails:
+            logger.info(f"Found {len(img_emails)} emails in image alt tags")
+            found['emails'].extend(img_emails)
+            
+        # Check for mailto links
+        mailto_emails = find_mailto_links(page)
+        if mailto_emails:
+            logger.info(f"Found {len(mailto_emails)} emails in mailto links")
+            found['emails'].extend(mailto_emails)
+        
+        # Find contact pages
+        found['contact_links'] = self.find_contact_links(page, url)
+        return found
 
     def scrape_url(self, url):
         """
@@ -437,13 +428,26 @@ class ContactScraper:
         Returns:
             dict: Dictionary with scraped contact information
         """
+        if self.scheduler is None:
+            return self._scrape_url(url)
+        
+        # Wait for the host's slot before taking a browser, so no browser idles in the queue
+        with polite_slot(self.scheduler, url, self.robots) as host:
+            return self._scrape_url(url, host)
+
+    def _scrape_url(self, url, host=None):
         driver = None
+        pages_loaded = 0
+        driver_broken = False
         try:
             logger.info(f"Starting to scrape URL: {url}")
             
+            if self.robots is not None and not self.robots.fetch(url).allowed(url):
+                raise RobotsDisallowed(url)
+            
             # Try to set up the WebDriver with additional error info
             try:
-                driver = self.setup_driver()
+                driver = self.driver_pool.acquire() if self.driver_pool else self.setup_driver()
             except Exception as setup_error:
                 error_details = f"WebDriver setup failed: {str(setup_error)}"
                 logger.error(error_details)
@@ -465,56 +469,53 @@ class ContactScraper:
             
             # Load main page
             logger.info(f"Navigating to page: {url}")
+            pages_loaded += 1
             if not self.safe_get(driver, url):
                 logger.warning(f"Failed to load page: {url}")
                 raise Exception(f"Failed to load page: {url}")
             
             # Get page content
             page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            text_content = soup.get_text()
-            
-            # Initial search for contact information
-            emails = self.extract_emails(text_content)
-            phones = self.extract_phones(text_content)
-            social = self.extract_social_media(page_source)
-            
-            # Check for Cloudflare protected emails
-            cloudflare_emails = self.find_cloudflare_emails(page_source)
-            if cloudflare_emails:
-                logger.info(f"Found {len(cloudflare_emails)} Cloudflare protected emails")
-                emails.extend(cloudflare_emails)
-            
-            # Check for emails in image alt tags
-            img_emails = self.find_image_emails(soup)
-            if img_emails:
-                logger.info(f"Found {len(img_emails)} emails in image alt tags")
-                emails.extend(img_emails)
-                
-            # Check for mailto links
-            mailto_emails = self.find_mailto_links(soup)
-            if mailto_emails:
-                logger.info(f"Found {len(mailto_emails)} emails in mailto links")
-                emails.extend(mailto_emails)
             
-            # Find contact pages
-            contact_links = self.find_contact_links(soup, url)
+            # A rendered page identical to an earlier one reuses that page's extraction result
+            if self.extraction_cache is not None:
+                found = self.extraction_cache.cached(
+                    'browser-homepage', page_source, lambda: self.extract_homepage(page_source, url), url=url
+                )
+            else:
+                found = self.extract_homepage(page_source, url)
+            emails = found['emails']
+            phones = found['phones']
+            social = found['social_media']
+            contact_links = found['contact_links']
             
             # Visit contact pages if found
             for contact_url in contact_links[:3]:  # Limit to first 3 contact URLs
+                # A contact page on another host needs that host's robots.txt
+                rules = read_robots(self.scheduler, self.robots, contact_url)[0] if self.robots is not None else None
+                if rules is not None and not rules.allowed(contact_url):
+                    logger.info(f"Skipping contact page blocked by robots.txt: {contact_url}")
+                    continue
                 logger.info(f"Found contact page: {contact_url}")
+                pages_loaded += 1
+                if host is not None:
+                    self.scheduler.wait_turn(host)
                 if self.safe_get(driver, contact_url):
                     contact_source = driver.page_source
-                    contact_soup = BeautifulSoup(contact_source, 'html.parser')
-                    contact_text = contact_soup.get_text()
                     
                     # Extract additional contact information
-                    emails.extend(self.extract_emails(contact_text))
-                    phones.extend(self.extract_phones(contact_text))
-                    social.update(self.extract_social_media(contact_source))
+                    if self.extraction_cache is not None:
+                        found = self.extraction_cache.cached('contact', contact_source,
+                                                             lambda: parse_contact_page(contact_source))
+                    else:
+                        found = parse_contact_page(contact_source)
+                    emails.extend(found['emails'])
+                    phones.extend(found['phones'])
+                    social.update(found['social_media'])
                     
-                    # Short delay to avoid overloading the server
-                    time.sleep(1)
+                    # Short delay to avoid overloading the server; the scheduler paces requests itself
+                    if self.scheduler is None:
+                        time.sleep(1)
             
             # Remove duplicates
             emails = list(set(emails))
@@ -535,6 +536,8 @@ class ContactScraper:
         except Exception as e:
             error_msg = f"Error scraping {url}: {str(e)}"
             logger.error(error_msg)
+            # A WebDriver error usually means the browser crashed, don't reuse it
+            driver_broken = isinstance(e, WebDriverException)
             return {
                 'url': url,
                 'domain': urllib.parse.urlparse(url).netloc if url.startswith(('http://', 'https://')) else '',
@@ -544,7 +547,9 @@ class ContactScraper:
                 'status': f"Error: {error_msg}"
             }
         finally:
-            if driver:
+            if driver and self.driver_pool:
+                self.driver_pool.release(driver, pages=pages_loaded, broken=driver_broken)
+            elif driver:
                 try:
                     driver.quit()
                 except Exception as quit_error:
@@ -562,20 +567,30 @@ class ContactScraper:
             list: List of dictionaries with scraped contact information
         """
         self.results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_url = {executor.submit(self.scrape_url, url): url for url in urls}
-            
-            completed = 0
-            total = len(urls)
-            
-            for future in tqdm(concurrent.futures.as_completed(future_to_url), 
-                              total=len(urls), 
-                              desc="Scraping URLs"):
-                result = future.result()
-                self.results.append(result)
-                completed += 1
-                if progress_callback:
-                    progress_callback(completed, total)
+        
+        # One warm browser per worker, reused across URLs instead of launching Chrome per site
+        self.driver_pool = DriverPool(self.setup_driver, self.max_workers, self.max_pages_per_driver)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Alternate between hosts so workers aren't all waiting on the same site
+                order = interleave(urls) if self.scheduler else range(len(urls))
+                future_to_url = {executor.submit(self.scrape_url, urls[i]): urls[i] for i in order}
+                
+                completed = 0
+                total = len(urls)
+                
+                for future in tqdm(concurrent.futures.as_completed(future_to_url), 
+                                  total=len(urls), 
+                                  desc="Scraping URLs"):
+                    result = future.result()
+                    self.results.append(result)
+                    completed += 1
+                    if progress_callback:
+                        progress_callback(completed, total)
+        finally:
+            logger.info(f"Driver pool started {self.driver_pool.created} browsers, recycled {self.driver_pool.recycled}")
+            self.driver_pool.close()
+            self.driver_pool = None
         
         return self.results
 
@@ -13,6 +13,11 @@ document.addEventListener('DOMContentLoaded', function() {
     // Global variables
     let activeJobId = null;
     let jobStatusInterval = null;
+    let jobEventSource = null;
+    let lastJobStatus = null;
+    
+    // Results are loaded from the server one page at a time
+    const RESULTS_PAGE_SIZE = 25;
     const jobModal = new bootstrap.Modal(document.getElementById('job-modal'));
     const uploadForm = document.getElementById('upload-form');
     const manualForm = document.getElementById('manual-form');
@@ -366,14 +371,53 @@ document.addEventListener('DOMContentLoaded', function() {
         jobModal.show();
     }
     
-    // Start polling for job status
+    // Follow job status: Server-Sent Events where supported, polling otherwise
     function startJobStatusPolling(jobId) {
-        if (jobStatusInterval) {
-            clearInterval(jobStatusInterval);
-        }
+        stopJobStatusUpdates();
         
         const startTime = new Date().getTime();
         
+        if (!window.EventSource) {
+            pollJobStatus(jobId, startTime);
+            return;
+        }
+        
+        const liveResults = [];
+        jobEventSource = new EventSource(`/api/jobs/${jobId}/events`);
+        
+        jobEventSource.addEventListener('progress', event => {
+            updateJobStatus(JSON.parse(event.data), startTime);
+        });
+        
+        // Newly found contacts are shown while the job is still running
+        jobEventSource.addEventListener('result', event => {
+            if (liveResults.length >= RESULTS_PAGE_SIZE) {
+                return;
+            }
+            const result = JSON.parse(event.data);
+            liveResults.push(result);
+            updateMainResultsTable([result], 1, liveResults.length > 1);
+            const mainResultsSection = document.getElementById('main-results-section');
+            if (mainResultsSection) mainResultsSection.classList.remove('d-none');
+        });
+        
+        jobEventSource.addEventListener('done', event => {
+            stopJobStatusUpdates();
+            updateJobStatus(JSON.parse(event.data), startTime);
+        });
+        
+        jobEventSource.onerror = () => {
+            // The browser reconnects by itself unless the stream was refused
+            if (jobEventSource && jobEventSource.readyState === EventSource.CLOSED) {
+                console.warn('Job event stream closed, falling back to polling');
+                stopJobStatusUpdates();
+                pollJobStatus(jobId, startTime);
+            }
+        };
+    }
+    
+    // Poll for job status once a second
+    function pollJobStatus(jobId, startTime) {
         jobStatusInterval = setInterval(() => {
             fetch(`/api/jobs/${jobId}`)
                 .then(response => response.json())
@@ -397,6 +441,18 @@ document.addEventListener('DOMContentLoaded', function() {
         }, 1000);
     }
     
+    // Stop following the current job
+    function stopJobStatusUpdates() {
+        if (jobEventSource) {
+            jobEventSource.close();
+            jobEventSource = null;
+        }
+        if (jobStatusInterval) {
+            clearInterval(jobStatusInterval);
+            jobStatusInterval = null;
+        }
+    }
+    
     // Update job status in UI
     function updateJobStatus(job, startTime) {
         // Get DOM elements with null checks
@@ -675,291 +731,79 @@ document.addEventListener('DOMContentLoaded', function() {
         
         if (timeElement) timeElement.textContent = timeText;
         
-        // Update jobs list if on jobs tab
-        fetchJobs();
+        // Update jobs list when the status changes, not on every progress event
+        if (job.status !== lastJobStatus) {
+            lastJobStatus = job.status;
+            fetchJobs();
+        }
     }
     
     // Fetch job results
     function fetchJobResults(jobId) {
         console.log(`Fetching results for job ${jobId}`);
         
-        // EMERGENCY FIX FOR FIRST DOMAIN ISSUE
-        // Use XMLHttpRequest instead of fetch to rule out any potential fetch API issues
-        const xhr = new XMLHttpRequest();
-        xhr.open('GET', `/api/results/${jobId}`, true);
-        xhr.onreadystatechange = function() {
-            if (xhr.readyState === 4) {
-                if (xhr.status === 200) {
-                    const responseText = xhr.responseText;
-                    console.log('Raw API response via XMLHttpRequest:', responseText);
-                    
-                    try {
-                        const data = JSON.parse(responseText);
-                        if (data.error) {
-                            console.error("Error fetching results:", data.error);
-                            showAlert(`Error fetching results: ${data.error}`, 'danger');
-                            return;
-                        }
-                        
-                        // Clear the table immediately for any case
-                        const tableBody = document.getElementById('main-results-table-body');
-                        if (tableBody) {
-                            tableBody.innerHTML = '';
-                            console.log('Cleared results table');
-                        }
-                        
-                        console.log('Full results data object:', data);
-                        
-                        // Additional DEBUG: Check result structure
-                        if (data.results && data.results.length > 0) {
-                            console.log('Data structure validation:');
-                            console.log('- results is array:', Array.isArray(data.results));
-                            console.log('- results length:', data.results.length);
-                            console.log('- first result complete structure:', JSON.stringify(data.results[0], null, 2));
-                            
-                            // Validate first result structure
-                            const firstResult = data.results[0];
-                            console.log('First result validation:');
-                            console.log('- has URL:', Boolean(firstResult.url));
-                            console.log('- has domain:', Boolean(firstResult.domain));
-                            console.log('- emails is array:', Array.isArray(firstResult.emails));
-                            console.log('- phones is array:', Array.isArray(firstResult.phones));
-                            console.log('- social_media is object:', typeof firstResult.social_media === 'object');
-                        }
-                        
-                        // Check if we have results at all
-                        if (!data.results || !Array.isArray(data.results) || data.results.length === 0) {
-                            console.warn("No results received from API or results is not an array");
-                            showAlert('No results were found for this job', 'warning');
-                            return;
-                        }
-                        
-                        console.log(`Received ${data.results.length} results for job ${jobId}`);
-                        console.log("Results array type:", Object.prototype.toString.call(data.results));
-                        
-                        // DEBUG: Specifically log and process the first result
-                        if (data.results.length > 0) {
-                            const firstResult = data.results[0];
-                            console.log("FIRST RESULT:", JSON.stringify(firstResult));
-                            
-                            // CRITICAL FIX: Directly add first result to the table without using updateMainResultsTable
-                            if (tableBody) {
-                                const firstRow = document.createElement('tr');
-                                
-                                // URL column
-                                const urlCell = document.createElement('td');
-                                urlCell.textContent = firstResult.domain || firstResult.url || 'Unknown URL';
-                                urlCell.title = firstResult.url || '';
-                                firstRow.appendChild(urlCell);
-                                
-                                // CRITICAL FIX: Properly handle emails - ensure we have an array and join it
-                                const emailsCell = document.createElement('td');
-                                if (firstResult.emails && Array.isArray(firstResult.emails) && firstResult.emails.length > 0) {
-                                    // Convert to string only after validation
-                                    emailsCell.textContent = firstResult.emails.join(', ');
-                                    console.log('Emails displayed:', firstResult.emails.join(', '));
-                                } else {
-                                    emailsCell.textContent = 'None found';
-                                    emailsCell.classList.add('text-muted');
-                                    console.log('No emails found in first result');
-                                }
-                                firstRow.appendChild(emailsCell);
-                                
-                                // CRITICAL FIX: Properly handle phones - ensure we have an array and join it
-                                const phonesCell = document.createElement('td');
-                                if (firstResult.phones && Array.isArray(firstResult.phones) && firstResult.phones.length > 0) {
-                                    // Convert to string only after validation
-                                    phonesCell.textContent = firstResult.phones.join(', ');
-                                    console.log('Phones displayed:', firstResult.phones.join(', '));
-                                } else {
-                                    phonesCell.textContent = 'None found';
-                                    phonesCell.classList.add('text-muted');
-                                    console.log('No phones found in first result');
-                                }
-                                firstRow.appendChild(phonesCell);
-                                
-                                // Social media column
-                                const socialCell = document.createElement('td');
-                                const socialMedia = firstResult.social_media || {};
-                                
-                                if (Object.keys(socialMedia).length > 0) {
-                                    const socialLinks = [];
-                                    
-                                    if (socialMedia.linkedin) {
-                                        socialLinks.push(`<a href="${socialMedia.linkedin}" target="_blank" class="me-1">
-                                            <i class="fab fa-linkedin" title="LinkedIn"></i>
-                                        </a>`);
-                                    }
-                                    
-                                    if (socialMedia.twitter) {
-                                        socialLinks.push(`<a href="${socialMedia.twitter}" target="_blank" class="me-1">
-                                            <i class="fab fa-twitter" title="Twitter"></i>
-                                        </a>`);
-                                    }
-                                    
-                                    if (socialMedia.facebook) {
-                                        socialLinks.push(`<a href="${socialMedia.facebook}" target="_blank" class="me-1">
-                                            <i class="fab fa-facebook" title="Facebook"></i>
-                                        </a>`);
-                                    }
-                                    
-                                    socialCell.innerHTML = socialLinks.join('');
-                                    console.log('Social media links displayed:', Object.keys(socialMedia).join(', '));
-                                } else {
-                                    socialCell.textContent = 'None found';
-                                    socialCell.classList.add('text-muted');
-                                    console.log('No social media links found in first result');
-                                }
-                                firstRow.appendChild(socialCell);
-                                
-                                // Status column
-                                const statusCell = document.createElement('td');
-                                const status = firstResult.status || 'Unknown';
-                                
-                                if (status.includes('success')) {
-                                    statusCell.innerHTML = '<span class="badge bg-success">Success</span>';
-                                } else if (status.includes('Error')) {
-                                    statusCell.innerHTML = `<span class="badge bg-danger" title="${status}">Error</span>`;
-                                } else {
-                                    statusCell.textContent = status;
-                                }
-                                firstRow.appendChild(statusCell);
-                                
-                                // Insert first row IMMEDIATELY
-                                tableBody.appendChild(firstRow);
-                                console.log("First row directly added:", firstRow.outerHTML);
-                                
-                                // Special handling: Add the rest of the rows manually to prevent any issues
-                                if (data.results.length > 1) {
-                                    for (let i = 1; i < data.results.length; i++) {
-                                        const result = data.results[i];
-                                        const row = document.createElement('tr');
-                                        
-                                        // URL column
-                                        const urlCell = document.createElement('td');
-                                        urlCell.textContent = result.domain || result.url || 'Unknown URL';
-                                        urlCell.title = result.url || '';
-                                        row.appendChild(urlCell);
-                                        
-                                        // Emails column
-                                        const emailsCell = document.createElement('td');
-                                        if (result.emails && result.emails.length > 0) {
-                                            emailsCell.textContent = Array.isArray(result.emails) ? 
-                                                result.emails.join(', ') : result.emails;
-                                        } else {
-                                            emailsCell.textContent = 'None found';
-                                            emailsCell.classList.add('text-muted');
-                                        }
-                                        row.appendChild(emailsCell);
-                                        
-                                        // Phones column
-                                        const phonesCell = document.createElement('td');
-                                        if (result.phones && result.phones.length > 0) {
-                                            phonesCell.textContent = Array.isArray(result.phones) ? 
-                                                result.phones.join(', ') : result.phones;
-                                        } else {
-                                            phonesCell.textContent = 'None found';
-                                            phonesCell.classList.add('text-muted');
-                                        }
-                                        row.appendChild(phonesCell);
-                                        
-                                        // Social media column
-                                        const socialCell = document.createElement('td');
-                                        const socialMedia = result.social_media || {};
-                                        
-                                        if (Object.keys(socialMedia).length > 0) {
-                                            const socialLinks = [];
-                                            
-                                            if (socialMedia.linkedin) {
-                                                socialLinks.push(`<a href="${socialMedia.linkedin}" target="_blank" class="me-1">
-                                                    <i class="fab fa-linkedin" title="LinkedIn"></i>
-                                                </a>`);
-                                            }
-                                            
-                                            if (socialMedia.twitter) {
-                                                socialLinks.push(`<a href="${socialMedia.twitter}" target="_blank" class="me-1">
-                                                    <i class="fab fa-twitter" title="Twitter"></i>
-                                                </a>`);
-                                            }
-                                            
-                                            if (socialMedia.facebook) {
-                                                socialLinks.push(`<a href="${socialMedia.facebook}" target="_blank" class="me-1">
-                                                    <i class="fab fa-facebook" title="Facebook"></i>
-                                                </a>`);
-                                            }
-                                            
-                                            socialCell.innerHTML = socialLinks.join('');
-                                        } else {
-                                            socialCell.textContent = 'None found';
-                                            socialCell.classList.add('text-muted');
-                                        }
-                                        row.appendChild(socialCell);
-                                        
-                                        // Status column
-                                        const statusCell = document.createElement('td');
-                                        const status = result.status || 'Unknown';
-                                        
-                                        if (status.includes('success')) {
-                                            statusCell.innerHTML = '<span class="badge bg-success">Success</span>';
-                                        } else if (status.includes('Error')) {
-                                            statusCell.innerHTML = `<span class="badge bg-danger" title="${status}">Error</span>`;
-                                        } else {
-                                            statusCell.textContent = status;
-                                        }
-                                        row.appendChild(statusCell);
-                                        
-                                        tableBody.appendChild(row);
-                                    }
-                                }
-                                
-                                // Show more button handling
-                                const showMoreBtn = document.getElementById('main-show-more-results');
-                                if (showMoreBtn) {
-                                    if (data.results.length > 25) {
-                                        showMoreBtn.classList.remove('d-none');
-                                        showMoreBtn.textContent = `Show All Results (showing 25 of ${data.results.length})`;
-                                        showMoreBtn.onclick = function() {
-                                            // We've already shown all results, so just hide the button
-                                            showMoreBtn.classList.add('d-none');
-                                        };
-                                    } else {
-                                        showMoreBtn.classList.add('d-none');
-                                    }
-                                }
-                            } else {
-                                console.error("Table body element not found!");
-                            }
-                        } else {
-                            console.warn("No results to display");
-                            const tableBody = document.getElementById('main-results-table-body');
-                            if (tableBody) {
-                                tableBody.innerHTML = `<tr><td colspan="5" class="text-center">No results found</td></tr>`;
-                            }
-                        }
-                        
-                        // Show results section and scroll to it
-                        const mainResultsSection = document.getElementById('main-results-section');
-                        if (mainResultsSection) {
-                            mainResultsSection.classList.remove('d-none');
-                            setTimeout(() => {
-                                mainResultsSection.scrollIntoView({ behavior: 'smooth' });
-                            }, 300);
-                        }
-                    } catch (e) {
-                        console.error('Error parsing JSON response:', e);
-                        showAlert(`Error processing results: ${e.message}`, 'danger');
+        const tableBody = document.getElementById('main-results-table-body');
+        if (tableBody) {
+            tableBody.innerHTML = '';
+        }
+        
+        fetchResultsPage(jobId, null, 0);
+        
+        // Show results section and scroll to it
+        const mainResultsSection = document.getElementById('main-results-section');
+        if (mainResultsSection) {
+            mainResultsSection.classList.remove('d-none');
+            setTimeout(() => {
+                mainResultsSection.scrollIntoView({ behavior: 'smooth' });
+            }, 300);
+        }
+    }
+    
+    // Fetch one page of results and append it to the table
+    function fetchResultsPage(jobId, cursor, shown) {
+        const params = new URLSearchParams({ limit: RESULTS_PAGE_SIZE });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        
+        fetch(`/api/results/${jobId}?${params.toString()}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    console.error("Error fetching results:", data.error);
+                    showAlert(`Error fetching results: ${data.error}`, 'danger');
+                    return;
+                }
+                
+                const results = Array.isArray(data.results) ? data.results : [];
+                if (!cursor && results.length === 0) {
+                    showAlert('No results were found for this job', 'warning');
+                    updateMainResultsTable([]);
+                    return;
+                }
+                
+                // Append this page; earlier pages stay in the table
+                updateMainResultsTable(results, results.length, true);
+                shown += results.length;
+                
+                const showMoreBtn = document.getElementById('main-show-more-results');
+                if (showMoreBtn) {
+                    if (data.next_cursor) {
+                        showMoreBtn.classList.remove('d-none');
+                        showMoreBtn.textContent = `Show More Results (showing ${shown} of ${data.total_results})`;
+                        showMoreBtn.onclick = () => {
+                            showMoreBtn.classList.add('d-none');
+                            fetchResultsPage(jobId, data.next_cursor, shown);
+                        };
+                    } else {
+                        showMoreBtn.classList.add('d-none');
                     }
-                } else {
-                    console.error(`Server returned error status: ${xhr.status}`);
-                    showAlert(`Error loading results: Server returned status ${xhr.status}`, 'danger');
                 }
-            }
-        };
-        xhr.onerror = function() {
-            console.error('Network error occurred');
-            showAlert('Network error occurred while fetching results', 'danger');
-        };
-        xhr.send();
+            })
+            .catch(error => {
+                console.error('Error fetching results:', error);
+                showAlert('Network error occurred while fetching results', 'danger');
+            });
     }
     
     // Update main results table
@@ -1301,10 +1145,7 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Close modal cleanup
     document.getElementById('job-modal').addEventListener('hidden.bs.modal', function() {
-        if (jobStatusInterval) {
-            clearInterval(jobStatusInterval);
-            jobStatusInterval = null;
-        }
+        stopJobStatusUpdates();
     });
     
     // Smooth scroll for navigation
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script to verify cross-job contact deduplication
+"""
+
+import sys
+import os
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+from models import db, User, SeenContact, ContactFilter
+from contact_dedup import BloomFilter, ContactDedup, normalize_contact
+
+
+def test_bloom_filter():
+    """The filter never misses an added item and keeps false positives near the target rate"""
+    bloom = BloomFilter.for_capacity(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"email:user{i}@example.com")
+    assert all(f"email:user{i}@example.com" in bloom for i in range(1000))
+    false_positives = sum(f"email:other{i}@example.com" in bloom for i in range(10000))
+    assert false_positives < 300
+
+    saved = BloomFilter.from_bytes(bloom.to_bytes(), bloom.hashes, bloom.items)
+    assert 'email:user5@example.com' in saved and saved.capacity() >= 1000
+
+    other = BloomFilter(bloom.size, bloom.hashes)
+    other.add('phone:2125557890')
+    saved.merge(other)
+    assert 'phone:2125557890' in saved and 'email:user5@example.com' in saved
+
+    assert normalize_contact('email', ' Info@Acme.IO ') == 'info@acme.io'
+    assert normalize_contact('phone', '+1 (212) 555-7890') == '12125557890'
+    assert normalize_contact('phone', 'n/a') is None
+
+
+def test_contact_dedup():
+    """A second job reports which contacts were found before, and by which job"""
+    with app.app_context():
+        db.create_all()
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        user = User(username=f"dedup_{stamp}", email=f"dedup_{stamp}@example.com")
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+        try:
+            first = ContactDedup(user_id, 'job-1', capacity=100).load()
+            result = first.annotate({'emails': ['Info@Acme.io'], 'phones': ['(212) 555-7890']})
+            assert result['first_seen']['Info@Acme.io']['job_id'] == 'job-1'
+            first.annotate({'emails': ['sales@acme.io'], 'phones': []})
+            first.save()
+            assert SeenContact.query.filter_by(user_id=user_id).count() == 3
+            assert first.stats()['queries'] == 0
+
+            second = ContactDedup(user_id, 'job-2', capacity=100).load()
+            result = second.annotate(
+                {'emails': ['info@acme.io', 'new@acme.io'], 'phones': ['212.555.7890']},
+                only_new=True
+            )
+            assert result['emails'] == ['new@acme.io'] and result['phones'] == []
+            assert result['first_seen']['info@acme.io']['job_id'] == 'job-1'
+            assert result['first_seen']['212.555.7890']['job_id'] == 'job-1'
+            assert result['first_seen']['new@acme.io']['job_id'] == 'job-2'
+            # Only the filter hits were looked up in the database
+            assert second.stats()['queries'] == 1 and second.stats()['skipped_lookups'] == 1
+            second.save()
+
+            saved = BloomFilter.from_bytes(db.session.get(ContactFilter, user_id).bits, second.bloom.hashes)
+            assert 'email:new@acme.io' in saved and 'email:info@acme.io' in saved
+        finally:
+            db.session.rollback()
+            SeenContact.query.filter_by(user_id=user_id).delete()
+            ContactFilter.query.filter_by(user_id=user_id).delete()
+            User.query.filter_by(id=user_id).delete()
+            db.session.commit()
+
+
+def test_concurrent_jobs():
+    """Two jobs of one user running at once keep each other's contacts"""
+    with app.app_context():
+        db.create_all()
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        user = User(username=f"dedup_race_{stamp}", email=f"dedup_race_{stamp}@example.com")
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+        try:
+            ContactDedup(user_id, 'job-0', capacity=100).load().save()
+            first = ContactDedup(user_id, 'job-1', capacity=100).load()
+            second = ContactDedup(user_id, 'job-2', capacity=100).load()
+
+            first.annotate({'emails': ['shared@acme.io', 'one@acme.io'], 'phones': []})
+            # The second job's filter predates the first job's contacts, but the insert tells it
+            result = second.annotate({'emails': ['shared@acme.io', 'two@acme.io'], 'phones': []}, only_new=True)
+            assert result['emails'] == ['two@acme.io']
+            assert result['first_seen']['shared@acme.io']['job_id'] == 'job-1'
+
+            # Saving one after the other merges both filters instead of keeping the last
+            first.save()
+            second.save()
+            row = db.session.get(ContactFilter, user_id)
+            db.session.refresh(row)
+            saved = BloomFilter.from_bytes(row.bits, row.hashes)
+            assert 'email:one@acme.io' in saved and 'email:two@acme.io' in saved
+
+            third = ContactDedup(user_id, 'job-3', capacity=100).load()
+            result = third.annotate({'emails': ['one@acme.io', 'two@acme.io'], 'phones': []}, only_new=True)
+            assert result['emails'] == [] and third.stats()['skipped_lookups'] == 0
+        finally:
+            db.session.rollback()
+            SeenContact.query.filter_by(user_id=user_id).delete()
+            ContactFilter.query.filter_by(user_id=user_id).delete()
+            User.query.filter_by(id=user_id).delete()
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    test_bloom_filter()
+    test_contact_dedup()
+    test_concurrent_jobs()
+    print("🎉 CONTACT DEDUP TESTS PASSED!")
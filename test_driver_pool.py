@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that pooled browsers are wiped between sites
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scraper import DriverPool, remember_origin
+
+
+class FakeDriver:
+    """Records the CDP commands and navigations a real Chrome driver would get."""
+
+    def __init__(self):
+        self.commands = []
+        self.pages = []
+        self.quit_called = False
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+        return {}
+
+    def get(self, url):
+        self.pages.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reset_clears_every_origin():
+    """Cookies and cache are cleared browser-wide and storage for each origin of the lease"""
+    pool = DriverPool(FakeDriver, size=1)
+    driver = pool.acquire()
+    remember_origin(driver, 'https://Shop.Example/contact')
+    remember_origin(driver, 'https://shop.example/about')
+    remember_origin(driver, 'http://other.example:8080/')
+    remember_origin(driver, 'about:blank')
+    pool.release(driver, pages=2)
+
+    assert driver.commands == [
+        ('Network.clearBrowserCookies', {}),
+        ('Network.clearBrowserCache', {}),
+        ('Storage.clearDataForOrigin', {'origin': 'http://other.example:8080', 'storageTypes': 'all'}),
+        ('Storage.clearDataForOrigin', {'origin': 'https://shop.example', 'storageTypes': 'all'}),
+    ]
+    assert driver.pages == ['about:blank'] and not driver.quit_called
+
+    # The next lease gets the same warm driver, and only its own origins are cleared
+    assert pool.acquire() is driver
+    driver.commands.clear()
+    remember_origin(driver, 'https://next.example/')
+    pool.release(driver)
+    assert driver.commands[2:] == [('Storage.clearDataForOrigin', {'origin': 'https://next.example', 'storageTypes': 'all'})]
+    assert pool.created == 1
+
+
+def test_failed_reset_recycles_driver():
+    """A driver that can't be wiped is quit instead of reused"""
+    class BrokenDriver(FakeDriver):
+        def execute_cdp_cmd(self, command, params):
+            raise RuntimeError('CDP unavailable')
+
+    pool = DriverPool(BrokenDriver, size=1)
+    driver = pool.acquire()
+    pool.release(driver)
+    assert driver.quit_called and pool.recycled == 1
+    assert pool.acquire() is not driver
+
+
+if __name__ == "__main__":
+    test_reset_clears_every_origin()
+    test_failed_reset_recycles_driver()
+    print("🎉 DRIVER POOL TESTS PASSED!")
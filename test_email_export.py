@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the streamed email export
+"""
+
+import sys
+import os
+import csv
+import io
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openpyxl import load_workbook
+from flask_login import login_user
+from sqlalchemy import event
+
+from app import app
+from models import db, User, Contact
+from user.routes import export_all_emails
+
+
+def test_email_export():
+    """CSV and Excel exports contain every email jobs found with a fixed number of queries"""
+    with app.app_context():
+        db.create_all()
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        user = User(username=f"export_{stamp}", email=f"export_{stamp}@example.com")
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+        try:
+            db.session.bulk_insert_mappings(Contact, [
+                {
+                    'job_id': f"job_{stamp}_{i % 3}",
+                    'user_id': user_id,
+                    'url': f"https://site{i % 3}.example",
+                    'domain': f"site{i % 3}.example",
+                    'kind': 'email',
+                    'value': f"person{i}@site{i % 3}.example",
+                    'source': 'static',
+                    'created_at': datetime(2024, 1, 1)
+                }
+                for i in range(30)
+            ] + [
+                # Phone numbers are not part of the email export
+                {'job_id': f"job_{stamp}_0", 'user_id': user_id, 'url': 'https://site0.example',
+                 'kind': 'phone', 'value': '5550100', 'created_at': datetime(2024, 1, 1)}
+            ])
+            db.session.commit()
+
+            statements = []
+
+            def count_statement(conn, cursor, statement, *args):
+                if 'contacts' in statement:
+                    statements.append(statement)
+
+            with app.test_request_context('/user/emails/export?format=csv'):
+                login_user(user)
+                event.listen(db.engine, 'before_cursor_execute', count_statement)
+                try:
+                    response = export_all_emails()
+                    body = response.get_data(as_text=True)
+                finally:
+                    event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+            assert response.status_code == 200
+            assert 'attachment' in response.headers['Content-Disposition']
+            rows = list(csv.reader(io.StringIO(body)))
+            assert rows[0][0] == 'Email Address' and len(rows) == 31
+            assert rows[1] == ['person0@site0.example', 'site0.example', 'https://site0.example', f"job_{stamp}_0",
+                               'static', '2024-01-01 00:00:00']
+            # One existence check and one joined query, however many emails there are
+            assert len(statements) == 2
+
+            # The Excel file is written to a temporary file, removed when the response is closed
+            with tempfile.TemporaryDirectory() as tmp:
+                tempfile.tempdir = tmp
+                try:
+                    with app.test_request_context('/user/emails/export?format=xlsx'):
+                        login_user(user)
+                        response = export_all_emails()
+                        response.direct_passthrough = False
+                        data = response.get_data()
+                        response.close()
+
+                        # Also when the body is never read, e.g. the client went away
+                        unread = export_all_emails()
+                        assert len(os.listdir(tmp)) == 1
+                        unread.close()
+                    assert os.listdir(tmp) == []
+                finally:
+                    tempfile.tempdir = None
+            workbook = load_workbook(io.BytesIO(data), read_only=True)
+            sheet = list(workbook.active.iter_rows(values_only=True))
+            assert len(sheet) == 31 and sheet[2][3] == f"job_{stamp}_1"
+        finally:
+            db.session.rollback()
+            Contact.query.filter_by(user_id=user_id).delete()
+            User.query.filter_by(id=user_id).delete()
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    test_email_export()
+    print("🎉 EMAIL EXPORT TESTS PASSED!")
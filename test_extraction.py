@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shared contact extraction engine
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from page_parser import available_backends, parse_page
+from parse_pool import parse_homepage, parse_contact_page, merge_contact_page
+from extraction import extract, extract_emails, decode_cloudflare_email, find_image_emails, find_mailto_links
+
+PAGE = """
+<html><body>
+<p>Write to info@acme.io or sales [at] acme [dot] io</p>
+<p>Call +1 (212) 555-7890</p>
+<span data-user="jobs">x</span> <span data-domain="acme.io">y</span>
+<a href="mailto:press@acme.io?subject=hi">Press</a>
+<img src="team.png" alt="hr@acme.io">
+<a href="/cdn-cgi/l/email-protection#0f6e6b62666125216e6c6a2166604f">[email protected]</a>
+<a href="https://www.linkedin.com/company/acme">LinkedIn</a>
+<script>document.write('ceo' + '@' + 'acme' + '.' + 'io')</script>
+</body></html>
+"""
+
+
+def test_obfuscated_emails():
+    """Plain, encoded, CSS, JavaScript and entity emails are found"""
+    emails = set(extract_emails(PAGE))
+    assert 'info@acme.io' in emails
+    assert 'sales@acme.io' in emails
+    assert 'jobs@acme.io' in emails
+    assert 'ceo@acme.io' in emails
+    assert set(extract_emails('a&#64;b&#46;io')) == {'a@b.io'}
+
+
+def test_cloudflare_decoding():
+    """Cloudflare XOR encoding round-trips"""
+    key = 0x42
+    encoded = f"{key:02x}" + ''.join(f"{ord(c) ^ key:02x}" for c in 'me@acme.io')
+    assert decode_cloudflare_email(encoded) == 'me@acme.io'
+    assert decode_cloudflare_email('zz') is None
+
+
+def test_extract_page():
+    """extract() combines text, HTML and Cloudflare results"""
+    page = parse_page(PAGE)
+    found = extract(PAGE, page.text)
+
+    assert 'info@acme.io' in found['emails']
+    assert '+1 (212) 555-7890' in found['phones']
+    assert found['social_media']['linkedin'] == 'https://www.linkedin.com/company/acme'
+    assert find_mailto_links(page) == ['press@acme.io']
+    assert find_image_emails(page) == ['hr@acme.io']
+
+
+def test_parser_backends():
+    """Every installed parser backend collects the same page data"""
+    html = ('<p>Hi <!-- note -->there</p><script>var x = "<b>no</b>";</script>'
+            '<a href="/contact">Contact <b>us</b></a><a name="top">top</a>'
+            '<img src="a.png" alt="Team"><span title="Hours">9-5</span>')
+    for backend in available_backends():
+        page = parse_page(html, backend)
+        assert page.text == 'Hi thereContact ustop9-5', backend
+        assert page.links == [('/contact', 'Contact us')], backend
+        assert page.attribute_texts == ['Team', 'Hours'], backend
+
+
+def test_parser_backends_skip_non_text():
+    """Script, style and template contents are left out of page and link text by every backend"""
+    html = ('<p>Call <a href="/contact">us<script>track("x")</script><style>a{}</style> now</a></p>'
+            '<template><p>Hidden <a href="/draft" title="Draft">draft</a></p></template>'
+            '<div>Open <template><template>deep</template></template>9-5</div>')
+    pages = {backend: parse_page(html, backend) for backend in available_backends()}
+    for backend, page in pages.items():
+        assert page.text == 'Call us nowOpen 9-5', backend
+        assert page.links == [('/contact', 'us now')], backend
+        assert page.attribute_texts == [], backend
+
+
+def test_parse_stage():
+    """The process-pool parse stage takes raw bytes and returns plain results"""
+    result, contact_urls = parse_homepage('https://acme.io/', PAGE.encode('utf-8'))
+    assert 'info@acme.io' in result['emails']
+    assert 'press@acme.io' in result['emails']
+    assert result['escalation_reason'].startswith('near-empty body text')
+    assert contact_urls == []
+
+    found = parse_contact_page(b'<p>Support: help@acme.io</p>')
+    merge_contact_page(result, found)
+    assert 'help@acme.io' in result['emails']
+
+
+if __name__ == "__main__":
+    test_obfuscated_emails()
+    test_cloudflare_decoding()
+    test_extract_page()
+    test_parser_backends()
+    test_parser_backends_skip_non_text()
+    test_parse_stage()
+    print("🎉 EXTRACTION TESTS PASSED!")
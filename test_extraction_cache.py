@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the content-hash extraction cache
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import extraction
+import extraction_cache
+import page_parser
+import parse_pool
+from cache_store import CacheStore
+from extraction_cache import ExtractionCache, content_key
+from parse_pool import parse_homepage, parse_contact_page
+
+PAGE = b'<html><body><p>Write to info@acme.io</p>\n<a href="/contact">Contact us</a></body></html>'
+
+
+def test_content_key():
+    """Keys change with the content, the kind of result and the URL"""
+    key = content_key('homepage', PAGE, 'https://acme.io/')
+    assert key == content_key('homepage', PAGE.decode(), 'https://acme.io/')
+    assert key != content_key('contact', PAGE)
+    assert key != content_key('homepage', PAGE, 'https://www.acme.io/')
+    assert key != content_key('homepage', PAGE + b' ', 'https://acme.io/')
+    assert key != content_key('homepage', PAGE, 'https://acme.io/', 'windows-1252')
+    assert key.startswith(extraction_cache.cache_version() + ':')
+
+    # Another parser backend yields other text, so it must not share entries
+    original = page_parser.get_backend()
+    for backend in page_parser.available_backends():
+        if backend != original:
+            page_parser.configure_parser(backend)
+            try:
+                assert key != content_key('homepage', PAGE, 'https://acme.io/')
+            finally:
+                page_parser.configure_parser(original)
+
+
+def test_cached_extraction():
+    """Identical pages are extracted once; a new engine version starts over"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CacheStore(os.path.join(tmp, 'cache.db'))
+        cache = ExtractionCache(store=store)
+        calls = []
+
+        def parse():
+            calls.append(1)
+            return parse_homepage('https://acme.io/', PAGE)
+
+        result, contact_urls = cache.cached('homepage', PAGE, parse, url='https://acme.io/')
+        again, again_urls = cache.cached('homepage', PAGE, parse, url='https://acme.io/')
+        assert len(calls) == 1
+        assert again == result and again['emails'] == ['info@acme.io']
+        assert again_urls == contact_urls == ['https://acme.io/contact']
+
+        found = cache.cached('contact', PAGE, lambda: parse_contact_page(PAGE))
+        assert found['emails'] == ['info@acme.io']
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+
+        original = extraction.ENGINE_VERSION
+        extraction.ENGINE_VERSION = original + '-next'
+        try:
+            upgraded = ExtractionCache(store=store)
+            upgraded.cached('homepage', PAGE, parse, url='https://acme.io/')
+            assert len(calls) == 2
+            # Workers still on the old version keep their entries during a deploy
+            assert store.stats('extraction')['entries'] == 3
+
+            # Entries of other versions nobody has written for a while are dropped
+            with store._connect() as conn:
+                conn.execute('UPDATE cache_entries SET used_at = 0')
+            ExtractionCache(store=store)
+            assert store.stats('extraction')['entries'] == 1
+        finally:
+            extraction.ENGINE_VERSION = original
+
+        # A change to the parse stage outside extraction.py starts over too
+        original = parse_pool.PARSE_VERSION
+        parse_pool.PARSE_VERSION = original + '-next'
+        try:
+            ExtractionCache(store=store).cached('homepage', PAGE, parse, url='https://acme.io/')
+            assert len(calls) == 3
+        finally:
+            parse_pool.PARSE_VERSION = original
+
+
+def test_expired_entries_miss():
+    """Entries past their TTL are extracted again"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CacheStore(os.path.join(tmp, 'cache.db'))
+        cache = ExtractionCache(ttl=60, store=store)
+        cache.put('k', {'emails': []})
+        assert cache.get('k') == {'emails': []}
+
+        cache = ExtractionCache(ttl=-1, store=store)
+        cache.put('k', {'emails': []})
+        assert cache.get('k') is None
+        assert cache.cached('homepage', PAGE, lambda: 'fresh') == 'fresh'
+        assert time.time() > store.get('extraction', 'k')[1]
+
+
+if __name__ == "__main__":
+    test_content_key()
+    test_cached_extraction()
+    test_expired_entries_miss()
+    print("🎉 EXTRACTION CACHE TESTS PASSED!")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script to verify per-host politeness scheduling
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from host_scheduler import HostScheduler, HostQueue, interleave
+
+
+def test_host_limits():
+    """A host gets a capped number of slots and spaced-out requests"""
+    scheduler = HostScheduler(max_per_host=2, min_delay=0.05)
+
+    assert scheduler.reserve('a.example') == 0
+    # Second slot is free but the delay hasn't passed yet
+    assert scheduler.reserve('a.example') > 0
+    # Other hosts are not affected
+    assert scheduler.reserve('b.example') == 0
+
+    time.sleep(0.06)
+    assert scheduler.reserve('a.example') == 0
+    time.sleep(0.06)
+    # Both slots are taken
+    assert scheduler.reserve('a.example') > 0
+    scheduler.release('a.example')
+    assert scheduler.reserve('a.example') == 0
+
+    # A longer Crawl-delay wins, but only up to the cap
+    scheduler.max_crawl_delay = 10
+    scheduler.set_crawl_delay('a.example', 60)
+    assert 9 < scheduler.pace('a.example') <= 10
+
+
+def test_robots_claimed_once():
+    """Only one caller reads robots.txt; others wait until the delay is known"""
+    scheduler = HostScheduler(min_delay=0)
+    assert scheduler.reserve('a.example') == 0
+    assert scheduler.claim_robots('a.example') is True
+    assert scheduler.claim_robots('a.example') is False
+    assert scheduler.reserve('a.example') > 0
+    scheduler.set_crawl_delay('a.example', None)
+    assert scheduler.reserve('a.example') == 0
+
+    # With Crawl-delay ignored, robots.txt only decides which pages are allowed
+    scheduler = HostScheduler(min_delay=0, respect_crawl_delay=False)
+    scheduler.set_crawl_delay('a.example', 60)
+    assert scheduler.crawl_delay('a.example') is None
+
+
+def test_host_queue_round_robin():
+    """URLs are handed out across hosts instead of in input order"""
+    urls = ['https://a.example/1', 'https://a.example/2', 'https://a.example/3', 'b.example', 'https://c.example']
+    assert [urls[i] for i in interleave(urls)] == [
+        'https://a.example/1', 'b.example', 'https://c.example', 'https://a.example/2', 'https://a.example/3'
+    ]
+
+    scheduler = HostScheduler(max_per_host=1, min_delay=0)
+    pending = HostQueue(scheduler, enumerate(urls))
+    taken = []
+    while True:
+        index, url, host, wait = pending.take()
+        if wait is None:
+            break
+        if wait:
+            # Only a.example is left and its one slot is busy
+            assert scheduler.stats()['busy_hosts'] == {'a.example': 1}
+            scheduler.release('a.example')
+            continue
+        taken.append(index)
+        if host != 'a.example':
+            scheduler.release(host)
+
+    assert taken == [0, 3, 4, 1, 2]
+    assert len(pending) == 0
+
+
+if __name__ == "__main__":
+    test_host_limits()
+    test_robots_claimed_once()
+    test_host_queue_round_robin()
+    print("🎉 HOST SCHEDULER TESTS PASSED!")
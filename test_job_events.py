@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the job progress event stream
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, ScrapeJob, job_registry, RESULT_PREVIEW_SIZE, RECENT_RESULTS_SIZE
+from job_events import format_event
+
+
+def parse_events(body):
+    """Split a text/event-stream body into (event, id, data) tuples"""
+    events = []
+    for block in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], fields.get('id'), json.loads(fields['data'])))
+    return events
+
+
+def test_format_event():
+    """Events carry an ID, a name and a JSON payload"""
+    assert format_event('progress', {'progress': 50.0}, 3) == 'id: 3\nevent: progress\ndata: {"progress": 50.0}\n\n'
+
+
+def test_job_event_stream():
+    """A running job pushes its results and progress, then a final status"""
+    job_id = 'test_events_job'
+    job = ScrapeJob(job_id, 2)
+    job_registry.add_running(job)
+
+    def run_job():
+        job.start()
+        for i, url in enumerate(['https://a.example', 'https://b.example']):
+            time.sleep(0.05)
+            job.add_result({'url': url, 'emails': [f'info@{url[8:]}']}, index=i)
+            job.update_progress(i + 1, 2)
+        job.complete('results/test.parquet')
+
+    try:
+        runner = threading.Thread(target=run_job)
+        runner.start()
+        with app.test_client() as client:
+            response = client.get(f'/api/jobs/{job_id}/events')
+            assert response.mimetype == 'text/event-stream'
+            events = parse_events(response.get_data(as_text=True))
+        runner.join()
+
+        names = [name for name, _, _ in events]
+        assert names.count('result') == 2
+        assert names[-1] == 'done'
+        assert events[-1][2]['status'] == 'completed'
+        assert [data['url'] for name, _, data in events if name == 'result'] == ['https://a.example', 'https://b.example']
+
+        # A reconnecting client only gets what it missed
+        with app.test_client() as client:
+            response = client.get(f'/api/jobs/{job_id}/events', headers={'Last-Event-ID': '1'})
+            events = parse_events(response.get_data(as_text=True))
+        assert [name for name, _, _ in events] == ['result', 'done']
+        assert events[0][1] == '2'
+    finally:
+        job_registry.remove_running(job_id)
+
+
+def test_job_keeps_bounded_results():
+    """A job counts every result but only keeps a preview and the latest ones in memory"""
+    job = ScrapeJob('test_bounded_job', RECENT_RESULTS_SIZE + 500)
+    for i in range(RECENT_RESULTS_SIZE + 500):
+        job.add_result({'url': f'https://site{i}.example', 'emails': [f'info@site{i}.example']}, index=i)
+
+    assert job.result_count == RECENT_RESULTS_SIZE + 500 and job.emails_found == job.result_count
+    assert len(job.results) == RESULT_PREVIEW_SIZE and len(job.recent_results) == RECENT_RESULTS_SIZE
+    assert job.to_dict()['total_results'] == job.result_count
+    assert job.results_since(job.result_count - 1)[0]['url'] == f'https://site{job.result_count - 1}.example'
+    assert job.results_since(job.result_count) == []
+    # Results no longer in memory have to be read elsewhere
+    assert job.results_since(0) is None
+
+
+if __name__ == "__main__":
+    test_format_event()
+    test_job_event_stream()
+    test_job_keeps_bounded_results()
+    print("🎉 JOB EVENT TESTS PASSED!")
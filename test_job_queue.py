@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the database-backed scrape job queue
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, ScrapeJob
+from models import db, ScrapeQueueJob, Contact
+from result_writer import StreamingResultWriter
+from job_queue import (enqueue_job, claim_next_job, save_progress, load_checkpoints, finish_job, resume_job,
+                       requeue_stale_jobs, get_queued_job, contact_rows, QUEUED, RUNNING, COMPLETED, ERROR)
+
+
+def test_job_queue():
+    """Jobs are claimed once, report progress from the database and recover when stale"""
+    with app.app_context():
+        db.create_all()
+        job_id = f"test_queue_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        ScrapeQueueJob.query.filter_by(status=QUEUED).update({'status': 'test_hold'})
+
+        try:
+            record = enqueue_job(job_id, ['example.com', 'example.org'])
+            view = ScrapeJob.from_queue_record(get_queued_job(job_id))
+            assert view.to_dict()['status'] == 'initializing'
+
+            # Only one worker gets the job
+            claimed = claim_next_job('worker-a')
+            assert claimed.id == record.id and claimed.status == RUNNING
+            assert claim_next_job('worker-b') is None
+
+            save_progress(record.id, 1, 2)
+            assert ScrapeJob.from_queue_record(get_queued_job(job_id)).to_dict()['progress'] == 50.0
+
+            # A worker that stops sending heartbeats loses the job
+            ScrapeQueueJob.query.filter_by(id=record.id).update(
+                {'heartbeat_at': datetime.utcnow() - timedelta(hours=1)})
+            db.session.commit()
+            assert requeue_stale_jobs(stale_after=300, max_attempts=3) == 1
+            assert get_queued_job(job_id).status == QUEUED
+            assert claim_next_job('worker-b').attempts == 2
+
+            # The queue row records the result file; the status preview is read from it
+            with tempfile.TemporaryDirectory() as directory:
+                writer = StreamingResultWriter(os.path.join(directory, 'results'), extra_formats=[])
+                writer.write({'url': 'example.com', 'emails': ['a@example.com']})
+                writer.close()
+                finish_job(record.id, COMPLETED, result_file=writer.result_path)
+                assert get_queued_job(job_id).results is None
+                status = ScrapeJob.from_queue_record(get_queued_job(job_id)).to_dict()
+                assert status['status'] == 'completed'
+                assert status['total_results'] == 1
+                assert status['result_preview'][0]['emails'] == ['a@example.com']
+        finally:
+            ScrapeQueueJob.query.filter_by(job_id=job_id).delete()
+            ScrapeQueueJob.query.filter_by(status='test_hold').update({'status': QUEUED})
+            db.session.commit()
+
+
+def test_job_resume():
+    """Checkpoints survive a failure and a resumed job keeps them"""
+    with app.app_context():
+        db.create_all()
+        job_id = f"test_resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        ScrapeQueueJob.query.filter_by(status=QUEUED).update({'status': 'test_hold'})
+
+        try:
+            record = enqueue_job(job_id, ['a.example', 'b.example', 'c.example'])
+            claim_next_job('worker-a')
+            save_progress(record.id, 2, 3, [(0, {'url': 'a.example'}), (2, {'url': 'c.example'})])
+            finish_job(record.id, ERROR, error='worker crashed')
+
+            assert sorted(load_checkpoints(record.id)) == [0, 2]
+            assert resume_job(get_queued_job(job_id)) == 2
+            assert get_queued_job(job_id).status == QUEUED
+
+            # Completing the job drops its checkpoints; the result file has the results
+            claim_next_job('worker-b')
+            finish_job(record.id, COMPLETED, result_file='results/test.parquet')
+            assert load_checkpoints(record.id) == {}
+        finally:
+            ScrapeQueueJob.query.filter_by(job_id=job_id).delete()
+            ScrapeQueueJob.query.filter_by(status='test_hold').update({'status': QUEUED})
+            db.session.commit()
+
+
+def test_contacts_saved_with_checkpoints():
+    """Found emails and phones become contact rows in the checkpoint transaction"""
+    result = {
+        'url': 'https://acme.example',
+        'domain': 'Acme.example',
+        'emails': ['Info@Acme.example', 'info@acme.example', 'x' * 300],
+        'phones': ['+1 555 0100'],
+        'fetch_tier': 'static'
+    }
+    rows = contact_rows('job', 7, result)
+    assert [(row['kind'], row['value']) for row in rows] == [('email', 'info@acme.example'), ('phone', '+1 555 0100')]
+    assert rows[0]['domain'] == 'acme.example' and rows[0]['user_id'] == 7 and rows[0]['source'] == 'static'
+    assert contact_rows('job', None, {'url': 'a.example', 'emails': 'not a list'}) == []
+
+    with app.app_context():
+        db.create_all()
+        job_id = f"test_contacts_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        ScrapeQueueJob.query.filter_by(status=QUEUED).update({'status': 'test_hold'})
+
+        try:
+            record = enqueue_job(job_id, ['acme.example'])
+            claim_next_job('worker-a')
+            save_progress(record.id, 1, 1, [(0, result)], contact_rows(job_id, None, result))
+            saved = Contact.query.filter_by(job_id=job_id).order_by(Contact.id).all()
+            assert [(contact.kind, contact.value) for contact in saved] == [
+                ('email', 'info@acme.example'), ('phone', '+1 555 0100')
+            ]
+            assert saved[0].url == 'https://acme.example'
+        finally:
+            Contact.query.filter_by(job_id=job_id).delete()
+            ScrapeQueueJob.query.filter_by(job_id=job_id).delete()
+            ScrapeQueueJob.query.filter_by(status='test_hold').update({'status': QUEUED})
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    test_job_queue()
+    test_job_resume()
+    test_contacts_saved_with_checkpoints()
+    print("🎉 JOB QUEUE TESTS PASSED!")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script to verify job IDs and the in-memory job registry
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_registry import JobRegistry, new_job_id, ULID_ALPHABET
+
+
+class FakeJob:
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+
+def test_new_job_id():
+    """IDs are unique within the same second and sort by creation time"""
+    ids = [new_job_id() for _ in range(1000)]
+    assert len(set(ids)) == 1000
+    assert all(len(job_id) == 26 and set(job_id) <= set(ULID_ALPHABET) for job_id in ids)
+
+    earlier = new_job_id()
+    time.sleep(0.002)
+    assert new_job_id() > earlier
+
+
+def test_registry_eviction():
+    """Finished jobs expire, and the least recently used go first when over budget"""
+    registry = JobRegistry(ttl=60, max_finished=2, memory_budget=100)
+
+    # Running jobs are never evicted
+    registry.add_running(FakeJob('running'))
+    for job_id in ('a', 'b', 'c'):
+        registry.add_finished(FakeJob(job_id), size=10)
+    assert registry.get('running') is not None
+    assert registry.get('a') is None
+    assert registry.get('b') is not None and registry.get('c') is not None
+
+    # Reading b makes c the least recently used
+    registry.get('b')
+    registry.add_finished(FakeJob('d'), size=10)
+    assert registry.get('c') is None and registry.get('b') is not None
+
+    # The memory budget applies on top of the count
+    registry.add_finished(FakeJob('big'), size=95)
+    assert registry.stats()['finished_bytes'] <= 100
+    assert registry.get('big') is not None and registry.get('b') is None
+    registry.add_finished(FakeJob('huge'), size=500)
+    assert registry.get('huge') is None
+
+    # Expired copies are reloaded from the database
+    registry.ttl = 0
+    registry.add_finished(FakeJob('short'), size=1)
+    time.sleep(0.01)
+    assert registry.get('short') is None
+
+    registry.remove_running('running')
+    assert registry.running('running') is None
+
+
+if __name__ == "__main__":
+    test_new_job_id()
+    test_registry_eviction()
+    print("🎉 JOB REGISTRY TESTS PASSED!")
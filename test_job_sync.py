@@ -9,7 +9,7 @@ from datetime import datetime, timezone
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import app, active_jobs, ScrapeJob
+from app import app, job_registry, ScrapeJob
 from models import db, ScrapeJobHistory
 
 def test_job_sync():
@@ -39,7 +39,7 @@ def test_job_sync():
         memory_job.status = "completed"
         memory_job.results = [{'emails': ['test@example.com'], 'phones': [], 'social_media': {}}]
         memory_job.result_file = "test_result.xlsx"
-        active_jobs[test_job_id] = memory_job
+        job_registry.add_running(memory_job)
         
         # 3. Check initial status mismatch
         print(f"📊 Initial status check:")
@@ -51,8 +51,8 @@ def test_job_sync():
         print(f"\n🔄 Testing sync functionality...")
         
         # Simulate the sync logic
-        if test_job_id in active_jobs:
-            mem_job = active_jobs[test_job_id]
+        mem_job = job_registry.running(test_job_id)
+        if mem_job:
             if mem_job.status == "completed" and db_job.status == 'in_progress':
                 try:
                     db_job.status = 'completed'
@@ -88,8 +88,7 @@ def test_job_sync():
         # 6. Cleanup
         print(f"\n🧹 Cleaning up test data...")
         db.session.delete(db_job)
-        if test_job_id in active_jobs:
-            del active_jobs[test_job_id]
+        job_registry.remove_running(test_job_id)
         db.session.commit()
         
         print(f"\n" + "=" * 50)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the cross-job page cache
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache_store import CacheStore
+from response_cache import ResponseCache, normalize_url, header_charset
+
+
+def test_normalize_url():
+    """Spellings of the same page share a cache key"""
+    assert normalize_url('HTTPS://Example.COM') == 'https://example.com/'
+    assert normalize_url('example.com/contact#team') == 'https://example.com/contact'
+    assert normalize_url('http://example.com:80/?a=1') == 'http://example.com/?a=1'
+    assert normalize_url('http://example.com:8080/') == 'http://example.com:8080/'
+    assert header_charset({'Content-Type': 'text/html; charset="ISO-8859-1"'}) == 'ISO-8859-1'
+    assert header_charset({'Content-Type': 'text/html'}) is None
+
+
+def test_fresh_and_revalidated():
+    """Fresh pages are served as is, stale ones carry validators and survive a 304"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(ttl=3600, store=CacheStore(os.path.join(tmp, 'cache.db')))
+        headers = {'Content-Type': 'text/html; charset=utf-8', 'ETag': '"v1"',
+                   'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+
+        assert cache.lookup('https://a.example/') is None
+        cache.update('https://a.example/', None, 200, b'<html>v1</html>', headers)
+
+        page = cache.lookup('a.example')
+        assert page.fresh and page.body == b'<html>v1</html>' and page.charset == 'utf-8'
+
+        # Expire it: the next request asks the server, and a 304 keeps the cached body
+        cache.ttl = 0
+        cache.update('https://a.example/', None, 200, b'<html>v1</html>', headers)
+        page = cache.lookup('https://a.example/')
+        assert not page.fresh
+        assert page.validators() == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+        assert cache.update('https://a.example/', page, 304, b'', {}) == (200, b'<html>v1</html>', 'utf-8')
+
+        # A changed page replaces the cached copy; no-store pages are not kept
+        cache.ttl = 3600
+        cache.update('https://a.example/', page, 200, b'<html>v2</html>', {'ETag': '"v2"'})
+        assert cache.lookup('https://a.example/').body == b'<html>v2</html>'
+        cache.update('https://b.example/', None, 200, b'secret', {'Cache-Control': 'no-store'})
+        assert cache.lookup('https://b.example/') is None
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['revalidated'], stats['misses']) == (2, 1, 3)
+        assert stats['entries'] == 1
+
+
+def test_eviction():
+    """The least recently used pages go first once the budget is exceeded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(max_bytes=2500, store=CacheStore(os.path.join(tmp, 'cache.db')))
+        for name in ('a', 'b', 'c'):
+            cache.update(f'https://{name}.example/', None, 200, name.encode() * 1000, {})
+            if name == 'b':
+                # Reading a makes b the least recently used
+                cache.lookup('https://a.example/')
+
+        assert cache.lookup('https://b.example/') is None
+        assert cache.lookup('https://a.example/') is not None
+        assert cache.lookup('https://c.example/') is not None
+        assert cache.stats()['evictions'] >= 1
+
+
+if __name__ == "__main__":
+    test_normalize_url()
+    test_fresh_and_revalidated()
+    test_eviction()
+    print("🎉 RESPONSE CACHE TESTS PASSED!")
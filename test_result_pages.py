@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script to verify paginated and filtered job results
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from result_pages import page_results, read_list, parse_fields, decode_cursor, encode_cursor
+from result_writer import StreamingResultWriter, iter_results
+
+RESULTS = [
+    {
+        'url': f'https://site{i}.example.com',
+        'domain': f'site{i}.example.com' if i % 3 else 'other.org',
+        'emails': [f'info@site{i}.example.com'] if i % 2 else [],
+        'phones': [],
+        'social_media': {},
+        'status': 'success (simple scraper)' if i != 5 else 'Error: timeout'
+    }
+    for i in range(12)
+]
+
+
+def collect_pages(read, **kwargs):
+    """Follow next_cursor until the last page"""
+    cursor = None
+    pages = []
+    while True:
+        page, cursor = page_results(read, cursor=cursor, **kwargs)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_pages():
+    """Pages follow each other without gaps and the last page has no cursor"""
+    pages = collect_pages(read_list(RESULTS), limit=5)
+    assert [len(page) for page in pages] == [5, 5, 2]
+    assert [result['url'] for page in pages for result in page] == [result['url'] for result in RESULTS]
+
+    # A full last page does not lead to an empty extra page
+    assert [len(page) for page in collect_pages(read_list(RESULTS), limit=6)] == [6, 6]
+
+    assert decode_cursor(encode_cursor(42)) == 42
+    for bad_cursor in ('42', 'not a cursor'):
+        try:
+            decode_cursor(bad_cursor)
+            assert False, f"cursor {bad_cursor!r} should be rejected"
+        except ValueError:
+            pass
+
+
+def test_filters_and_fields():
+    """Filters run on the server and only the requested fields come back"""
+    read = read_list(RESULTS)
+    with_email = [result for page in collect_pages(read, limit=2, has_email=True) for result in page]
+    assert len(with_email) == 6 and all(result['emails'] for result in with_email)
+    # The last match is not the last result, still no empty extra page
+    assert [len(page) for page in collect_pages(read, limit=3, has_email=False)] == [3, 3]
+
+    page, _ = page_results(read, domain='example.com', status='success', fields=parse_fields('url,domain'))
+    assert set(page[0]) == {'url', 'domain'}
+    assert all(result['domain'].endswith('example.com') for result in page)
+    assert 'https://site5.example.com' not in [result['url'] for result in page]
+
+    try:
+        parse_fields('url,password')
+        assert False, "unknown fields should be rejected"
+    except ValueError:
+        pass
+
+
+def test_file_pages():
+    """Results read from the result file page the same way"""
+    with tempfile.TemporaryDirectory() as directory:
+        writer = StreamingResultWriter(os.path.join(directory, 'results'))
+        for result in RESULTS:
+            writer.write(result)
+        writer.close()
+
+        read = lambda start: iter_results(writer.result_path, columns=['url', 'emails'], offset=start)
+        from_file = collect_pages(read, limit=4, has_email=False, fields=['url'])
+        from_memory = collect_pages(read_list(RESULTS), limit=4, has_email=False, fields=['url'])
+        assert from_file == from_memory
+
+
+if __name__ == "__main__":
+    test_cursor_pages()
+    test_filters_and_fields()
+    test_file_pages()
+    print("🎉 RESULT PAGE TESTS PASSED!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the streaming result writer
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import result_writer
+from result_writer import (StreamingResultWriter, flatten_result, read_results, count_results, export_xlsx,
+                           RESULT_COLUMNS, SOCIAL_COLUMNS)
+
+RESULT = {
+    'url': 'https://acme.io',
+    'domain': 'acme.io',
+    'emails': ['info@acme.io', 'sales@acme.io'],
+    'phones': [],
+    'social_media': {'twitter': 'https://twitter.com/acme'},
+    'status': 'success (simple scraper)',
+    'fetch_tier': 'static'
+}
+
+
+def test_flatten_result():
+    """Lists are joined and social profiles get their own columns"""
+    row = dict(zip(RESULT_COLUMNS + SOCIAL_COLUMNS, flatten_result(RESULT)))
+    assert row['emails'] == 'info@acme.io, sales@acme.io'
+    assert row['phones'] == ''
+    assert row['twitter'] == 'https://twitter.com/acme'
+    assert row['linkedin'] == ''
+
+
+def test_streaming_writer():
+    """Every format holds one row per written result"""
+    with tempfile.TemporaryDirectory() as directory:
+        writer = StreamingResultWriter(os.path.join(directory, 'results'), extra_formats=['xlsx', 'csv', 'jsonl'])
+        for _ in range(3):
+            writer.write(RESULT)
+        writer.close()
+
+        df = pd.read_excel(writer.paths['xlsx'])
+        assert len(df) == 3
+        assert df.iloc[0]['emails'] == 'info@acme.io, sales@acme.io'
+        assert len(pd.read_csv(writer.paths['csv'])) == 3
+        with open(writer.paths['jsonl']) as f:
+            assert [json.loads(line)['url'] for line in f] == ['https://acme.io'] * 3
+
+        # The main file reads back as the original results
+        results = read_results(writer.result_path)
+        assert len(results) == 3
+        assert results[0]['emails'] == RESULT['emails']
+        assert results[0]['social_media'] == RESULT['social_media']
+
+
+def test_projected_reads():
+    """Readers get only the columns and rows they ask for"""
+    row_group_size = result_writer.PARQUET_ROW_GROUP_SIZE
+    result_writer.PARQUET_ROW_GROUP_SIZE = 4
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            writer = StreamingResultWriter(os.path.join(directory, 'results'))
+            for i in range(10):
+                writer.write(dict(RESULT, url=f'https://acme.io/{i}'))
+            writer.close()
+
+            path = writer.result_path
+            assert count_results(path) == 10
+            page = read_results(path, columns=['url', 'emails'], offset=3, limit=5)
+            assert [result['url'] for result in page] == [f'https://acme.io/{i}' for i in range(3, 8)]
+            assert set(page[0]) == {'url', 'emails'}
+            assert read_results(path, offset=8, limit=5)[-1]['url'] == 'https://acme.io/9'
+
+            # Excel is written on demand and reads back the same way
+            xlsx_path = export_xlsx(path)
+            assert xlsx_path.endswith('.xlsx') and export_xlsx(path) == xlsx_path
+            assert read_results(xlsx_path, columns=['url', 'emails'], offset=3, limit=5) == page
+
+            # Concurrent first downloads each write their own temporary file
+            os.remove(xlsx_path)
+            paths = []
+            threads = [threading.Thread(target=lambda: paths.append(export_xlsx(path))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert paths == [xlsx_path] * 4 and count_results(xlsx_path) == 10
+            assert not [name for name in os.listdir(directory) if name.endswith('.partial')]
+    finally:
+        result_writer.PARQUET_ROW_GROUP_SIZE = row_group_size
+
+
+if __name__ == "__main__":
+    test_flatten_result()
+    test_streaming_writer()
+    test_projected_reads()
+    print("🎉 RESULT WRITER TESTS PASSED!")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script to verify robots.txt rules and their on-disk cache
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache_store import CacheStore
+from fetch_engine import AsyncFetchEngine
+from host_scheduler import HostScheduler, read_robots
+from robots_cache import RobotsCache, RobotsRules, parse_crawl_delay, origin
+
+
+def test_parse_crawl_delay():
+    """Crawl-delay is read from the group that applies to us, falling back to *"""
+    robots = "User-agent: *\nCrawl-delay: 5\n\nUser-agent: ContactHarvesterPro\nCrawl-delay: 2\n"
+    assert parse_crawl_delay(robots) == 2.0
+    assert parse_crawl_delay("User-agent: *\nCrawl-delay: 5\n", user_agent='OtherBot') == 5.0
+    assert parse_crawl_delay("User-agent: *\nDisallow: /private\n") is None
+    assert parse_crawl_delay("") is None
+
+
+def test_rules():
+    """Disallowed paths are refused, everything else is allowed"""
+    rules = RobotsRules("User-agent: *\nDisallow: /private\n")
+    assert rules.allowed('https://a.example/')
+    assert rules.allowed('a.example/contact')
+    assert not rules.allowed('https://a.example/private/team')
+    assert RobotsRules().allowed('https://a.example/anything')
+    assert origin('A.Example/contact') == 'https://a.example'
+
+
+def test_cache():
+    """Rules are shared through the store; missing or unreachable robots.txt is cached for less time"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CacheStore(os.path.join(tmp, 'cache.db'))
+        robots = RobotsCache(ttl=3600, negative_ttl=0, store=store)
+
+        assert robots.cached('https://a.example/') is None
+        assert robots.allowed('https://a.example/private')
+
+        robots.save('https://a.example/', 200, "User-agent: *\nDisallow: /private\nCrawl-delay: 3\n")
+        # A second process opens the same file and gets the same rules without a request
+        other = RobotsCache(store=CacheStore(os.path.join(tmp, 'cache.db')))
+        rules = other.cached('https://a.example/contact')
+        assert rules is not None and rules.crawl_delay == 3.0
+        assert not other.allowed('https://a.example/private')
+        assert other.allowed('http://a.example/private')
+
+        # A 404 allows everything; with negative_ttl=0 it is fetched again next time
+        assert robots.save('https://b.example/', 404).allowed('https://b.example/private')
+        assert robots.cached('https://b.example/') is None
+        assert store.purge_expired('robots') == 1
+        assert robots.stats()['entries'] == 1
+
+        # A server error or a failed request disallows the whole site for negative_ttl
+        robots = RobotsCache(ttl=3600, negative_ttl=60, store=store)
+        assert not robots.save('https://c.example/', 503, 'Service Unavailable').allowed('https://c.example/')
+        assert not robots.save('https://d.example/', None).allowed('https://d.example/contact')
+        assert not RobotsCache(store=store).allowed('https://c.example/contact')
+
+        assert RobotsCache(enabled=False, store=store).cached('https://a.example/private').allowed(
+            'https://a.example/private')
+
+
+def test_wait_for_pending_robots():
+    """A URL whose host's robots.txt is being read waits for those rules instead of skipping the check"""
+    with tempfile.TemporaryDirectory() as tmp:
+        robots = RobotsCache(store=CacheStore(os.path.join(tmp, 'cache.db')))
+        scheduler = HostScheduler(min_delay=0)
+        engine = AsyncFetchEngine(scheduler=scheduler, robots=robots)
+
+        # Another slot on the host has claimed robots.txt and is still reading it
+        assert scheduler.claim_robots('a.example')
+        found = []
+        url = 'https://a.example/private'
+        thread = threading.Thread(target=lambda: found.append(read_robots(scheduler, robots, url)))
+        thread.start()
+
+        async def check():
+            waiting = asyncio.ensure_future(engine._read_robots(None, 'https://a.example/private/x', 'a.example'))
+            await asyncio.sleep(0.3)
+            assert not waiting.done() and thread.is_alive()
+            robots.save('https://a.example/', 200, 'User-agent: *\nDisallow: /private\n')
+            scheduler.set_crawl_delay('a.example', None)
+            return await asyncio.wait_for(waiting, 5)
+
+        rules, fetched = asyncio.run(check())
+        thread.join(5)
+        assert not fetched and not rules.allowed('https://a.example/private/x')
+        rules, fetched = found[0]
+        assert not fetched and not rules.allowed('https://a.example/private')
+        assert robots.stats()['fetches'] == 1
+
+
+if __name__ == "__main__":
+    test_parse_crawl_delay()
+    test_rules()
+    test_cache()
+    test_wait_for_pending_robots()
+    print("🎉 ROBOTS CACHE TESTS PASSED!")
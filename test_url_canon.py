@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script to verify URL canonicalization and per-job URL collapsing
+"""
+
+import sys
+import os
+import glob
+import threading
+from datetime import datetime
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import ScrapeJob, run_scrape_job
+from url_canon import canonical_url, clean_url, collapse_urls, fan_out
+
+
+def test_canonical_url():
+    """Scheme, host case, www, trailing slashes and tracking parameters don't make a new page"""
+    spellings = ['http://x.com', 'https://www.x.com/', 'x.com', 'HTTPS://X.COM/?utm_source=ad&gclid=1', 'x.com#top']
+    assert len({canonical_url(url) for url in spellings}) == 1
+    assert canonical_url('x.com/about/') == canonical_url('https://www.x.com/about')
+    assert canonical_url('x.com/?b=2&a=1') == canonical_url('x.com?a=1&b=2&fbclid=z')
+    assert canonical_url('x.com/about') != canonical_url('x.com')
+    assert canonical_url('x.com:8080') != canonical_url('x.com')
+    assert canonical_url('shop.x.com') != canonical_url('x.com')
+
+    # The fetched URL keeps www and the path as entered
+    assert clean_url('HTTP://WWW.X.com/About?utm_medium=mail&id=7#team') == 'http://www.x.com/About?id=7'
+    assert clean_url('x.com') == 'https://x.com'
+    assert clean_url('https://x.com:443/') == 'https://x.com/'
+
+
+def test_collapse_and_fan_out():
+    """Duplicates share one fetch and each input still gets its own row"""
+    urls = ['x.com', 'y.org', 'https://www.x.com/', 'http://X.com?utm_campaign=spring']
+    assert collapse_urls(urls) == [('https://x.com', [0, 2, 3]), ('https://y.org', [1])]
+    assert collapse_urls(urls, [1, 2, 3]) == [('https://y.org', [1]), ('https://www.x.com/', [2, 3])]
+
+    result = {'url': 'https://x.com', 'domain': 'x.com', 'emails': ['info@x.com'], 'phones': []}
+    rows = fan_out(result, ['x.com', 'https://www.x.com/'])
+    assert rows[0] is result and rows[0]['url'] == 'https://x.com'
+    assert rows[1]['url'] == 'https://www.x.com/' and rows[1]['domain'] == 'www.x.com'
+    assert rows[1]['emails'] == ['info@x.com'] and rows[1]['emails'] is not result['emails']
+
+
+def test_job_fetches_each_page_once():
+    """A job with three spellings of one page fetches it once and returns three rows"""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith('/robots.txt'):
+                self.send_response(404)
+                self.end_headers()
+                return
+            hits.append(self.path)
+            text = 'Canon Example sells paper, pens and ink to offices across the region. ' * 10
+            body = f"<html><body><p>{text}</p><p>Write to info@canon.example</p></body></html>".encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    job = ScrapeJob(f"test_canon_{datetime.now().strftime('%Y%m%d_%H%M%S%f')}")
+    urls = [f"{base}/", f"{base}?utm_source=newsletter", f"HTTP://127.0.0.1:{server.server_port}"]
+
+    try:
+        run_scrape_job(job, urls)
+        assert job.status == 'completed', job.error
+        assert len(hits) == 1
+        assert sorted(result['url'] for result in job.results) == sorted(urls)
+        assert all(result['emails'] == ['info@canon.example'] for result in job.results)
+    finally:
+        server.shutdown()
+        server.server_close()
+        for path in glob.glob(f"results/scrape_results_{job.job_id}*"):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    test_canonical_url()
+    test_collapse_and_fan_out()
+    test_job_fetches_each_page_once()
+    print("🎉 URL CANONICALIZATION TESTS PASSED!")
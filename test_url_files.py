@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script to verify streaming URL file ingestion
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import xlsxwriter
+
+from url_files import iter_url_file, read_url_file, count_url_file, preview_url_file
+
+
+def write(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    return path
+
+
+def test_text_and_csv_files():
+    """Only the first column is read, blanks are skipped and counts match the URLs read"""
+    with tempfile.TemporaryDirectory() as directory:
+        txt = write(directory, 'urls.txt', 'a.example\n\n  b.example  \nc.example')
+        assert read_url_file(txt) == ['a.example', 'b.example', 'c.example']
+        assert count_url_file(txt) == 3
+
+        csv_path = write(directory, 'urls.csv', '﻿URL,Name\na.example,A\n,No URL\nb.example,B\n')
+        assert read_url_file(csv_path) == ['a.example', 'b.example']
+        assert count_url_file(csv_path) == 2
+        assert preview_url_file(csv_path, limit=1) == (2, ['a.example'])
+
+        # Quoted fields may span lines, so they are counted with the CSV parser
+        quoted = write(directory, 'quoted.csv', 'URL,Notes\n"a.example","line one\nline two"\nb.example,x\n')
+        assert read_url_file(quoted) == ['a.example', 'b.example']
+        assert count_url_file(quoted) == 2
+
+        try:
+            iter_url_file(os.path.join(directory, 'urls.pdf'))
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def test_line_endings():
+    """Counts follow the reader's line breaks: LF, CRLF and a lone CR"""
+    files = {
+        'mac.csv': 'url\ra.com\rb.com\rc.com\r',
+        'mixed.csv': 'url\r\na.com\r\nb.com\rc.com\n\r\n,x\r\nd.com',
+        'mac.txt': 'a.com\rb.com\r',
+        'mixed.txt': 'a.com\r\nb.com\rc.com\n\r\n  \rd.com'
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, content in files.items():
+            path = write(directory, name, content)
+            assert count_url_file(path) == len(list(iter_url_file(path))), name
+        assert preview_url_file(os.path.join(directory, 'mac.csv')) == (3, ['a.com', 'b.com', 'c.com'])
+        assert count_url_file(os.path.join(directory, 'mac.txt')) == 2
+        assert count_url_file(os.path.join(directory, 'mixed.csv')) == 4
+
+
+def test_excel_file():
+    """Excel sheets are streamed and reading stops at the limit"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'urls.xlsx')
+        workbook = xlsxwriter.Workbook(path)
+        sheet = workbook.add_worksheet()
+        sheet.write_row(0, 0, ['URL', 'Name'])
+        for i in range(1, 101):
+            sheet.write_row(i, 0, [f"site{i}.example", f"Site {i}"])
+        sheet.write_number(101, 0, 42)
+        workbook.close()
+
+        assert read_url_file(path, limit=3) == ['site1.example', 'site2.example', 'site3.example']
+        assert count_url_file(path) == 100
+        assert preview_url_file(path) == (100, [f"site{i}.example" for i in range(1, 6)])
+
+
+if __name__ == "__main__":
+    test_text_and_csv_files()
+    test_line_endings()
+    test_excel_file()
+    print("🎉 URL FILE TESTS PASSED!")
@@ -0,0 +1,139 @@
+import copy
+import urllib.parse
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = frozenset({
+    'gclid', 'gbraid', 'wbraid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'mkt_tok'
+})
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def with_scheme(url):
+    """Return a URL with https:// added if it has no scheme, as the scrapers fetch it."""
+    url = url.strip()
+    if not url.lower().startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
+
+def is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _split(url):
+    """Return (scheme, host, port, path, query pairs) of a URL, or None if it can't be parsed."""
+    try:
+        parts = urllib.parse.urlsplit(with_scheme(url))
+        port = parts.port
+    except ValueError:
+        return None
+    host = (parts.hostname or '').lower().rstrip('.')
+    if not host:
+        return None
+    query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+             if not is_tracking_param(name)]
+    return parts.scheme.lower(), host, port, parts.path, query
+
+
+def clean_url(url):
+    """
+    Return the URL to fetch for an input URL.
+
+    The scheme is added if missing, scheme and host are lower-cased and
+    default ports, fragments and tracking parameters are dropped. The www
+    prefix and the path are kept, since some sites only answer on one form.
+
+    Args:
+        url (str): URL as the user entered it
+
+    Returns:
+        str: The cleaned URL, or the URL with a scheme if it can't be parsed
+    """
+    parts = _split(url)
+    if parts is None:
+        return with_scheme(url)
+    scheme, host, port, path, query = parts
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    return urllib.parse.urlunsplit((scheme, host, path, urllib.parse.urlencode(query), ''))
+
+
+def canonical_url(url):
+    """
+    Return the key under which spellings of the same page are collapsed.
+
+    On top of clean_url(), http and https, a leading www., trailing slashes
+    and the order of query parameters are ignored, so 'http://x.com',
+    'https://www.x.com/' and 'x.com' share one key.
+
+    Args:
+        url (str): URL as the user entered it
+
+    Returns:
+        str: The canonical form
+    """
+    parts = _split(url)
+    if parts is None:
+        return with_scheme(url)
+    scheme, host, port, path, query = parts
+    if host.startswith('www.'):
+        host = host[4:]
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    query = urllib.parse.urlencode(sorted(query))
+    return urllib.parse.urlunsplit(('https', host, path.rstrip('/'), query, ''))
+
+
+def collapse_urls(urls, indexes=None):
+    """
+    Group input URLs that are the same page, so each page is fetched once.
+
+    Args:
+        urls (list): Input URLs of a job
+        indexes (list): Positions in urls to group, all of them if None
+
+    Returns:
+        list: (URL to fetch, [input positions]) per distinct page, in order of
+              first appearance; the first input of a group decides its URL
+    """
+    if indexes is None:
+        indexes = range(len(urls))
+    groups = {}
+    for i in indexes:
+        key = canonical_url(urls[i])
+        if key in groups:
+            groups[key][1].append(i)
+        else:
+            groups[key] = (clean_url(urls[i]), [i])
+    return list(groups.values())
+
+
+def fan_out(result, input_urls):
+    """
+    Return one result row per input URL from the result of a single fetch.
+
+    Every row after the first is a copy. A row whose input is not the URL
+    that was fetched gets the input's URL and domain, so users see what they
+    entered.
+
+    Args:
+        result (dict): Result for the fetched URL
+        input_urls (list): Input URLs the fetch stands for
+
+    Returns:
+        list: Result dicts, one per input URL
+    """
+    rows = []
+    for url in input_urls:
+        row = copy.deepcopy(result) if rows else result
+        url = with_scheme(url)
+        if url != row.get('url'):
+            parts = _split(url)
+            row['url'] = url
+            row['domain'] = parts[1] if parts else ''
+        rows.append(row)
+    return rows
@@ -0,0 +1,205 @@
+import csv
+import logging
+import re
+from itertools import islice
+
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Bytes read at a time when counting the lines of a file
+COUNT_CHUNK_SIZE = 1024 * 1024
+
+# A line break followed by a CSV line whose first field is not blank
+URL_LINE = re.compile(rb'\n[ \t]*[^,\s]')
+
+
+def _clean(value):
+    """Return a cell as a URL, or None for empty and non-text cells."""
+    if isinstance(value, str):
+        value = value.strip()
+        if value:
+            return value
+    return None
+
+
+def _iter_txt(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            url = _clean(line)
+            if url:
+                yield url
+
+
+def _iter_csv(path):
+    with open(path, 'r', newline='', encoding='utf-8-sig', errors='replace') as f:
+        rows = csv.reader(f)
+        # The first row is the header, as with pandas.read_csv
+        next(rows, None)
+        for row in rows:
+            url = _clean(row[0]) if row else None
+            if url:
+                yield url
+
+
+def _iter_xlsx(path):
+    if load_workbook is None:
+        raise RuntimeError("openpyxl is required to read Excel files")
+    # Read-only mode parses the sheet row by row instead of loading it whole
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for (value,) in workbook.active.iter_rows(min_row=2, max_col=1, values_only=True):
+            url = _clean(value)
+            if url:
+                yield url
+    finally:
+        workbook.close()
+
+
+def _iter_xls(path):
+    # Legacy .xls files have no streaming reader; load just the first column
+    import pandas as pd
+    for value in pd.read_excel(path, usecols=[0]).iloc[:, 0]:
+        url = _clean(value)
+        if url:
+            yield url
+
+
+def iter_url_file(path):
+    """
+    Yield the URLs in an uploaded file one at a time.
+
+    Only the first column is read: every non-empty line of a .txt file, or
+    the first column below the header row of a .csv or Excel file. Files are
+    read as a stream, so memory use doesn't grow with the file.
+
+    Args:
+        path (str): Path of a .csv, .xlsx, .xls or .txt file
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    lowered = path.lower()
+    if lowered.endswith('.txt'):
+        return _iter_txt(path)
+    if lowered.endswith('.csv'):
+        return _iter_csv(path)
+    if lowered.endswith('.xlsx'):
+        return _iter_xlsx(path)
+    if lowered.endswith('.xls'):
+        return _iter_xls(path)
+    raise ValueError("Unsupported file format")
+
+
+def read_url_file(path, limit=None):
+    """
+    Return the URLs in an uploaded file.
+
+    Args:
+        path (str): Path of a .csv, .xlsx, .xls or .txt file
+        limit (int): Stop after this many URLs, None reads the whole file
+
+    Returns:
+        list: URL strings in file order
+    """
+    return list(islice(iter_url_file(path), limit))
+
+
+def _has_bare_cr(data):
+    """Return whether data has a carriage return that doesn't start a CRLF pair."""
+    return data.count(b'\r') != data.count(b'\r\n')
+
+
+def _count_txt(path):
+    with open(path, 'rb') as f:
+        count = 0
+        for line in f:
+            if b'\r' in line and _has_bare_cr(line):
+                # A lone CR ends a line too when reading; count with the reader's rules
+                return sum(1 for _ in _iter_txt(path))
+            if line.strip():
+                count += 1
+    return count
+
+
+def _count_csv_lines(piece):
+    """Count the lines with a first field in complete CSV lines, each preceded by b'\n'."""
+    if b'\n ' in piece or b'\n\t' in piece or b'\n\n\n' in piece or b'\n\r\n\r\n' in piece:
+        return len(URL_LINE.findall(piece))
+    # Every line, minus the ones with an empty first field and the (non-adjacent) empty ones
+    lines = piece.count(b'\n') - 1
+    return lines - piece.count(b'\n,') - piece.count(b'\n\n') - piece.count(b'\n\r\n')
+
+
+def _count_csv(path):
+    with open(path, 'rb') as f:
+        if _has_bare_cr(f.readline()):
+            return sum(1 for _ in _iter_csv(path))
+        count = 0
+        # Pieces start at a line break, so the first data line gets one too
+        rest = b'\n'
+        while True:
+            data = f.read(COUNT_CHUNK_SIZE)
+            if not data:
+                break
+            chunk = rest + data
+            # A CR at the end may pair with an LF in the next chunk
+            if b'"' in data or _has_bare_cr(chunk[:-1] if chunk.endswith(b'\r') else chunk):
+                # Quoted fields can hold commas and line breaks, and the CSV reader also ends
+                # lines at a lone CR; parse the file properly
+                return sum(1 for _ in _iter_csv(path))
+            cut = chunk.rfind(b'\n')
+            count += _count_csv_lines(chunk[:cut + 1])
+            rest = chunk[cut:]
+    if _has_bare_cr(rest):
+        return sum(1 for _ in _iter_csv(path))
+    if rest[1:].split(b',', 1)[0].strip():
+        count += 1
+    return count
+
+
+def count_url_file(path):
+    """
+    Count the URLs in an uploaded file.
+
+    Text and CSV files are scanned as raw bytes without decoding them or
+    building rows; files with quoted CSV fields or lines ending in a lone CR
+    are read with iter_url_file() instead. Excel files are streamed.
+
+    Args:
+        path (str): Path of a .csv, .xlsx, .xls or .txt file
+
+    Returns:
+        int: The number of URLs iter_url_file() would yield
+    """
+    lowered = path.lower()
+    if lowered.endswith('.txt'):
+        return _count_txt(path)
+    if lowered.endswith('.csv'):
+        return _count_csv(path)
+    return sum(1 for _ in iter_url_file(path))
+
+
+def preview_url_file(path, limit=5):
+    """
+    Count the URLs in an uploaded file and return the first few.
+
+    Returns:
+        tuple: (URL count, list of at most limit URLs)
+    """
+    lowered = path.lower()
+    if lowered.endswith(('.txt', '.csv')):
+        return count_url_file(path), read_url_file(path, limit)
+
+    # Excel sheets are read once for both
+    first = []
+    count = 0
+    for url in iter_url_file(path):
+        if count < limit:
+            first.append(url)
+        count += 1
+    return count, first
@@ -1,7 +1,8 @@
-from flask import Blueprint, render_template, flash, redirect, url_for, request, jsonify, send_file, current_app as app
+from flask import (Blueprint, render_template, flash, redirect, url_for, request, jsonify, send_file, Response,
+                   stream_with_context, current_app as app)
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta
-from user.models import UserSubscription, SubscriptionPlan, Payment, Job, Email
+from user.models import UserSubscription, SubscriptionPlan, Payment
 from werkzeug.security import generate_password_hash
 import csv
 import io
@@ -9,7 +10,7 @@ import tempfile
 import xlsxwriter
 from werkzeug.utils import secure_filename
 import os
-from models import db, User, ScrapeJob, ScrapeJobHistory, Subscription
+from models import db, User, ScrapeJob, ScrapeJobHistory, Subscription, Contact
 import uuid
 import threading
 import time
@@ -278,32 +279,102 @@ def download_receipt(invoice_id):
     
     return redirect(url_for('user.billing_history'))
 
+# Newest emails listed on the emails page; the export has all of them
+EMAIL_LIST_LIMIT = 1000
+
 @user_bp.route('/emails')
 @login_required
 def emails():
-    """List all emails found across all jobs"""
-    # Get all emails for this user
-    emails = Email.query.filter_by(user_id=current_user.id).order_by(Email.created_at.desc()).all()
+    """List the emails found across all jobs"""
+    user_emails = Contact.query.filter_by(user_id=current_user.id, kind='email')
+    
+    # Count statistics in the database instead of loading every email
+    total_emails, unique_domains, total_jobs = user_emails.with_entities(
+        db.func.count(Contact.id),
+        db.func.count(db.distinct(Contact.domain)),
+        db.func.count(db.distinct(Contact.job_id))
+    ).one()
     
-    # Count statistics
-    total_emails = len(emails)
-    valid_emails = sum(1 for email in emails if email.is_valid is True)
-    unique_domains = len(set(email.domain for email in emails if email.domain))
+    emails = user_emails.order_by(Contact.id.desc()).limit(EMAIL_LIST_LIMIT).all()
     
     return render_template('user/emails/index.html', 
                           emails=emails,
                           total_emails=total_emails,
-                          valid_emails=valid_emails,
-                          unique_domains=unique_domains)
+                          total_jobs=total_jobs,
+                          unique_domains=unique_domains,
+                          list_limit=EMAIL_LIST_LIMIT)
+
+# Columns of the email export, in order
+EMAIL_EXPORT_COLUMNS = ['Email Address', 'Domain', 'Source URL', 'Job', 'Found By', 'Date Found']
+
+# Rows fetched from the database per round trip while exporting
+EXPORT_BATCH_SIZE = 1000
+
+def email_export_rows(user_id):
+    """
+    Yield the export row of every email jobs found for a user, oldest first.
+
+    Emails are read from the contacts table in one query, in batches of
+    EXPORT_BATCH_SIZE, so memory use and the number of queries don't grow
+    with the number of emails.
+    """
+    query = (
+        db.session.query(Contact.value, Contact.domain, Contact.url, Contact.job_id, Contact.source,
+                         Contact.created_at)
+        .filter(Contact.user_id == user_id, Contact.kind == 'email')
+        .order_by(Contact.id)
+        .yield_per(EXPORT_BATCH_SIZE)
+    )
+    for value, domain, url, job_id, source, created_at in query:
+        yield [
+            value,
+            domain or '',
+            url or '',
+            job_id,
+            source or '',
+            created_at.strftime('%Y-%m-%d %H:%M:%S') if created_at else ''
+        ]
+
+def stream_csv(rows):
+    """Yield CSV text for a header and rows, one batch of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EMAIL_EXPORT_COLUMNS)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def write_xlsx(rows, path):
+    """Write a header and rows to an Excel file, keeping only the current row in memory."""
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet('All Emails')
+        # Rows are flushed as they are written, so widths have to be set up front
+        for i, column in enumerate(EMAIL_EXPORT_COLUMNS):
+            worksheet.set_column(i, i, 40 if column in ('Email Address', 'Source URL') else max(len(column), 12) + 2)
+        worksheet.write_row(0, 0, EMAIL_EXPORT_COLUMNS)
+        for row_number, row in enumerate(rows, 1):
+            worksheet.write_row(row_number, 0, row)
+    finally:
+        workbook.close()
+
+def attachment(body, filename, mimetype):
+    """Return a streamed download response."""
+    response = Response(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
 
 @user_bp.route('/emails/export')
 @login_required
 def export_all_emails():
-    """Export all emails from all jobs"""
-    # Get all emails for this user
-    emails = Email.query.filter_by(user_id=current_user.id).all()
+    """Export all emails from all jobs, streaming the file instead of building it in memory"""
+    user_id = current_user.id
     
-    if not emails:
+    if db.session.query(Contact.id).filter(Contact.user_id == user_id, Contact.kind == 'email').first() is None:
         flash('No emails found to export.', 'warning')
         return redirect(url_for('user.emails'))
     
@@ -311,94 +382,31 @@ def export_all_emails():
     format = request.args.get('format', 'csv')
     
     if format == 'csv':
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['Email Address', 'Valid', 'Domain', 'Source URL', 'Job Name', 'First Name', 'Last Name', 'Position', 'Company', 'Date Found'])
-        
-        # Write data
-        for email in emails:
-            job = Job.query.get(email.job_id)
-            job_name = job.name if job else 'Unknown'
-            valid_status = 'Yes' if email.is_valid is True else 'No' if email.is_valid is False else 'Unknown'
-            
-            writer.writerow([
-                email.address,
-                valid_status,
-                email.domain,
-                email.source_url,
-                job_name,
-                email.first_name or '',
-                email.last_name or '',
-                email.position or '',
-                email.company or '',
-                email.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        # Prepare response
-        output.seek(0)
         filename = f"all_emails_{datetime.utcnow().strftime('%Y%m%d')}.csv"
-        
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
-            as_attachment=True,
-            download_name=filename,
-            mimetype='text/csv'
-        )
+        body = stream_with_context(chunk.encode('utf-8') for chunk in stream_csv(email_export_rows(user_id)))
+        return attachment(body, filename, 'text/csv')
         
     elif format == 'xlsx':
+        # An xlsx file is a zip archive that is only complete once closed, so it is
+        # written to a temporary file first and then sent from disk
+        fd, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
         try:
-            import pandas as pd
-            from io import BytesIO
-            
-            # Convert to pandas DataFrame
-            email_data = []
-            for email in emails:
-                job = Job.query.get(email.job_id)
-                job_name = job.name if job else 'Unknown'
-                valid_status = 'Yes' if email.is_valid is True else 'No' if email.is_valid is False else 'Unknown'
-                
-                email_data.append({
-                    'Email Address': email.address,
-                    'Valid': valid_status,
-                    'Domain': email.domain,
-                    'Source URL': email.source_url,
-                    'Job Name': job_name,
-                    'First Name': email.first_name,
-                    'Last Name': email.last_name,
-                    'Position': email.position,
-                    'Company': email.company,
-                    'Date Found': email.created_at.strftime('%Y-%m-%d %H:%M:%S')
-                })
-            
-            df = pd.DataFrame(email_data)
-            
-            # Create Excel file in memory
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                df.to_excel(writer, sheet_name='All Emails', index=False)
-                
-                # Auto-adjust columns width
-                worksheet = writer.sheets['All Emails']
-                for i, col in enumerate(df.columns):
-                    column_width = max(df[col].astype(str).map(len).max(), len(col))
-                    worksheet.set_column(i, i, column_width + 2)
-            
-            # Prepare response
-            output.seek(0)
-            filename = f"all_emails_{datetime.utcnow().strftime('%Y%m%d')}.xlsx"
-            
-            return send_file(
-                output,
-                as_attachment=True,
-                download_name=filename,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-        except ImportError:
-            flash('Excel export requires pandas and xlsxwriter. Defaulting to CSV.', 'warning')
-            return redirect(url_for('user.export_all_emails', format='csv'))
+            write_xlsx(email_export_rows(user_id), path)
+        except Exception:
+            os.remove(path)
+            raise
+        
+        filename = f"all_emails_{datetime.utcnow().strftime('%Y%m%d')}.xlsx"
+        try:
+            response = send_file(path, as_attachment=True, download_name=filename,
+                                 mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        except Exception:
+            os.remove(path)
+            raise
+        # Runs when the server closes the response, even if the body was never sent
+        response.call_on_close(lambda: os.remove(path))
+        return response
     else:
         flash('Unsupported format. Please use CSV or XLSX.', 'danger')
-        return redirect(url_for('user.emails')) 
\ No newline at end of file
+        return redirect(url_for('user.emails'))
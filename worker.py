@@ -0,0 +1,78 @@
+"""
+Scrape queue worker.
+
+Runs the jobs queued by /api/upload and /api/manual outside the web process.
+Start as many as needed, on one machine or several, as long as they share the
+database:
+
+    python worker.py                 # one worker
+    python worker.py --processes 4   # four worker processes
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+
+# Add the current directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def run_worker():
+    """Run one queue worker in this process until it receives SIGTERM or SIGINT."""
+    from app import app, db, run_queue_worker
+    from job_queue import upgrade_queue_table
+
+    with app.app_context():
+        db.create_all()
+        upgrade_queue_table()
+
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        # The running job is finished first; a killed worker's job is requeued
+        logger.info("Stopping after the current job")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    run_queue_worker(stop_event=stop_event)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scrape queue workers")
+    parser.add_argument('--processes', type=int, default=int(os.environ.get('SCRAPE_WORKER_PROCESSES', 1)),
+                        help="Number of worker processes (default: SCRAPE_WORKER_PROCESSES or 1)")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker()
+        return
+
+    # Fresh interpreters, so no database connections are shared between workers
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=run_worker, name=f"scrape-worker-{i + 1}") for i in range(args.processes)]
+    for worker in workers:
+        worker.start()
+
+    def stop_workers(signum, frame):
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()